@@ -0,0 +1,184 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+"""
+Startup benchmark of every short lived command line tool.
+
+Each tool is run on a short plain input, the way most invocations look.
+Cold runs start with an empty bytecode cache, warm runs with one filled by an
+earlier run, both kept in a temporary directory through PYTHONPYCACHEPREFIX
+so that the checkout isn't touched. Import time is the cumulative
+'-X importtime' of the modules imported after interpreter startup, in a warm
+run.
+
+Exits non-zero if the median warm import time of a tool is over its budget
+in BUDGETS_MS. The budgets are about twice the import time measured when
+they were set, so they catch a newly eager import of a large module rather
+than noise. The unit tests check that the modules the tools
+defer stay deferred, see stdisplay.tests.DEFERRED_MODULES.
+
+Run from a checkout:
+    python3 ci/benchmarks/bench_startup.py [RUNS]
+
+run-tests runs it when RUN_STARTUP_BENCHMARK=1, as CI does through
+ci/lint-tests.sh.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+
+GIT_TOPLEVEL = Path(__file__).resolve().parents[2]
+BIN_DIR = GIT_TOPLEVEL / "usr" / "bin"
+LIB_DIR = GIT_TOPLEVEL / "usr" / "lib" / "python3" / "dist-packages"
+
+## Tool: (arguments, stdin, expected stdout).
+TOOLS: dict[str, tuple[list[str], bytes, bytes]] = {
+    "stprint": (["hello world"], b"", b"hello world"),
+    "stecho": (["hello", "world"], b"", b"hello world\n"),
+    "stcat": ([], b"hello world\n", b"hello world\n"),
+    "stcatn": ([], b"hello world\n", b"hello world\n"),
+    "sttee": ([], b"hello world\n", b"hello world\n"),
+    "stsponge": ([], b"hello world\n", b"hello world\n"),
+    "sanitize-string": (["nolimit", "hello world"], b"", b"hello world"),
+    "strip-markup": (["hello world"], b"", b"hello world"),
+    ## Only suspicious characters are shown.
+    "unicode-show": ([], b"hello world\n", b""),
+}
+
+## Median warm import time budget of every tool, in milliseconds.
+BUDGETS_MS: dict[str, float] = {
+    "stprint": 20.0,
+    "stecho": 20.0,
+    "stcat": 30.0,
+    "stcatn": 30.0,
+    "sttee": 30.0,
+    "stsponge": 30.0,
+    "sanitize-string": 30.0,
+    "strip-markup": 20.0,
+    "unicode-show": 30.0,
+}
+
+## The environment of every run, without color so that the terminfo
+## database isn't read, and without a daemon.
+BENCH_ENV = {
+    "TERM": "xterm-direct",
+    "COLORTERM": "",
+    "NO_COLOR": "1",
+    "STDISPLAY_SOCKET": os.devnull,
+    "PYTHONPATH": str(LIB_DIR),
+}
+
+
+def run_tool(
+    tool: str, cache_dir: str, importtime: bool = False
+) -> tuple[float, str]:
+    """Run a tool once, return its wall time in seconds and its stderr.
+
+    A tool failing or printing something unexpected raises RuntimeError, as
+    a tool crashing at import would otherwise be fast enough to pass.
+    """
+    args, stdin, expected = TOOLS[tool]
+    command = [sys.executable, "-su"]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += [str(BIN_DIR / tool), *args]
+    env = dict(os.environ, **BENCH_ENV, PYTHONPYCACHEPREFIX=cache_dir)
+    start = perf_counter()
+    result = subprocess.run(
+        command,
+        input=stdin,
+        capture_output=True,
+        check=False,
+        env=env,
+    )
+    elapsed = perf_counter() - start
+    stderr = result.stderr.decode(errors="replace")
+    if result.returncode or result.stdout != expected:
+        raise RuntimeError(
+            f"{tool} exited with {result.returncode} and printed "
+            + f"{result.stdout!r} instead of {expected!r}:\n{stderr}"
+        )
+    return elapsed, stderr
+
+
+def parse_importtime(stderr: str, startup: set[str]) -> dict[str, int]:
+    """
+    Return the cumulative import time in microseconds of every top level
+    import not done by interpreter startup.
+    """
+    imports = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        ## Top level imports are not indented past the separator.
+        if not name[1:].startswith(" ") and name.strip() not in startup:
+            imports[name.strip()] = int(cumulative)
+    return imports
+
+
+def get_startup_modules() -> set[str]:
+    """Return the modules imported by interpreter startup."""
+    result = subprocess.run(
+        [sys.executable, "-su", "-X", "importtime", "-c", "pass"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return set(parse_importtime(result.stderr, set()))
+
+
+def measure(
+    tool: str, runs: int, startup: set[str]
+) -> tuple[float, float, float, str]:
+    """
+    Return the median cold, warm and import times of a tool in milliseconds,
+    and its largest import.
+    """
+    cold = []
+    warm = []
+    imports: list[dict[str, int]] = []
+    with tempfile.TemporaryDirectory() as warm_dir:
+        run_tool(tool, warm_dir)
+        for _ in range(runs):
+            with tempfile.TemporaryDirectory() as cold_dir:
+                cold.append(run_tool(tool, cold_dir)[0])
+            warm.append(run_tool(tool, warm_dir)[0])
+            stderr = run_tool(tool, warm_dir, importtime=True)[1]
+            imports.append(parse_importtime(stderr, startup))
+    largest = max(imports[-1], key=imports[-1].__getitem__, default="")
+    return (
+        median(cold) * 1000,
+        median(warm) * 1000,
+        median(sum(run.values()) for run in imports) / 1000,
+        largest,
+    )
+
+
+def main() -> int:
+    """Measure every tool and check it against its budget."""
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    startup = get_startup_modules()
+    failed = False
+    for tool, budget in BUDGETS_MS.items():
+        cold, warm, imports, largest = measure(tool, runs, startup)
+        status = "ok"
+        if imports > budget:
+            status = f"FAIL: over budget of {budget:.1f} ms"
+            failed = True
+        print(
+            f"{tool:>16}: cold {cold:6.1f} ms, warm {warm:6.1f} ms, "
+            + f"imports {imports:5.1f} ms, largest {largest}, {status}"
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,481 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+"""
+Benchmark suite of the sanitization libraries and their command line tools.
+
+Every public sanitization function and every stdin reading tool is run on
+generated corpora: plain ASCII, SGR dense, HTML dense, homoglyph dense and
+pathological inputs that target backtracking and parser slow paths. The
+corpora are generated from a fixed seed, so they are identical between runs
+and between commits.
+
+Each target and corpus pair is measured in a fresh interpreter, so that peak
+RSS isn't inflated by earlier measurements. Functions are called once per
+record of the corpus, giving per call latency percentiles. Tools are run on
+the whole corpus on stdin, giving per invocation latency percentiles.
+Throughput is input megabytes (10**6 bytes) per second of total time.
+
+Tools that only take their input as arguments (stprint, stecho) are not
+covered, as the argument length limit of the kernel caps their input size.
+
+Results are written as JSON with sorted keys, one result per line, so that
+two runs can be compared with diff(1) or with the '--compare' option.
+
+Run from a checkout:
+    PYTHONPATH=usr/lib/python3/dist-packages \\
+        python3 ci/benchmarks/bench_suite.py [-o results.json]
+    python3 ci/benchmarks/bench_suite.py --compare old.json new.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+from collections.abc import Callable
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+from statistics import quantiles
+from time import perf_counter
+from typing import Any
+
+GIT_TOPLEVEL = Path(__file__).resolve().parents[2]
+BIN_DIR = GIT_TOPLEVEL / "usr" / "bin"
+LIB_DIR = GIT_TOPLEVEL / "usr" / "lib" / "python3" / "dist-packages"
+
+## Records of a corpus are about this many characters long.
+RECORD_SIZE = 4096
+
+## The environment of every measurement, so that terminal capability
+## detection doesn't depend on the terminal the suite is started from.
+BENCH_ENV = {
+    "TERM": "xterm-direct",
+    "COLORTERM": "",
+    "NO_COLOR": "",
+}
+
+WORDS = (
+    "the quick brown fox jumps over lazy dog error warning info debug "
+    + "request response user session token kernel module package"
+).split()
+HOMOGLYPHS = (
+    ## Cyrillic a e o p c y x
+    "\u0430\u0435\u043e\u0440\u0441\u0443\u0445"
+    ## Greek o a v A B E
+    + "\u03bf\u03b1\u03bd\u0391\u0392\u0395"
+    ## Fullwidth a e o
+    + "\uff41\uff45\uff4f"
+    ## Zero width characters
+    + "\u200b\u200c\u200d\u2060\ufeff"
+    ## Bidirectional controls
+    + "\u202a\u202b\u202c\u202d\u202e\u2066\u2067\u2068\u2069"
+)
+
+
+def words(rng: random.Random, count: int) -> str:
+    """Return count random words separated by spaces."""
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def plain_record(rng: random.Random) -> str:
+    """Return a line of printable ASCII."""
+    return words(rng, rng.randint(4, 16)) + "\n"
+
+
+def sgr_record(rng: random.Random) -> str:
+    """Return a line of colored log output."""
+    color = rng.choice(
+        ["\x1b[1;31m", "\x1b[32m", "\x1b[38;5;208m", "\x1b[38;2;1;2;3m"]
+    )
+    return (
+        f"\x1b[2m{rng.randint(0, 99999):05}\x1b[0m {color}"
+        + words(rng, rng.randint(1, 3))
+        + "\x1b[m "
+        + words(rng, rng.randint(2, 8))
+        + "\n"
+    )
+
+
+def html_record(rng: random.Random) -> str:
+    """Return a line of markup with tags, attributes and entities."""
+    tag = rng.choice(["b", "i", "a", "span", "div", "p"])
+    return (
+        f'<{tag} class="{rng.choice(WORDS)}">'
+        + words(rng, rng.randint(1, 6))
+        + rng.choice(["&amp;", "&lt;", "&#x41;", "&nbsp;", "&quot;"])
+        + words(rng, rng.randint(1, 6))
+        + f"</{tag}><br/>\n"
+    )
+
+
+def homoglyph_record(rng: random.Random) -> str:
+    """Return a line of words with a third of the letters replaced."""
+    return (
+        "".join(
+            rng.choice(HOMOGLYPHS) if rng.random() < 0.33 else char
+            for char in words(rng, rng.randint(4, 16))
+        )
+        + "\n"
+    )
+
+
+def pathological_record(rng: random.Random) -> str:
+    """
+    Return a record targeting slow paths: long SGR parameter runs that never
+    terminate, ESC storms, unterminated tags and nested entity lookalikes.
+    """
+    fields = rng.randint(100, 400)
+    return rng.choice(
+        [
+            "\x1b[" + ";0" * fields + "x",
+            "\x1b[" + "38;5;1;" * (fields // 4) + "x",
+            ("\x1b[" + "0" * 50 + ";") * (fields // 20),
+            "\x1b" * fields,
+            "<" * fields + "a",
+            "<a " + "b=" * fields,
+            "&#" * fields + ";",
+        ]
+    )
+
+
+CORPORA: dict[str, Callable[[random.Random], str]] = {
+    "plain": plain_record,
+    "sgr": sgr_record,
+    "html": html_record,
+    "homoglyph": homoglyph_record,
+    "pathological": pathological_record,
+}
+
+
+def generate_corpus(name: str, size: int) -> list[str]:
+    """
+    Return records of the named corpus, about RECORD_SIZE characters each
+    and size characters in total. The same name and size always generate
+    the same records.
+    """
+    rng = random.Random(f"{name}:{size}")
+    records = []
+    total = 0
+    while total < size:
+        parts = []
+        length = 0
+        while length < min(RECORD_SIZE, size - total):
+            part = CORPORA[name](rng)
+            parts.append(part)
+            length += len(part)
+        record = "".join(parts)
+        records.append(record)
+        total += len(record)
+    return records
+
+
+def scan_file_quiet(untrusted_text: str) -> bool:
+    """Run unicode_show.scan_file() with its report discarded."""
+    # pylint: disable=import-outside-toplevel
+    from unicode_show.unicode_show import scan_file
+
+    with redirect_stdout(StringIO()):
+        return scan_file(StringIO(untrusted_text, newline="\n"))
+
+
+def function_targets() -> dict[str, Callable[[str], object]]:
+    """Return the benchmarked library functions by name."""
+    # pylint: disable=import-outside-toplevel
+    from functools import partial
+    from sanitize_string.sanitize_string_lib import sanitize_string
+    from stdisplay.stdisplay import stdisplay
+    from strip_markup.strip_markup_lib import strip_markup
+
+    return {
+        "stdisplay": stdisplay,
+        "stdisplay(sgr=-1)": partial(stdisplay, sgr=-1),
+        "stdisplay(engine=fsm)": partial(stdisplay, engine="fsm"),
+        "strip_markup": strip_markup,
+        "sanitize_string": sanitize_string,
+        "unicode_show.scan_file": scan_file_quiet,
+    }
+
+
+## Tool name and arguments, the input is always given on stdin.
+CLI_TARGETS: dict[str, list[str]] = {
+    "stcat": [],
+    "stcatn": [],
+    "sttee": [],
+    "stsponge": [],
+    "strip-markup": [],
+    "sanitize-string": ["nolimit"],
+    "unicode-show": [],
+}
+
+
+def peak_rss_kib(who: int) -> int:
+    """Return the peak resident set size in KiB of self or children."""
+    return resource.getrusage(who).ru_maxrss
+
+
+def summarize(
+    latencies: list[float], input_bytes: int, **extra: Any
+) -> dict[str, Any]:
+    """Return throughput and latency percentiles of the measured calls."""
+    if len(latencies) > 1:
+        percentiles = quantiles(latencies, n=100, method="inclusive")
+    else:
+        percentiles = latencies * 99
+    total = sum(latencies)
+    return {
+        "calls": len(latencies),
+        "input_bytes": input_bytes,
+        "mb_per_s": round(input_bytes / total / 10**6, 3) if total else None,
+        "p50_ms": round(percentiles[49] * 1000, 4),
+        "p90_ms": round(percentiles[89] * 1000, 4),
+        "p99_ms": round(percentiles[98] * 1000, 4),
+        "max_ms": round(max(latencies) * 1000, 4),
+        **extra,
+    }
+
+
+def measure_function(
+    target: str, corpus: str, size: int, repeat: int
+) -> dict[str, Any]:
+    """Call a library function on every record, repeat times."""
+    func = function_targets()[target]
+    records = generate_corpus(corpus, size)
+    ## Warm up pattern and sanitizer caches, as a long running caller would.
+    func(records[0])
+    baseline_rss = peak_rss_kib(resource.RUSAGE_SELF)
+    latencies = []
+    for _ in range(repeat):
+        for record in records:
+            start = perf_counter()
+            func(record)
+            latencies.append(perf_counter() - start)
+    input_bytes = repeat * sum(len(r.encode("utf-8")) for r in records)
+    return summarize(
+        latencies,
+        input_bytes,
+        baseline_rss_kib=baseline_rss,
+        peak_rss_kib=peak_rss_kib(resource.RUSAGE_SELF),
+    )
+
+
+def measure_cli(
+    target: str, corpus: str, size: int, repeat: int
+) -> dict[str, Any]:
+    """Run a tool on the whole corpus on stdin, repeat times."""
+    data = "".join(generate_corpus(corpus, size)).encode("utf-8")
+    command = [sys.executable, "-su", str(BIN_DIR / target)]
+    command += CLI_TARGETS[target]
+    latencies = []
+    with tempfile.TemporaryFile() as stdin_file:
+        stdin_file.write(data)
+        for _ in range(repeat):
+            stdin_file.seek(0)
+            start = perf_counter()
+            ## Exit codes aren't checked, unicode-show exits 1 when it finds
+            ## something, which it does on most corpora.
+            subprocess.run(
+                command,
+                stdin=stdin_file,
+                stdout=subprocess.DEVNULL,
+                check=False,
+            )
+            latencies.append(perf_counter() - start)
+    return summarize(
+        latencies,
+        repeat * len(data),
+        peak_rss_kib=peak_rss_kib(resource.RUSAGE_CHILDREN),
+    )
+
+
+def run_worker(
+    kind: str, target: str, corpus: str, size: int, repeat: int
+) -> dict[str, Any]:
+    """Measure one target on one corpus in a fresh interpreter."""
+    env = dict(os.environ, **BENCH_ENV)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(LIB_DIR)] + ([env["PYTHONPATH"]] if "PYTHONPATH" in env else [])
+    )
+    result = subprocess.run(
+        [sys.executable, "-su", __file__, "--worker", kind, target, corpus]
+        + ["--size", str(size), "--repeat", str(repeat)],
+        capture_output=True,
+        check=True,
+        env=env,
+        text=True,
+    )
+    measurement: dict[str, Any] = json.loads(result.stdout)
+    return {"kind": kind, "target": target, "corpus": corpus, **measurement}
+
+
+def git_commit() -> str | None:
+    """Return the commit of the checkout, if any."""
+    try:
+        return subprocess.run(
+            ["git", "-C", str(GIT_TOPLEVEL), "rev-parse", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(args: argparse.Namespace) -> dict[str, Any]:
+    """Run every selected target on every selected corpus."""
+    results = []
+    jobs = [("function", name) for name in args.functions]
+    jobs += [("cli", name) for name in args.clis]
+    for kind, target in jobs:
+        for corpus in args.corpora:
+            ## Tools pay for interpreter startup on every run, so they get
+            ## fewer runs on the same input as the functions.
+            repeat = args.repeat if kind == "function" else args.cli_repeat
+            result = run_worker(kind, target, corpus, args.size, repeat)
+            print(
+                f"{kind:>8} {target:>24} {corpus:>12}: "
+                + f"{result['mb_per_s']:9.3f} MB/s, "
+                + f"p99 {result['p99_ms']:10.3f} ms, "
+                + f"peak RSS {result['peak_rss_kib']} KiB",
+                file=sys.stderr,
+            )
+            results.append(result)
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "size": args.size,
+        "results": results,
+    }
+
+
+def write_results(suite: dict[str, Any], output: str | None) -> None:
+    """Write results as JSON with one result per line."""
+    lines = ["{"]
+    for key in sorted(suite):
+        if key == "results":
+            continue
+        lines.append(f"  {json.dumps(key)}: {json.dumps(suite[key])},")
+    lines.append('  "results": [')
+    results = [
+        "    " + json.dumps(result, sort_keys=True)
+        for result in suite["results"]
+    ]
+    lines.append(",\n".join(results))
+    lines += ["  ]", "}"]
+    text = "\n".join(lines) + "\n"
+    if output is None:
+        sys.stdout.write(text)
+    else:
+        Path(output).write_text(text, encoding="utf-8")
+
+
+def compare(old_path: str, new_path: str) -> None:
+    """Print throughput and peak RSS ratios of two result files."""
+
+    def key(result: dict[str, Any]) -> tuple[str, str, str]:
+        return (result["kind"], result["target"], result["corpus"])
+
+    old = {
+        key(r): r
+        for r in json.loads(Path(old_path).read_text(encoding="utf-8"))[
+            "results"
+        ]
+    }
+    new = json.loads(Path(new_path).read_text(encoding="utf-8"))["results"]
+    for result in new:
+        if key(result) not in old:
+            continue
+        before = old[key(result)]
+        speedup = (
+            result["mb_per_s"] / before["mb_per_s"]
+            if result["mb_per_s"] and before["mb_per_s"]
+            else float("nan")
+        )
+        rss = result["peak_rss_kib"] / before["peak_rss_kib"]
+        print(
+            f"{result['kind']:>8} {result['target']:>24} "
+            + f"{result['corpus']:>12}: throughput {speedup:6.2f}x, "
+            + f"peak RSS {rss:6.2f}x"
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-o", "--output", help="write JSON to this file")
+    parser.add_argument(
+        "--size",
+        type=int,
+        default=1_000_000,
+        help="characters per corpus (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="passes over the corpus per function (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--cli-repeat",
+        type=int,
+        default=5,
+        help="runs on the corpus per tool (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--corpora", nargs="+", choices=list(CORPORA), default=list(CORPORA)
+    )
+    parser.add_argument(
+        "--functions",
+        nargs="*",
+        default=None,
+        help="library functions to run (default: all)",
+    )
+    parser.add_argument(
+        "--clis",
+        nargs="*",
+        choices=list(CLI_TARGETS),
+        default=list(CLI_TARGETS),
+    )
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("OLD", "NEW"),
+        help="print throughput and peak RSS ratios of two result files",
+    )
+    parser.add_argument(
+        "--worker",
+        nargs=3,
+        metavar=("KIND", "TARGET", "CORPUS"),
+        help=argparse.SUPPRESS,
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Run the suite, a single worker, or a comparison."""
+    args = parse_args()
+    if args.compare:
+        compare(*args.compare)
+        return 0
+    if args.worker:
+        kind, target, corpus = args.worker
+        measure = measure_function if kind == "function" else measure_cli
+        json.dump(measure(target, corpus, args.size, args.repeat), sys.stdout)
+        return 0
+    if args.functions is None:
+        sys.path.insert(0, str(LIB_DIR))
+        args.functions = list(function_targets())
+    write_results(run_suite(args), args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+"""
+Benchmark of serial sanitize_string() against sanitize_string_many().
+
+Run from a checkout:
+    PYTHONPATH=usr/lib/python3/dist-packages \\
+        python3 ci/benchmarks/sanitize_string/bench_many.py [ITEMS] [WORKERS]
+"""
+
+import sys
+from time import perf_counter
+from sanitize_string.sanitize_string_lib import (
+    sanitize_string,
+    sanitize_string_many,
+)
+
+
+def main() -> None:
+    """Print wall time of both paths and check that results are equal."""
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    corpus = [
+        f"<p>job {i} \x1b[1mfinished</b> &amp; <i>uploaded</i> ✓</p>\n" * 4
+        for i in range(items)
+    ]
+    start = perf_counter()
+    serial = [sanitize_string(item) for item in corpus]
+    serial_time = perf_counter() - start
+    for chunk_size in (16, 256, 4096):
+        start = perf_counter()
+        parallel = list(
+            sanitize_string_many(
+                corpus, chunk_size=chunk_size, max_workers=workers
+            )
+        )
+        parallel_time = perf_counter() - start
+        assert parallel == serial
+        print(
+            f"chunk_size={chunk_size:>5}: serial {serial_time:6.2f} s, "
+            f"parallel {parallel_time:6.2f} s, "
+            f"{serial_time / parallel_time:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+"""
+Cost and event loop latency of stdisplay_async() per payload size.
+
+For every size, the time per call is measured sanitizing inline and in the
+default executor, and the worst delay of a task waking up every millisecond
+while payloads are sanitized one after the other. Small payloads must cost
+the same as calling stdisplay() directly, large ones must not delay the
+loop by the whole time they take to sanitize.
+
+Run from a checkout:
+    PYTHONPATH=usr/lib/python3/dist-packages \\
+        python3 ci/benchmarks/stdisplay/bench_aio.py [CALLS]
+"""
+
+import asyncio
+import sys
+from time import perf_counter
+from stdisplay.aio import stdisplay_async, STDISPLAY_INLINE_LIMIT
+
+SGR: int = 2**24
+LINE: str = "\x1b[1;31mERROR\x1b[0m caf\u00e9 <b>x</b> \x1b[2J log line\n"
+SIZES: tuple[int, ...] = (100, 2**12, STDISPLAY_INLINE_LIMIT, 2**18)
+
+
+async def ticker(interval: float, delays: list[float]) -> None:
+    """Record how late the loop wakes up a task, until cancelled."""
+    while True:
+        start = perf_counter()
+        await asyncio.sleep(interval)
+        delays.append(perf_counter() - start - interval)
+
+
+async def measure(
+    text: str, calls: int, inline_limit: int
+) -> tuple[float, float]:
+    """Return the mean seconds per call and the worst loop delay."""
+    delays: list[float] = [0.0]
+    task = asyncio.create_task(ticker(0.001, delays))
+    await asyncio.sleep(0)
+    start = perf_counter()
+    for _ in range(calls):
+        await stdisplay_async(text, sgr=SGR, inline_limit=inline_limit)
+        ## Like a server going on with other requests.
+        await asyncio.sleep(0)
+    elapsed = perf_counter() - start
+    task.cancel()
+    return elapsed / calls, max(delays)
+
+
+async def main() -> None:
+    """Print the matrix."""
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print(
+        f"{'chars':>7} {'inline us':>10} {'executor us':>12} "
+        f"{'inline delay ms':>16} {'executor delay ms':>18}"
+    )
+    for size in SIZES:
+        text = (LINE * (size // len(LINE) + 1))[:size]
+        inline, inline_delay = await measure(text, calls, sys.maxsize)
+        offloaded, offloaded_delay = await measure(text, calls, 0)
+        print(
+            f"{size:7} {inline * 1e6:10.1f} {offloaded * 1e6:12.1f} "
+            f"{inline_delay * 1e3:16.2f} {offloaded_delay * 1e3:18.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
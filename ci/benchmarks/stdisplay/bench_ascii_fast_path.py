@@ -0,0 +1,74 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+"""
+Benchmark matrix of the printable ASCII fast path of Sanitizer.sanitize().
+
+Compares running the full pattern on every line against the fast path, on a
+clean corpus, an ESC-heavy corpus and a non-ASCII-heavy corpus. The fast path
+must speed up the first one without slowing the other two noticeably.
+
+Run from a checkout:
+    PYTHONPATH=usr/lib/python3/dist-packages \\
+        python3 ci/benchmarks/stdisplay/bench_ascii_fast_path.py [LINES]
+"""
+
+import sys
+from collections.abc import Callable
+from time import perf_counter
+from stdisplay.stdisplay import get_sgr_regex, Sanitizer
+
+SGR: int = 2**24
+
+
+def make_corpora(lines: int) -> dict[str, list[str]]:
+    """Generate the three corpora with the same number of lines."""
+    clean = "Jan 01 00:00:{sec:02d} host sshd[{num}]: Accepted key for user\n"
+    esc = "\x1b[1;32m{num}\x1b[m \x1b[38;5;{sec}mwarn\x1b[0m \x1b]0;x\x07\n"
+    non_ascii = "Grüße aus Köln — {num} «Übersicht» 東京 {sec} ✓\n"
+    return {
+        name: [template.format(num=i, sec=i % 60) for i in range(lines)]
+        for name, template in (
+            ("clean", clean),
+            ("esc-heavy", esc),
+            ("non-ascii", non_ascii),
+        )
+    }
+
+
+def measure(func: Callable[[str], str], corpus: list[str]) -> float:
+    """Return seconds taken to sanitize every line of the corpus."""
+    start = perf_counter()
+    for line in corpus:
+        func(line)
+    return perf_counter() - start
+
+
+def main() -> None:
+    """Run the matrix and print per-line cost and throughput."""
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    regex = get_sgr_regex(sgr=SGR)
+    sanitizer = Sanitizer(sgr=SGR)
+
+    def regex_only(untrusted_text: str) -> str:
+        return regex.sub("_", untrusted_text)
+
+    print(
+        f"{'corpus':>10} {'regex ns/line':>14} {'fast ns/line':>13} "
+        f"{'regex MB/s':>11} {'fast MB/s':>10} {'speedup':>8}"
+    )
+    for name, corpus in make_corpora(lines).items():
+        size = sum(len(line.encode("utf-8")) for line in corpus) / 1e6
+        slow = measure(regex_only, corpus)
+        fast = measure(sanitizer.sanitize, corpus)
+        print(
+            f"{name:>10} {slow / lines * 1e9:14.1f} "
+            f"{fast / lines * 1e9:13.1f} {size / slow:11.1f} "
+            f"{size / fast:10.1f} {slow / fast:7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+"""
+Benchmark matrix of sanitizing UTF-8 bytes, with and without decoding them.
+
+Compares decoding every block with errors="replace", sanitizing the text and
+encoding it as ASCII against stdisplay.binary.BytesSanitizer, per engine, on
+corpora from plain ASCII to invalid UTF-8. The bytes path must be faster on
+mostly ASCII input and no slower on the others.
+
+Run from a checkout:
+    PYTHONPATH=usr/lib/python3/dist-packages \\
+        python3 ci/benchmarks/stdisplay/bench_bytes.py [MEGABYTES]
+"""
+
+import sys
+from collections.abc import Callable
+from time import perf_counter
+from stdisplay.binary import BytesSanitizer
+from stdisplay.stdisplay import SGR_ENGINES, Sanitizer
+
+SGR: int = 2**24
+BLOCK_SIZE: int = 2**16
+REPEATS: int = 5
+
+
+def make_corpora(size: int) -> dict[str, bytes]:
+    """Generate the corpora, each at least size bytes long."""
+    lines = {
+        "ascii": b"Jan 01 00:00:00 host sshd[42]: Accepted key for user\n",
+        "rare-ctrl": b"Jan 01 00:00:00 host kernel: \x07 \xc3\xa9 ok\n" * 4
+        + b"Jan 01 00:00:00 host kernel: usb 1-1: new device\n" * 60,
+        "sgr": b"\x1b[1;32m42\x1b[m \x1b[38;5;9mwarn\x1b[0m \x1b]0;x\x07\n",
+        "latin": "Grüße aus Köln, «straße»\n".encode(),
+        "utf-8": "東京 ✓ — \U0001f600 café\n".encode(),
+        "invalid": b"\xff\xfe\xc0\xaf \xe2\x82 \xed\xa0\x80 a\n",
+    }
+    return {
+        name: line * (size // len(line) + 1) for name, line in lines.items()
+    }
+
+
+def measure(func: Callable[[bytes], bytes], corpus: bytes) -> float:
+    """
+    Return the fewest seconds taken to sanitize the corpus block by block,
+    out of REPEATS runs.
+    """
+    blocks = [
+        corpus[offset : offset + BLOCK_SIZE]
+        for offset in range(0, len(corpus), BLOCK_SIZE)
+    ]
+    times = []
+    for _ in range(REPEATS):
+        start = perf_counter()
+        for block in blocks:
+            func(block)
+        times.append(perf_counter() - start)
+    return min(times)
+
+
+def main() -> None:
+    """Run the matrix and print throughput of both paths."""
+    size = int(float(sys.argv[1]) * 1e6) if len(sys.argv) > 1 else 10**7
+    print(
+        f"{'corpus':>10} {'engine':>6} {'decode MB/s':>12} "
+        f"{'bytes MB/s':>11} {'speedup':>8}"
+    )
+    for name, corpus in make_corpora(size).items():
+        for engine in SGR_ENGINES:
+            sanitizer = Sanitizer(sgr=SGR, engine=engine)
+            bytes_sanitizer = BytesSanitizer(sgr=SGR, engine=engine)
+
+            def decode(untrusted_bytes: bytes) -> bytes:
+                # pylint: disable=cell-var-from-loop
+                untrusted_text = untrusted_bytes.decode("utf-8", "replace")
+                return sanitizer.sanitize(untrusted_text).encode("ascii")
+
+            slow = measure(decode, corpus)
+            fast = measure(bytes_sanitizer.sanitize, corpus)
+            megabytes = len(corpus) / 1e6
+            print(
+                f"{name:>10} {engine:>6} {megabytes / slow:12.1f} "
+                f"{megabytes / fast:11.1f} {slow / fast:7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+"""
+Bytes and time saved by compacting the SGR sequences of color heavy text.
+
+For every sample, the size of the sanitized text is compared to its size
+once compacted, along with the time both take, checking that the compacted
+text is left unchanged by stdisplay().
+
+Run from a checkout:
+    PYTHONPATH=usr/lib/python3/dist-packages \\
+        python3 ci/benchmarks/stdisplay/bench_compact.py [KB]
+"""
+
+import sys
+from time import perf_counter
+from stdisplay.compact import compact_sgr
+from stdisplay.stdisplay import stdisplay
+
+SGR: int = 2**24
+SAMPLES: dict[str, str] = {
+    "reset per char": "".join(f"\x1b[0m\x1b[1;32m{char}" for char in "log "),
+    "repeated color": "\x1b[38;5;196mE\x1b[38;5;196mR\x1b[38;5;196mR ",
+    "rainbow": "".join(f"\x1b[38;2;{i};0;0m#" for i in range(0, 256, 32)),
+    "plain": "a log line without colors at all\n",
+}
+
+
+def main() -> int:
+    """Print the size and time of each sample."""
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    print(
+        f"{'sample':>16} {'bytes':>9} {'compacted':>10} {'ratio':>6} "
+        f"{'sanitize ms':>12} {'compact ms':>11}"
+    )
+    for name, line in SAMPLES.items():
+        text = line * (size * 1024 // len(line) + 1)
+        start = perf_counter()
+        sanitized = stdisplay(text, sgr=SGR)
+        middle = perf_counter()
+        compacted = compact_sgr(sanitized, sgr=SGR)
+        end = perf_counter()
+        if stdisplay(compacted, sgr=SGR) != compacted:
+            print(f"{name:>16} FAIL: compacted text is sanitized again")
+            return 1
+        print(
+            f"{name:>16} {len(sanitized):9} {len(compacted):10} "
+            f"{len(compacted) / len(sanitized):6.2f} "
+            f"{(middle - start) * 1e3:12.1f} {(end - middle) * 1e3:11.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+"""
+Wall time of many stecho invocations, sanitizing in process and asking a
+running stdisplay-daemon, like a boot script calling stecho in a loop.
+
+Run from a checkout:
+    PYTHONPATH=usr/lib/python3/dist-packages \\
+        python3 ci/benchmarks/stdisplay/bench_daemon.py [INVOCATIONS]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BIN = Path(__file__).resolve().parents[3] / "usr" / "bin"
+MESSAGE = "\x1b[1;32mINFO\x1b[0m: service started \x1b]0;title\a"
+
+
+def run(command: list[str], invocations: int, env: dict[str, str]) -> float:
+    """Run a command sequentially and return the mean milliseconds per call."""
+    start = time.perf_counter()
+    for _ in range(invocations):
+        subprocess.run(command, env=env, stdout=subprocess.DEVNULL, check=True)
+    return (time.perf_counter() - start) * 1000 / invocations
+
+
+def main() -> None:
+    """Print milliseconds per call of a bare interpreter and of stecho."""
+    invocations = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = f"{tmpdir}/stdisplay.sock"
+        env = {**os.environ, "STDISPLAY_SOCKET": path}
+        bare = run([sys.executable, "-su", "-c", "pass"], invocations, env)
+        stecho = [sys.executable, "-su", str(BIN / "stecho"), MESSAGE]
+        in_process = run(stecho, invocations, {**env, "STDISPLAY_SOCKET": ""})
+        with subprocess.Popen(
+            [sys.executable, "-su", str(BIN / "stdisplay-daemon")], env=env
+        ) as daemon:
+            while not os.path.exists(path):
+                time.sleep(0.01)
+            with_daemon = run(stecho, invocations, env)
+            daemon.terminate()
+    print(f"{'invocations':>14} {invocations:8}")
+    print(f"{'python -c pass':>14} {bare:8.2f} ms")
+    print(f"{'in process':>14} {in_process:8.2f} ms")
+    print(f"{'daemon':>14} {with_daemon:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
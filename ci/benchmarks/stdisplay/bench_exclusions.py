@@ -0,0 +1,58 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+"""
+Benchmark of SGR exclusions checked by the lookahead of exclude_pattern()
+against exclusions parsed by SgrExclusions, as the exclusion list grows.
+
+Run from a checkout:
+    PYTHONPATH=usr/lib/python3/dist-packages \\
+        python3 ci/benchmarks/stdisplay/bench_exclusions.py [LINES]
+"""
+
+import sys
+from functools import partial
+from time import perf_counter
+from stdisplay.stdisplay import get_sgr_regex, Sanitizer, SGR_ENGINES
+
+
+def banned_colors(count: int) -> list[str]:
+    """Return count exclusions of 8-bit colors, in the usual notation."""
+    return [f"0*[3-4]8(:|;)0*5(:|;)0*{color}" for color in range(count)]
+
+
+def main() -> None:
+    """Print milliseconds taken by each method per exclusion list size."""
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    text = (
+        "\x1b[1;31mERROR\x1b[0m job \x1b[38;5;250mok\x1b[m "
+        + "\x1b[38;2;10;20;30m24-bit\x1b[39m\n"
+    ) * lines
+    methods = ("lookahead", *SGR_ENGINES)
+    print(
+        f"{'exclusions':>10} " + " ".join(f"{m + ' ms':>12}" for m in methods)
+    )
+    for count in (0, 8, 16, 32, 64, 240):
+        exclude_sgr = banned_colors(count)
+        sanitizers = [partial(get_sgr_regex(2**24, exclude_sgr).sub, "_")]
+        sanitizers += [
+            Sanitizer(
+                sgr=2**24, exclude_sgr=exclude_sgr, engine=engine
+            ).sanitize
+            for engine in SGR_ENGINES
+        ]
+        results = []
+        row = []
+        for sanitize in sanitizers:
+            start = perf_counter()
+            result = sanitize(text)
+            row.append((perf_counter() - start) * 1000)
+            results.append(result)
+        assert len(set(results)) == 1, "methods disagree"
+        print(f"{count:>10} " + " ".join(f"{ms:12.2f}" for ms in row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+"""
+Import-time benchmark of terminal capability detection.
+
+Runs 'python3 -X importtime' on code paths that never need the terminfo
+database and on one that does, reporting the import time and whether curses
+was loaded. Exits non-zero if curses is loaded on a path that shouldn't need
+it.
+
+Run from a checkout:
+    PYTHONPATH=usr/lib/python3/dist-packages \\
+        python3 ci/benchmarks/stdisplay/bench_import_time.py [RUNS]
+"""
+
+import subprocess
+import sys
+from statistics import median
+
+## (name, code, needs_curses)
+CASES: list[tuple[str, str, bool]] = [
+    ("import", "import stdisplay.stdisplay", False),
+    (
+        "sgr=-1",
+        "from stdisplay.stdisplay import stdisplay; stdisplay('a', sgr=-1)",
+        False,
+    ),
+    (
+        "sanitize_string",
+        "from sanitize_string.sanitize_string_lib import sanitize_string; "
+        + "sanitize_string('a')",
+        False,
+    ),
+    (
+        "detect",
+        "from stdisplay.stdisplay import stdisplay; stdisplay('a')",
+        True,
+    ),
+]
+
+
+def importtime(code: str, startup: set[str]) -> tuple[int, set[str]]:
+    """
+    Return cumulative import time in microseconds of top level imports not
+    done by interpreter startup, and every module imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-P", "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    total = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        modules.add(name.strip())
+        ## Top level imports are not indented past the separator.
+        if not name[1:].startswith(" ") and name.strip() not in startup:
+            total += int(cumulative)
+    return total, modules
+
+
+def main() -> int:
+    """Run every case and report the median import time."""
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    failed = False
+    _, startup = importtime("pass", set())
+    for name, code, needs_curses in CASES:
+        times = []
+        loaded = False
+        for _ in range(runs):
+            total, modules = importtime(code, startup)
+            times.append(total)
+            loaded = loaded or "curses" in modules
+        status = "ok"
+        if loaded and not needs_curses:
+            status = "FAIL: curses loaded"
+            failed = True
+        print(
+            f"{name:>16}: {median(times):7.0f} us, "
+            f"curses {'loaded' if loaded else 'not loaded'}, {status}"
+        )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+"""
+Throughput of stcat, stcatn and sttee reading a pipe and writing a pipe,
+against writing each sanitized line through the TextIOWrapper of stdout, as
+the utilities did before BlockWriter.
+
+Run from a checkout:
+    PYTHONPATH=usr/lib/python3/dist-packages \\
+        python3 ci/benchmarks/stdisplay/bench_output.py [SIZE_MB]
+"""
+
+import subprocess
+import sys
+import tempfile
+import time
+from threading import Thread
+from pathlib import Path
+from typing import BinaryIO
+
+BIN = Path(__file__).resolve().parents[3] / "usr" / "bin"
+PER_LINE = (
+    "import sys; from stdisplay.stdisplay import stdisplay; "
+    + "sys.stdin.reconfigure(encoding='utf-8', errors='replace', "
+    + "newline='\\n'); "
+    + "sys.stdout.reconfigure(encoding='ascii', errors='replace', "
+    + "newline='\\n'); "
+    + "[sys.stdout.write(stdisplay(line){rstrip}) for line in sys.stdin]"
+)
+LINES = [
+    "\x1b[1;31mERROR\x1b[0m caf\u00e9 \x1b[2J plain text of a log line\n",
+    "Oct 18 04:16:28 host service[1234]: plain ASCII status message\n",
+    "Oct 18 04:16:29 host service[1234]: another plain ASCII message\n",
+]
+
+
+def feed(untrusted_file: BinaryIO, pipe: BinaryIO) -> None:
+    """Copy a file to a pipe and close it."""
+    with pipe:
+        while chunk := untrusted_file.read(2**20):
+            pipe.write(chunk)
+
+
+def throughput(command: list[str], path: Path, size: int) -> float:
+    """Pipe a file through a command, discard its output, return MB/s."""
+    with open(path, "rb") as untrusted_file:
+        with subprocess.Popen(
+            command, stdin=subprocess.PIPE, stdout=subprocess.PIPE
+        ) as process:
+            assert process.stdin is not None and process.stdout is not None
+            start = time.perf_counter()
+            feeder = Thread(target=feed, args=(untrusted_file, process.stdin))
+            feeder.start()
+            while process.stdout.read(2**20):
+                pass
+            feeder.join()
+    return size / 1e6 / (time.perf_counter() - start)
+
+
+def main() -> None:
+    """Print MB/s per utility, before and after block buffering."""
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    cases = [
+        ("stcat", PER_LINE.format(rstrip="")),
+        ("stcatn", PER_LINE.format(rstrip=".rstrip() + '\\n'")),
+        ("sttee", PER_LINE.format(rstrip="")),
+    ]
+    print(f"{'utility':>8} {'per line MB/s':>14} {'blocks MB/s':>12}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "input"
+        block = "".join(LINES * (2**20 // len("".join(LINES)))).encode()
+        with open(path, "wb") as untrusted_file:
+            while untrusted_file.tell() < size_mb * 2**20:
+                untrusted_file.write(block)
+            size = untrusted_file.tell()
+        for utility, per_line in cases:
+            before = throughput([sys.executable, "-c", per_line], path, size)
+            after = throughput(
+                [sys.executable, str(BIN / utility)], path, size
+            )
+            print(f"{utility:>8} {before:14.1f} {after:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+"""
+Microbenchmark of the compiled-pattern cache used by stdisplay().
+
+Sanitizes a generated log one line at a time, the way stcat, stcatn and sttee
+do, once rebuilding the pattern for every line (the code path before the
+cache existed), once through stdisplay(), which reuses the cached pattern, and
+once through a Sanitizer instance, which resolves the policy only once.
+
+Run from a checkout:
+    PYTHONPATH=usr/lib/python3/dist-packages \\
+        python3 ci/benchmarks/stdisplay/bench_pattern_cache.py [LINES]
+"""
+
+import sys
+from re import compile as re_compile
+from time import perf_counter
+from stdisplay.stdisplay import (
+    get_sgr_pattern,
+    get_sgr_regex_cache_info,
+    Sanitizer,
+    stdisplay,
+)
+
+SGR: int = 2**24
+
+
+def make_log(lines: int) -> list[str]:
+    """Generate log lines with a sprinkle of SGR and unsafe characters."""
+    templates = [
+        "2026-01-01T00:00:{sec:02d} kernel: [{num}] usb 1-1: new device\n",
+        "\x1b[32mINFO\x1b[m request {num} served in {sec} ms\n",
+        "\x1b[1;31mERROR\x1b[0m worker {num} exited with status {sec}\n",
+        "user input: café \x1b]0;title\x07 id={num}\n",
+    ]
+    return [
+        templates[i % len(templates)].format(num=i, sec=i % 60)
+        for i in range(lines)
+    ]
+
+
+def uncached(untrusted_text: str) -> str:
+    """Sanitize the way stdisplay() did before patterns were cached."""
+    sgr_pattern = get_sgr_pattern(sgr=SGR, exclude_sgr=None)
+    sgr_pattern = r"(\x1b(?!\[" + sgr_pattern + r")|[^\x1b\n\t\x20-\x7E])"
+    return str(re_compile(sgr_pattern).sub("_", untrusted_text))
+
+
+def cached(untrusted_text: str) -> str:
+    """Sanitize through the compiled-pattern cache."""
+    return stdisplay(untrusted_text, sgr=SGR)
+
+
+def main() -> None:
+    """Run the benchmark and print the per-line cost of both code paths."""
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    log = make_log(lines)
+    results = {}
+    sanitizer = Sanitizer(sgr=SGR)
+    for name, func in (
+        ("before", uncached),
+        ("after", cached),
+        ("instance", sanitizer.sanitize),
+    ):
+        start = perf_counter()
+        for line in log:
+            func(line)
+        results[name] = perf_counter() - start
+        print(
+            f"{name:>8}: {results[name]:8.3f} s total, "
+            f"{results[name] / lines * 1e9:8.1f} ns/line"
+        )
+    for name in ("after", "instance"):
+        print(f"{name:>8}: {results['before'] / results[name]:.2f}x speedup")
+    print(f"cache: {get_sgr_regex_cache_info()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+"""
+Benchmark of the "regex" and "fsm" SGR engines.
+
+Adversarial inputs are long SGR parameter runs that the nested alternation
+pattern has to backtrack over, the typical input is colored log output.
+
+Run from a checkout:
+    PYTHONPATH=usr/lib/python3/dist-packages \\
+        python3 ci/benchmarks/stdisplay/bench_sgr_engine.py [FIELDS]
+"""
+
+import sys
+from time import perf_counter
+from stdisplay.stdisplay import Sanitizer, SGR_ENGINES
+
+
+def main() -> None:
+    """Print milliseconds taken by each engine on each input."""
+    fields = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    inputs = {
+        "zero run": "\x1b[" + ";0" * fields + "x",
+        "8-bit run": "\x1b[" + "38;5;1;" * fields + "x",
+        "leading zeros": ("\x1b[" + "0" * 50 + ";") * (fields // 10),
+        "colored log": "\x1b[1;31mERROR\x1b[0m job \x1b[38;5;10mok\x1b[m\n"
+        * (fields // 10),
+    }
+    sanitizers = {
+        engine: Sanitizer(sgr=2**24, engine=engine) for engine in SGR_ENGINES
+    }
+    print(
+        f"{'input':>14} " + " ".join(f"{e + ' ms':>10}" for e in SGR_ENGINES)
+    )
+    for name, text in inputs.items():
+        row = []
+        for sanitizer in sanitizers.values():
+            start = perf_counter()
+            sanitizer.sanitize(text)
+            row.append((perf_counter() - start) * 1000)
+        print(f"{name:>14} " + " ".join(f"{ms:10.2f}" for ms in row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+"""
+Wall time of stcat on a large file with a growing number of processes set by
+$STDISPLAY_JOBS, checking that the output never changes.
+
+Run from a checkout:
+    PYTHONPATH=usr/lib/python3/dist-packages \\
+        python3 ci/benchmarks/stdisplay/bench_stcat_jobs.py [MB]
+"""
+
+import hashlib
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+STCAT = Path(__file__).resolve().parents[3] / "usr" / "bin" / "stcat"
+LINE = "\x1b[1;31mERROR\x1b[0m caf\u00e9 \x1b[2J plain text of a log line\n"
+
+
+def run_stcat(path: Path, jobs: int) -> tuple[float, str]:
+    """Run stcat once, return its wall time and the digest of its output."""
+    env = dict(os.environ, STDISPLAY_JOBS=str(jobs), COLORTERM="truecolor")
+    start = perf_counter()
+    result = subprocess.run(
+        [sys.executable, str(STCAT), str(path)],
+        capture_output=True,
+        check=True,
+        env=env,
+    )
+    elapsed = perf_counter() - start
+    return elapsed, hashlib.sha256(result.stdout).hexdigest()
+
+
+def main() -> int:
+    """Print wall time and speedup per number of processes."""
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    cpus = os.cpu_count() or 1
+    print(f"{'jobs':>5} {'seconds':>8} {'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "input"
+        block = (LINE * (2**20 // len(LINE))).encode("utf-8")
+        path.write_bytes(block * size_mb)
+        serial, expected = run_stcat(path, 1)
+        print(f"{1:5} {serial:8.2f} {1:7.2f}x")
+        jobs = 2
+        ## At least one parallel run, to check its output.
+        while jobs <= max(2, cpus):
+            elapsed, digest = run_stcat(path, jobs)
+            if digest != expected:
+                print(f"{jobs:5} FAIL: output differs from the serial one")
+                return 1
+            print(f"{jobs:5} {elapsed:8.2f} {serial / elapsed:7.2f}x")
+            jobs *= 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+"""
+Peak RSS of stcat on files of growing size, against reading the whole file
+and sanitizing it at once, as stcat did before stdisplay_to().
+
+Run from a checkout:
+    PYTHONPATH=usr/lib/python3/dist-packages \\
+        python3 ci/benchmarks/stdisplay/bench_stcat_rss.py [MAX_MB]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+STCAT = Path(__file__).resolve().parents[3] / "usr" / "bin" / "stcat"
+WHOLE_FILE = (
+    "import sys; from pathlib import Path; "
+    + "from stdisplay.stdisplay import stdisplay; "
+    + "sys.stdout.write(stdisplay(Path(sys.argv[1]).read_text("
+    + "encoding='utf-8', errors='replace', newline='\\n')))"
+)
+LINE = "\x1b[1;31mERROR\x1b[0m caf\u00e9 \x1b[2J plain text of a log line\n"
+
+
+def peak_rss_kib(command: list[str]) -> int:
+    """Run a command with output discarded and return its peak RSS."""
+    with subprocess.Popen(command, stdout=subprocess.DEVNULL) as process:
+        _, status, usage = os.wait4(process.pid, 0)
+        process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, command)
+    return usage.ru_maxrss
+
+
+def main() -> None:
+    """Print peak RSS in MiB of both methods per file size."""
+    max_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    print(f"{'file MB':>8} {'whole file MiB':>15} {'stcat MiB':>10}")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "input"
+        block = (LINE * (2**20 // len(LINE))).encode("utf-8")
+        size_mb = 16
+        with open(path, "wb") as untrusted_file:
+            while size_mb <= max_mb:
+                while untrusted_file.tell() < size_mb * 2**20:
+                    untrusted_file.write(block)
+                untrusted_file.flush()
+                whole = peak_rss_kib(
+                    [sys.executable, "-c", WHOLE_FILE, str(path)]
+                )
+                stcat = peak_rss_kib([sys.executable, str(STCAT), str(path)])
+                print(f"{size_mb:8} {whole / 1024:15.1f} {stcat / 1024:10.1f}")
+                size_mb *= 4
+
+
+if __name__ == "__main__":
+    main()
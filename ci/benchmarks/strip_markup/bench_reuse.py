@@ -0,0 +1,91 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+"""
+Per call latency of strip_markup() on 100 byte notification bodies, with new
+engines for every pass as it used to, with pooled engines, and per string
+of strip_markup_many().
+
+Both ways run in the same process, alternating, and the fastest of many
+repeats is kept, so that the difference isn't lost in the noise of a busy
+machine.
+
+Run from a checkout:
+    PYTHONPATH=usr/lib/python3/dist-packages \\
+        python3 ci/benchmarks/strip_markup/bench_reuse.py [CALLS]
+"""
+
+import sys
+from timeit import timeit
+from strip_markup.engine import StripMarkupEngine
+from strip_markup.strip_markup_lib import (
+    may_hold_markup,
+    strip_markup,
+    strip_markup_many,
+)
+
+SIZE: int = 100
+REPEATS: int = 15
+BODIES: dict[str, str] = {
+    "markup": "<p>Backup <b>finished</b> on host-01, <i>42 files</i> sent.</p> ",
+    "entities": "Disk usage &gt; 90% on /var &amp; /home, cleanup &lt;now&gt; ",
+    "nested": "<<b>b>Bold!<</b>/b> ",
+    "plain": "A plain notification body without markup, numbers 1234 ",
+}
+
+
+def strip_markup_new_engines(untrusted_string: str) -> str:
+    """Strip markup constructing an engine per pass, as strip_markup() did."""
+    if not may_hold_markup(untrusted_string):
+        return untrusted_string
+    markup_stripper = StripMarkupEngine()
+    markup_stripper.feed(untrusted_string)
+    strip_one_string = markup_stripper.get_data()
+    if not may_hold_markup(strip_one_string):
+        return strip_one_string
+    markup_stripper = StripMarkupEngine()
+    markup_stripper.feed(strip_one_string)
+    if strip_one_string == markup_stripper.get_data():
+        return strip_one_string
+    return "".join(
+        "_" if char in ["<", ">", "&"] else char for char in strip_one_string
+    )
+
+
+def main() -> int:
+    """Print the fastest time per call of each way."""
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    print(
+        f"{'body':>9} {'new engines us':>15} {'pooled us':>10} {'many us':>8}"
+    )
+    for name, body in BODIES.items():
+        untrusted_string = (body * (SIZE // len(body) + 1))[:SIZE]
+        batch = [untrusted_string] * calls
+        if list(strip_markup_many(batch[:1])) != [
+            strip_markup_new_engines(untrusted_string)
+        ]:
+            print(f"{name:>9} FAIL: results differ")
+            return 1
+        best = [float("inf")] * 3
+        for _ in range(REPEATS):
+            for index, seconds in enumerate(
+                [
+                    timeit(
+                        lambda: strip_markup_new_engines(untrusted_string),
+                        number=calls,
+                    ),
+                    timeit(
+                        lambda: strip_markup(untrusted_string), number=calls
+                    ),
+                    timeit(lambda: list(strip_markup_many(batch)), number=1),
+                ]
+            ):
+                best[index] = min(best[index], seconds / calls * 1e6)
+        print(f"{name:>9} {best[0]:15.2f} {best[1]:10.2f} {best[2]:8.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
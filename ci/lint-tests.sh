@@ -36,4 +36,5 @@ printf '%s\n' "USER=${USER:-<unset>}  EUID=$EUID"
 ls -la -- "${HOME:-/root}/trojan-source" 2>/dev/null | head || true
 printf '%s\n' "::endgroup::"
 
-./run-tests
+## Also check the import time budgets of the tools, unless overridden.
+RUN_STARTUP_BENCHMARK="${RUN_STARTUP_BENCHMARK:-1}" ./run-tests
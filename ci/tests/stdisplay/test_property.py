@@ -17,11 +17,13 @@ for ALL inputs:
   - stdisplay never raises on any 'str' input
   - stdisplay is idempotent: stdisplay(stdisplay(s)) == stdisplay(s)
   - stdisplay output never contains raw control bytes other than \\n / \\t
+  - StreamSanitizer output equals stdisplay output for any chunking
+  - the "fsm" and "regex" SGR engines give identical output
 """
 
 import unittest
 from hypothesis import given, settings, strategies as st
-from stdisplay.stdisplay import stdisplay
+from stdisplay.stdisplay import stdisplay, StreamSanitizer
 
 ## Allowed control characters that stdisplay legitimately preserves.
 _ALLOWED_CONTROL = {"\n", "\t"}
@@ -67,6 +69,33 @@ class TestStdisplayProperties(unittest.TestCase):
                     f"input={s!r} output={out!r}"
                 )
 
+    @given(
+        st.lists(
+            st.text(alphabet=st.sampled_from("\x1b[;:0123458m\na\u00e9")),
+        ),
+        st.sampled_from([-1, 2**3, 2**4, 2**8, 2**24]),
+    )
+    def test_stream_equals_whole(self, chunks: list[str], sgr: int) -> None:
+        """Chunked sanitization must not depend on chunk boundaries."""
+        stream = StreamSanitizer(sgr=sgr)
+        output = [stream.feed(chunk) for chunk in chunks]
+        output.append(stream.finish())
+        self.assertEqual("".join(output), stdisplay("".join(chunks), sgr=sgr))
+
+    @given(
+        st.text(alphabet=st.sampled_from("\x1b[;:0123456789m\n")),
+        st.sampled_from([-1, 2**3, 2**4, 88, 2**8, 2**24]),
+        st.sampled_from([[], ["0*31"], ["0*38;0*5;0*25[0-4]", "0*1"]]),
+    )
+    def test_engines_agree(
+        self, s: str, sgr: int, exclude_sgr: list[str]
+    ) -> None:
+        """The linear time engine must accept exactly what the regex does."""
+        self.assertEqual(
+            stdisplay(s, sgr=sgr, exclude_sgr=exclude_sgr, engine="fsm"),
+            stdisplay(s, sgr=sgr, exclude_sgr=exclude_sgr),
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
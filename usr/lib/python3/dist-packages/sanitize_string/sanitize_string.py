@@ -10,6 +10,7 @@ sanitize_string.py: Strips markup and control characters from a string.
 """
 
 import sys
+from stdisplay.files import iter_records
 from .sanitize_string_lib import sanitize_string
 
 
@@ -19,15 +20,37 @@ def print_usage() -> None:
     """
 
     print(
-        "sanitize-string: Usage: sanitize-string [--help] max_length "
-        + "[string]\n"
+        "sanitize-string: Usage: sanitize-string [--help] [--batch] "
+        + "max_length [string]\n"
         + "  If no string is provided as an argument, the string is read from "
         + "standard input.\n"
-        + "  Set max_length to 'nolimit' to allow arbitrarily long strings.",
+        + "  Set max_length to 'nolimit' to allow arbitrarily long strings.\n"
+        + "  --batch, -0: Read NUL-delimited strings from standard input and "
+        + "write them\n"
+        + "  NUL-delimited, max_length applies to each string.",
         file=sys.stderr,
     )
 
 
+def print_records(max_string_length: int | None) -> int:
+    """
+    Sanitizes NUL-delimited strings from standard input, each truncated to
+    max_string_length, and prints them NUL-delimited.
+    """
+
+    if sys.stdin is None:
+        return 0
+    sys.stdout.reconfigure(  # type: ignore
+        encoding="ascii", errors="replace", newline="\n"
+    )
+    for untrusted_record in iter_records(sys.stdin.buffer):
+        untrusted_string = untrusted_record.decode("utf-8", errors="replace")
+        sanitized_string = sanitize_string(untrusted_string)
+        sys.stdout.write(sanitized_string[:max_string_length] + "\0")
+    sys.stdout.flush()
+    return 0
+
+
 # pylint: disable=too-many-branches,too-many-return-statements
 def main() -> int:
     """
@@ -36,6 +59,7 @@ def main() -> int:
 
     untrusted_string: str | None = None
     max_string_length: int | None = None
+    batch: bool = False
 
     ## Process arguments
     if len(sys.argv) < 2:
@@ -49,6 +73,9 @@ def main() -> int:
         if arg in ("--help", "-h"):
             print_usage()
             return 0
+        elif arg in ("--batch", "-0"):
+            batch = True
+            arg_list.pop(0)
         elif arg == "--":
             arg_list.pop(0)
             break
@@ -56,7 +83,7 @@ def main() -> int:
             break
 
     ## Parse positional arguments
-    if len(arg_list) > 2 or len(arg_list) < 1:
+    if len(arg_list) > (1 if batch else 2) or len(arg_list) < 1:
         print_usage()
         return 1
     if arg_list[0] != "nolimit":
@@ -71,6 +98,9 @@ def main() -> int:
     if len(arg_list) == 2:
         untrusted_string = arg_list[1]
 
+    if batch:
+        return print_records(max_string_length)
+
     ## Read untrusted_string from stdin if needed
     if untrusted_string is None:
         if sys.stdin is not None:
@@ -10,9 +10,22 @@ sanitize_string_lib.py: Library for stripping markup and control characters
 from a string.
 """
 
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from os import PathLike
 from strip_markup.strip_markup_lib import strip_markup
 from stdisplay.stdisplay import stdisplay
 
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+    from typing import Optional
+
+## Characters sanitize_string_async() sanitizes in the event loop, smaller
+## than for stdisplay() as stripping markup is several times slower.
+SANITIZE_STRING_INLINE_LIMIT: int = 2**12
+
 
 def sanitize_string(untrusted_string: str) -> str:
     """
@@ -34,9 +47,58 @@ def sanitize_string(untrusted_string: str) -> str:
     ##
     ## In benchmarking, stdisplay is anywhere between three and ten times
     ## faster than strip_markup, thus we use "strip escapes, strip markup,
-    ## then strip escapes again."
+    ## then strip escapes again." See ci/benchmarks/bench_suite.py.
 
     step_one_sanitized_string: str = stdisplay(untrusted_string, sgr=-1)
     step_two_sanitized_string: str = strip_markup(step_one_sanitized_string)
     final_sanitized_string: str = stdisplay(step_two_sanitized_string, sgr=-1)
     return final_sanitized_string
+
+
+def sanitize_string_many(
+    untrusted_items: Iterable[str | PathLike[str]],
+    chunk_size: int = 64,
+    max_workers: Optional[int] = None,
+) -> Iterator[str]:
+    """
+    Sanitizes many strings, or the contents of many files given as paths,
+    across a process pool. Results are yielded in input order and are
+    identical to calling sanitize_string() on each item. See
+    stdisplay.parallel.map_ordered() for the parameters.
+    """
+
+    ## Imported here so that sanitizing a single string doesn't pay for
+    ## loading the process pool machinery.
+    # pylint: disable=import-outside-toplevel
+    from stdisplay.parallel import map_ordered
+
+    return map_ordered(
+        sanitize_string,
+        untrusted_items,
+        chunk_size=chunk_size,
+        max_workers=max_workers,
+    )
+
+
+async def sanitize_string_async(
+    untrusted_string: str,
+    inline_limit: int = SANITIZE_STRING_INLINE_LIMIT,
+    executor: Optional[Executor] = None,
+) -> str:
+    """
+    Sanitizes a string from asyncio code. Strings longer than inline_limit
+    are sanitized in an executor, so that the event loop isn't blocked.
+    See stdisplay.aio.sanitize_batch() for the parameters.
+    """
+
+    ## Imported here so that synchronous callers don't load asyncio.
+    # pylint: disable=import-outside-toplevel
+    from stdisplay.aio import sanitize_batch
+
+    sanitized_strings = await sanitize_batch(
+        sanitize_string,
+        [untrusted_string],
+        inline_limit=inline_limit,
+        executor=executor,
+    )
+    return sanitized_strings[0]
@@ -5,10 +5,17 @@
 
 # pylint: disable=missing-module-docstring,fixme,unknown-option-value
 
+import asyncio
 from strip_markup.tests.strip_markup import TestStripMarkupBase
+from stdisplay.tests import get_deferred_imports
 from stdisplay.tests.stdisplay import simple_escape_cases
 
 from sanitize_string.sanitize_string import main as sanitize_string_main
+from sanitize_string.sanitize_string_lib import (
+    sanitize_string,
+    sanitize_string_async,
+    sanitize_string_many,
+)
 
 
 class TestSanitizeString(TestStripMarkupBase):
@@ -20,9 +27,11 @@ class TestSanitizeString(TestStripMarkupBase):
 
     argv0: str = "sanitize-string"
     help_str: str = """\
-sanitize-string: Usage: sanitize-string [--help] max_length [string]
+sanitize-string: Usage: sanitize-string [--help] [--batch] max_length [string]
   If no string is provided as an argument, the string is read from standard input.
   Set max_length to 'nolimit' to allow arbitrarily long strings.
+  --batch, -0: Read NUL-delimited strings from standard input and write them
+  NUL-delimited, max_length applies to each string.
 """
 
     def test_help(self) -> None:
@@ -50,6 +59,9 @@ sanitize-string: Usage: sanitize-string [--help] max_length [string]
             ["-5"],
             ["not-a-number"],
             ["1", "2", "3"],
+            ["--batch"],
+            ["--batch", "1", "2"],
+            ["-0", "--", "nolimit", "2"],
         ]
 
         for test_args in test_args_list:
@@ -258,3 +270,76 @@ That is, with a n""",
                 args=[test_case[1]],
                 stdin_string=test_case[0],
             )
+
+    def test_batch(self) -> None:
+        """
+        Ensure NUL-delimited strings are sanitized and truncated one by one.
+        """
+
+        untrusted_strings: list[str] = [
+            "abcdef",
+            "<b>bold</b>",
+            "",
+            "\x1b[31mred\x1b[0m",
+            "a\u202eb\n",
+        ]
+        for max_length, limit in (("nolimit", None), ("3", 3)):
+            for batch_arg in ("--batch", "-0"):
+                self._test_stdin(
+                    main_func=sanitize_string_main,
+                    argv0=self.argv0,
+                    stdout_string="".join(
+                        sanitize_string(untrusted_string)[:limit] + "\0"
+                        for untrusted_string in untrusted_strings
+                    ),
+                    stderr_string="",
+                    args=[batch_arg, max_length],
+                    stdin_string="\0".join(untrusted_strings),
+                )
+
+    def test_sanitize_string_many(self) -> None:
+        """
+        Ensures bulk sanitization returns the serial results in input order.
+        """
+
+        test_list: list[str] = [case[0] for case in simple_escape_cases]
+        test_list.extend(
+            ["<b>bold</b>", "&lt;b&gt;not bold&lt;/b&gt;", "a\x1b[31m<i>b"]
+            * 20
+        )
+        self.assertEqual(
+            list(sanitize_string_many(test_list, chunk_size=3, max_workers=2)),
+            [sanitize_string(test_string) for test_string in test_list],
+        )
+
+    def test_sanitize_string_async(self) -> None:
+        """
+        Ensures the asyncio API returns the synchronous result, whether the
+        string is sanitized in the event loop or in an executor.
+        """
+
+        test_string: str = "a\x1b[31m<i>b</i>&lt;\x1b[2J" * 10
+        for inline_limit in (0, len(test_string)):
+            self.assertEqual(
+                asyncio.run(
+                    sanitize_string_async(
+                        test_string, inline_limit=inline_limit
+                    )
+                ),
+                sanitize_string(test_string),
+            )
+
+    def test_deferred_imports(self) -> None:
+        """
+        Ensures sanitizing imports no deferred module but the HTML parser,
+        and that one only for strings that may hold markup.
+        """
+
+        code: str = (
+            "from sanitize_string.sanitize_string import main\n"
+            + "sys.argv = ['sanitize-string', 'nolimit', '<b>a</b>']\n"
+            + "main()\n"
+        )
+        self.assertEqual({"html.parser"}, get_deferred_imports(code))
+        code = code.replace("'<b>a</b>'", "'a > b'")
+        self.assertEqual(set(), get_deferred_imports(code))
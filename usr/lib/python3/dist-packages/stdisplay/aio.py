@@ -0,0 +1,183 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+"""
+Sanitize untrusted text from asyncio code without blocking the event loop.
+"""
+
+from __future__ import annotations
+
+from asyncio import get_running_loop
+from collections.abc import AsyncIterator, Callable, Iterable
+from functools import partial
+from io import StringIO
+from stdisplay.binary import BytesStreamSanitizer
+from stdisplay.stdisplay import DETECT_SGR, resolve_sgr, stdisplay_to
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from asyncio import StreamReader
+    from concurrent.futures import Executor
+    from typing import Optional
+    from stdisplay.stdisplay import SgrSupport
+
+## Characters stdisplay() sanitizes in the event loop. Larger batches are
+## sent to an executor. Sanitizing this many takes about a millisecond on
+## mixed input, more than ten times the cost of a round trip to the default
+## executor. See ci/benchmarks/stdisplay/bench_aio.py.
+STDISPLAY_INLINE_LIMIT: int = 2**14
+## Characters stdisplay_async() sanitizes with a single pattern call in an
+## executor. Patterns hold the global interpreter lock until they return,
+## so the event loop can only run in between.
+ASYNC_CHUNK_SIZE: int = 2**12
+
+
+def _stdisplay_chunked(
+    untrusted_text: str, sgr: int, exclude_sgr: Optional[list[str]]
+) -> str:
+    """Sanitize text with stdisplay() in chunks of ASYNC_CHUNK_SIZE."""
+    output = StringIO()
+    stdisplay_to(
+        output,
+        untrusted_text,
+        sgr=sgr,
+        exclude_sgr=exclude_sgr,
+        chunk_size=ASYNC_CHUNK_SIZE,
+    )
+    return output.getvalue()
+
+
+def _sanitize_all(
+    func: Callable[[str], str], untrusted_texts: list[str]
+) -> list[str]:
+    """Apply a sanitizer to every text, in an executor."""
+    return [func(untrusted_text) for untrusted_text in untrusted_texts]
+
+
+async def sanitize_batch(
+    func: Callable[[str], str],
+    untrusted_texts: Iterable[str],
+    inline_limit: int = STDISPLAY_INLINE_LIMIT,
+    executor: Optional[Executor] = None,
+) -> list[str]:
+    """Sanitize a batch of texts, in an executor if the batch is large.
+
+    Batches of at most inline_limit characters in total are sanitized
+    directly, they take less time than handing them to an executor.
+
+    The default executor is a thread pool. Sanitizing there still holds the
+    global interpreter lock, but the interpreter switches to the event loop
+    every few milliseconds while Python code runs, not during a single call
+    into C such as a pattern substitution. A ProcessPoolExecutor doesn't
+    hold up the loop at all and sanitizes in parallel, func must then be
+    picklable, such as a module level function or a partial() of one.
+
+    Parameters
+    ----------
+    func : Callable[[str], str]
+        Function sanitizing one text.
+    untrusted_texts : Iterable[str]
+        Untrusted texts.
+    inline_limit : int = STDISPLAY_INLINE_LIMIT
+        Number of characters of the largest batch sanitized in the event loop.
+    executor : Optional[concurrent.futures.Executor] = None
+        Executor of large batches, the default executor of the loop if None.
+
+    Returns
+    -------
+    list[str]
+        Sanitized text of each item, in the order of the input.
+    """
+    untrusted_texts = list(untrusted_texts)
+    if sum(map(len, untrusted_texts)) <= inline_limit:
+        return _sanitize_all(func, untrusted_texts)
+    return await get_running_loop().run_in_executor(
+        executor, _sanitize_all, func, untrusted_texts
+    )
+
+
+async def stdisplay_async(
+    untrusted_text: str,
+    sgr: SgrSupport = DETECT_SGR,
+    exclude_sgr: Optional[list[str]] = None,
+    inline_limit: int = STDISPLAY_INLINE_LIMIT,
+    executor: Optional[Executor] = None,
+) -> str:
+    """Sanitize untrusted text with stdisplay(), see sanitize_batch().
+
+    SGR support is detected in the calling thread, so that the result is the
+    same in any executor. Large texts are sanitized in chunks, so that the
+    event loop gets to run in between when the executor is a thread pool.
+
+    Examples
+    --------
+    >>> import asyncio
+    >>> asyncio.run(stdisplay_async("\\x1b[31mred\\x1b[2J", sgr=2**4))
+    '\\x1b[31mred_[2J'
+    """
+    sgr = resolve_sgr(sgr)
+    sanitized_texts = await sanitize_batch(
+        partial(_stdisplay_chunked, sgr=sgr, exclude_sgr=exclude_sgr),
+        [untrusted_text],
+        inline_limit=inline_limit,
+        executor=executor,
+    )
+    return sanitized_texts[0]
+
+
+async def stdisplay_reader(
+    reader: StreamReader,
+    sgr: SgrSupport = DETECT_SGR,
+    exclude_sgr: Optional[list[str]] = None,
+    engine: str = "regex",
+    chunk_size: int = STDISPLAY_INLINE_LIMIT,
+) -> AsyncIterator[bytes]:
+    """Sanitize untrusted UTF-8 bytes read from a stream as they arrive.
+
+    Chunks are sanitized by a BytesStreamSanitizer in the event loop, no
+    larger than a batch sanitize_batch() would sanitize there. Sequences
+    split between chunks are held back until complete, so the concatenated
+    output is the same as stdisplay_bytes() of everything read.
+
+    Parameters
+    ----------
+    reader : asyncio.StreamReader
+        Stream of untrusted bytes, read until end of file.
+    sgr : SgrSupport = DETECT_SGR
+        Number of SGR codes the terminal supports, detected with
+        get_sgr_support() when DETECT_SGR. None disables SGR.
+    exclude_sgr : Optional[list[str]] = None
+        SGR codes to be excluded.
+    engine : str = "regex"
+        One of SGR_ENGINES.
+    chunk_size : int = STDISPLAY_INLINE_LIMIT
+        Largest number of bytes read and sanitized at once.
+
+    Yields
+    ------
+    bytes
+        Sanitized ASCII bytes, never empty.
+
+    Examples
+    --------
+    >>> import asyncio
+    >>> async def read_all(data: bytes) -> list[bytes]:
+    ...     reader = asyncio.StreamReader()
+    ...     reader.feed_data(data)
+    ...     reader.feed_eof()
+    ...     return [chunk async for chunk in stdisplay_reader(reader, sgr=-1)]
+    >>> asyncio.run(read_all(b"caf\\xc3\\xa9 \\x1b[2J"))
+    [b'caf_ _[2J']
+    """
+    stream = BytesStreamSanitizer(
+        sgr=sgr, exclude_sgr=exclude_sgr, engine=engine
+    )
+    while untrusted_chunk := await reader.read(chunk_size):
+        sanitized_chunk = stream.feed(untrusted_chunk)
+        if sanitized_chunk:
+            yield sanitized_chunk
+    sanitized_chunk = stream.finish()
+    if sanitized_chunk:
+        yield sanitized_chunk
@@ -0,0 +1,428 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+"""
+Sanitize untrusted UTF-8 bytes without decoding them.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Buffer, Iterable
+from functools import lru_cache, partial
+from re import compile as re_compile
+from stdisplay.stdisplay import (
+    DETECT_SGR,
+    get_sanitizer,
+    get_sgr_pattern,
+    normalize_sgr,
+    SAFE_ASCII_BYTES,
+    SGR_ENGINES,
+    SGR_REGEX_CACHE_SIZE,
+    STDISPLAY_CHUNK_SIZE,
+)
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from re import Pattern
+    from typing import Optional, Protocol
+    from stdisplay.stdisplay import Sanitizer, SgrSupport
+
+    # pylint: disable=too-few-public-methods
+    class SupportsWriteBytes(Protocol):
+        """Binary file or BlockWriter sanitized bytes can be written to."""
+
+        def write(self, data: bytes, /) -> int:
+            """Write bytes and return the number of bytes written."""
+
+
+## Continuation of a byte that isn't ASCII, so that a whole character or a
+## whole invalid sequence is matched, each of which the UTF-8 decoder of
+## Python turns into a single character with errors="replace": the rest of
+## a well formed sequence, the longest part of one that is cut short, or
+## nothing. See "maximal subpart" in chapter 3.9 of the Unicode Standard.
+## Patterns start with a character set, so that the regular expression
+## engine skips safe bytes without trying each alternative.
+NON_ASCII_TAIL_PATTERN: bytes = (
+    rb"(?:(?<=[\xc2-\xdf])[\x80-\xbf]"
+    + rb"|(?<=\xe0)[\xa0-\xbf][\x80-\xbf]?"
+    + rb"|(?<=[\xe1-\xec\xee\xef])[\x80-\xbf][\x80-\xbf]?"
+    + rb"|(?<=\xed)[\x80-\x9f][\x80-\xbf]?"
+    + rb"|(?<=\xf0)[\x90-\xbf](?:[\x80-\xbf][\x80-\xbf]?)?"
+    + rb"|(?<=[\xf1-\xf3])[\x80-\xbf](?:[\x80-\xbf][\x80-\xbf]?)?"
+    + rb"|(?<=\xf4)[\x80-\x8f](?:[\x80-\xbf][\x80-\xbf]?)?)?"
+)
+## Bytes that aren't ASCII, at most one in this many bytes is sanitized with
+## patterns. Denser input is decoded, which is faster than the pattern for
+## text in most other scripts than Latin.
+NON_ASCII_DENSITY: int = 8
+ASCII_BYTES: bytes = bytes(range(0x80))
+## A sequence at the end of a chunk that may continue in the next one: an
+## ESC that may still become an allowed SGR sequence, or the start of a
+## multibyte sequence.
+INCOMPLETE_BYTES_RE: Pattern[bytes] = re_compile(
+    rb"(?:\x1b(?:\[[0-9;:]*)?"
+    + rb"|[\xc2-\xf4]|[\xe0-\xf4][\x80-\xbf]|[\xf0-\xf4][\x80-\xbf]{2})\Z"
+)
+SGR_PARAMETERS_BYTES_RE: Pattern[bytes] = re_compile(rb"[0-9;:]*")
+
+
+@lru_cache(maxsize=SGR_REGEX_CACHE_SIZE)
+def _compile_sgr_bytes_regex(sgr: int) -> Pattern[bytes]:
+    """Compile the bytes sanitization pattern of a normalized SGR level."""
+    sgr_pattern = get_sgr_pattern(sgr=sgr, exclude_sgr=None)
+    return re_compile(
+        rb"[^\t\n\x20-\x7e](?:(?<=\x1b)(?!\["
+        + sgr_pattern.encode("ascii")
+        + rb")|(?<!\x1b)"
+        + NON_ASCII_TAIL_PATTERN
+        + rb")"
+    )
+
+
+# pylint: disable=too-few-public-methods
+class BytesSanitizer:
+    """Sanitize untrusted UTF-8 bytes with a fixed SGR policy.
+
+    The result is identical to decoding the bytes with errors="replace",
+    sanitizing the text with Sanitizer and encoding it as ASCII, without
+    the round trip: every non-ASCII character and every invalid sequence
+    is replaced by a single underscore, by a pattern run on the bytes.
+
+    Only the "regex" engine without exclusions runs on the bytes, in a
+    single pass. Exclusions are patterns matched on text, and the "fsm"
+    engine validates SGR sequences of text, so otherwise the bytes are
+    decoded, as is input with many bytes that aren't ASCII, see
+    NON_ASCII_DENSITY.
+
+    Parameters
+    ----------
+    sgr : SgrSupport = DETECT_SGR
+        Number of SGR codes the terminal supports, detected with
+        get_sgr_support() when DETECT_SGR. None disables SGR.
+    exclude_sgr : Optional[list[str]] = None
+        SGR codes to be excluded.
+    engine : str = "regex"
+        One of SGR_ENGINES.
+
+    Raises
+    ------
+    ValueError
+        If the engine is unknown.
+
+    Examples
+    --------
+    >>> sanitizer = BytesSanitizer(sgr=2**4)
+    >>> sanitizer.sanitize(b"\\x1b[31mcaf\\xc3\\xa9 \\xe2\\x82\\xff\\x1b[2J")
+    b'\\x1b[31mcaf_ ___[2J'
+    """
+
+    def __init__(
+        self,
+        sgr: SgrSupport = DETECT_SGR,
+        exclude_sgr: Optional[list[str]] = None,
+        engine: str = "regex",
+    ) -> None:
+        if engine not in SGR_ENGINES:
+            raise ValueError(f"Unknown SGR engine: {engine!r}")
+        self.sanitizer: Sanitizer = get_sanitizer(
+            sgr=sgr, exclude_sgr=exclude_sgr, engine=engine
+        )
+        self._sub: Optional[Callable[[Buffer], bytes]] = None
+        if engine == "regex" and not self.sanitizer.exclude_sgr:
+            sgr_regex = _compile_sgr_bytes_regex(
+                normalize_sgr(self.sanitizer.sgr)
+            )
+            self._sub = partial(sgr_regex.sub, b"_")
+
+    def sanitize(self, untrusted_bytes: Buffer) -> bytes:
+        """Sanitize untrusted UTF-8 bytes, see stdisplay_bytes()."""
+        if not isinstance(untrusted_bytes, bytes):
+            untrusted_bytes = bytes(untrusted_bytes)
+        is_ascii = untrusted_bytes.isascii()
+        if is_ascii and not untrusted_bytes.translate(None, SAFE_ASCII_BYTES):
+            return untrusted_bytes
+        if self._sub is not None and (
+            is_ascii
+            or len(untrusted_bytes.translate(None, ASCII_BYTES))
+            * NON_ASCII_DENSITY
+            <= len(untrusted_bytes)
+        ):
+            return self._sub(untrusted_bytes)
+        untrusted_text = untrusted_bytes.decode("utf-8", errors="replace")
+        return self.sanitizer.sanitize(untrusted_text).encode("ascii")
+
+
+@lru_cache(maxsize=SGR_REGEX_CACHE_SIZE)
+def _get_bytes_sanitizer(
+    sgr: int, exclude_sgr: tuple[str, ...], engine: str
+) -> BytesSanitizer:
+    """Create the shared bytes sanitizer of a normalized SGR configuration."""
+    return BytesSanitizer(
+        sgr=sgr, exclude_sgr=list(exclude_sgr), engine=engine
+    )
+
+
+def get_bytes_sanitizer(
+    sgr: SgrSupport = DETECT_SGR,
+    exclude_sgr: Optional[list[str]] = None,
+    engine: str = "regex",
+) -> BytesSanitizer:
+    """Get the shared BytesSanitizer instance of an SGR configuration.
+
+    See get_sanitizer() for the parameters.
+    """
+    sanitizer = get_sanitizer(sgr=sgr, exclude_sgr=exclude_sgr, engine=engine)
+    return _get_bytes_sanitizer(
+        normalize_sgr(sanitizer.sgr), sanitizer.exclude_sgr, engine
+    )
+
+
+def stdisplay_bytes(
+    untrusted_bytes: Buffer,
+    sgr: SgrSupport = DETECT_SGR,
+    exclude_sgr: Optional[list[str]] = None,
+    engine: str = "regex",
+) -> bytes:
+    """Sanitize untrusted UTF-8 bytes to be printed to the terminal.
+
+    The result is the ASCII encoding of stdisplay() of the bytes decoded with
+    errors="replace", computed without decoding them. See BytesSanitizer.
+
+    Parameters
+    ----------
+    untrusted_bytes : Buffer
+        The unsafe bytes, such as bytes, a memoryview or a memory map.
+    sgr : SgrSupport = DETECT_SGR
+        Number of SGR codes the terminal supports, detected with
+        get_sgr_support() when DETECT_SGR. None disables SGR.
+    exclude_sgr : Optional[list[str]] = None
+        SGR codes to be excluded.
+    engine : str = "regex"
+        Engine validating SGR sequences, one of SGR_ENGINES. See Sanitizer.
+
+    Returns
+    -------
+    bytes
+        Sanitized ASCII bytes.
+
+    Examples
+    --------
+    >>> stdisplay_bytes(b"\\x1b[2Jna\\xc3\\xafve\\xed\\xa0\\x80", sgr=-1)
+    b'_[2Jna_ve___'
+    >>> stdisplay_bytes(memoryview(b"\\x1b[31mred\\x1b[0m"), sgr=2**4)
+    b'\\x1b[31mred\\x1b[0m'
+    """
+    return get_bytes_sanitizer(
+        sgr=sgr, exclude_sgr=exclude_sgr, engine=engine
+    ).sanitize(untrusted_bytes)
+
+
+def get_complete_length(untrusted_bytes: bytes | bytearray) -> int:
+    """Get the length of bytes without a sequence that may continue.
+
+    Sanitizing the bytes up to that length on their own gives the same
+    result as sanitizing them followed by more bytes, see
+    BytesStreamSanitizer.
+
+    Parameters
+    ----------
+    untrusted_bytes : bytes | bytearray
+        Untrusted UTF-8 bytes.
+
+    Returns
+    -------
+    int
+        Length of the bytes without an ESC that may still become an allowed
+        SGR sequence, or a multibyte sequence that may still be completed,
+        at their end.
+
+    Examples
+    --------
+    >>> get_complete_length(b"a\\xc3")
+    1
+    >>> get_complete_length(b"a\\x1b[31;")
+    1
+    >>> get_complete_length(b"a\\x1b[31mb")
+    7
+    """
+    esc = untrusted_bytes.rfind(b"\x1b")
+    match = None
+    if esc != -1:
+        match = INCOMPLETE_BYTES_RE.match(untrusted_bytes, esc)
+    if match is None:
+        ## A multibyte sequence is at most four bytes long.
+        match = INCOMPLETE_BYTES_RE.search(
+            untrusted_bytes, max(0, len(untrusted_bytes) - 3)
+        )
+    if match is None:
+        return len(untrusted_bytes)
+    return match.start()
+
+
+class BytesStreamSanitizer:
+    """Sanitize untrusted UTF-8 bytes received in chunks of any size.
+
+    The bytes version of StreamSanitizer: a trailing ESC that could still
+    start an allowed SGR sequence, and a trailing multibyte sequence that
+    could still be completed, are held back until the next chunk. The
+    concatenated output is identical to sanitizing the whole input at once.
+
+    Parameters
+    ----------
+    sgr : SgrSupport = DETECT_SGR
+        Number of SGR codes the terminal supports, detected with
+        get_sgr_support() when DETECT_SGR. None disables SGR.
+    exclude_sgr : Optional[list[str]] = None
+        SGR codes to be excluded.
+    engine : str = "regex"
+        One of SGR_ENGINES.
+
+    Examples
+    --------
+    >>> stream = BytesStreamSanitizer(sgr=2**4)
+    >>> stream.feed(b"caf\\xc3")
+    b'caf'
+    >>> stream.feed(b"\\xa9 \\x1b[3")
+    b'_ '
+    >>> stream.feed(b"1m\\xe2\\x82")
+    b'\\x1b[31m'
+    >>> stream.finish()
+    b'_'
+    """
+
+    def __init__(
+        self,
+        sgr: SgrSupport = DETECT_SGR,
+        exclude_sgr: Optional[list[str]] = None,
+        engine: str = "regex",
+    ) -> None:
+        self.sanitizer: BytesSanitizer = get_bytes_sanitizer(
+            sgr=sgr, exclude_sgr=exclude_sgr, engine=engine
+        )
+        ## Pieces of the held back sequence, joined once it is complete.
+        self._pending: list[bytes] = []
+
+    def _continues_pending(self, untrusted_chunk: bytes) -> bool:
+        """Check if the whole chunk extends a held back SGR sequence."""
+        if self._pending[0][:1] != b"\x1b":
+            return False
+        start = 0
+        if self._pending == [b"\x1b"]:
+            if not untrusted_chunk.startswith(b"["):
+                return False
+            start = 1
+        match = SGR_PARAMETERS_BYTES_RE.match(untrusted_chunk, start)
+        return match is not None and match.end() == len(untrusted_chunk)
+
+    def feed(self, untrusted_chunk: Buffer) -> bytes:
+        """Sanitize the next chunk of untrusted bytes.
+
+        Parameters
+        ----------
+        untrusted_chunk : Buffer
+            Continuation of previously fed bytes.
+
+        Returns
+        -------
+        bytes
+            Sanitized bytes, possibly shorter than the chunk if its end is
+            held back.
+        """
+        untrusted_chunk = bytes(untrusted_chunk)
+        if not untrusted_chunk:
+            return b""
+        if self._pending:
+            if self._continues_pending(untrusted_chunk):
+                self._pending.append(untrusted_chunk)
+                return b""
+            self._pending.append(untrusted_chunk)
+            untrusted_chunk = b"".join(self._pending)
+            self._pending = []
+        end = get_complete_length(untrusted_chunk)
+        if end < len(untrusted_chunk):
+            self._pending.append(untrusted_chunk[end:])
+            untrusted_chunk = untrusted_chunk[:end]
+        return self.sanitizer.sanitize(untrusted_chunk)
+
+    def finish(self) -> bytes:
+        """Sanitize bytes held back at the end of input.
+
+        Returns
+        -------
+        bytes
+            Sanitized remainder, the stream can be reused afterwards.
+        """
+        untrusted_bytes = b"".join(self._pending)
+        self._pending = []
+        return self.sanitizer.sanitize(untrusted_bytes)
+
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def stdisplay_bytes_to(
+    fp: SupportsWriteBytes,
+    untrusted: Iterable[Buffer],
+    sgr: SgrSupport = DETECT_SGR,
+    exclude_sgr: Optional[list[str]] = None,
+    engine: str = "regex",
+    chunk_size: int = STDISPLAY_CHUNK_SIZE,
+) -> int:
+    """Sanitize untrusted UTF-8 bytes and write them to a binary file.
+
+    The bytes version of stdisplay_to(), with no text layer on either side.
+
+    Parameters
+    ----------
+    fp : SupportsWriteBytes
+        Binary file or BlockWriter the sanitized bytes are written to.
+    untrusted : Iterable[Buffer]
+        Consecutive pieces of the unsafe bytes, such as the windows of
+        stdisplay.files.iter_file_bytes().
+    sgr : SgrSupport = DETECT_SGR
+        Number of SGR codes the terminal supports, detected with
+        get_sgr_support() when DETECT_SGR. None disables SGR.
+    exclude_sgr : Optional[list[str]] = None
+        SGR codes to be excluded.
+    engine : str = "regex"
+        Engine validating SGR sequences, one of SGR_ENGINES. See Sanitizer.
+    chunk_size : int = STDISPLAY_CHUNK_SIZE
+        Largest number of bytes sanitized at a time.
+
+    Returns
+    -------
+    int
+        Number of bytes written.
+
+    Raises
+    ------
+    ValueError
+        If the chunk size is lower than 1.
+
+    Examples
+    --------
+    >>> from io import BytesIO
+    >>> output = BytesIO()
+    >>> stdisplay_bytes_to(output, [b"\\x1b[3", b"1m\\xc3", b"\\xa9"], sgr=16)
+    6
+    >>> output.getvalue()
+    b'\\x1b[31m_'
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+    stream = BytesStreamSanitizer(
+        sgr=sgr, exclude_sgr=exclude_sgr, engine=engine
+    )
+    written = 0
+    for untrusted_item in untrusted:
+        ## Released before the next item, which may unmap this one.
+        with memoryview(untrusted_item).cast("B") as view:
+            for start in range(0, len(view), chunk_size):
+                sanitized_chunk = stream.feed(view[start : start + chunk_size])
+                if sanitized_chunk:
+                    written += fp.write(sanitized_chunk)
+    sanitized_chunk = stream.finish()
+    if sanitized_chunk:
+        written += fp.write(sanitized_chunk)
+    return written
@@ -0,0 +1,147 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+"""
+Client of the stdisplay daemon, kept free of heavy imports so that asking the
+daemon costs less than sanitizing in process.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from stat import S_ISSOCK
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Optional
+
+## Version of the request format, the daemon declines other versions.
+PROTOCOL: bytes = b"stdisplay1"
+## Response statuses.
+STATUS_OK: bytes = b"0"
+STATUS_DECLINED: bytes = b"1"
+## Seconds to wait for the daemon before sanitizing in process.
+CLIENT_TIMEOUT: float = 2.0
+## Largest request the daemon reads, twice the usual argument size limit.
+MAX_REQUEST_SIZE: int = 2**22
+## Layout of struct ucred, returned by SO_PEERCRED.
+UCRED_FORMAT: str = "3i"
+
+
+def get_socket_path() -> Optional[str]:
+    """Return the path of the daemon socket.
+
+    It is the environment variable $STDISPLAY_SOCKET if not empty, otherwise
+    "stdisplay.sock" in $XDG_RUNTIME_DIR if set, otherwise None.
+    """
+    path = os.environ.get("STDISPLAY_SOCKET", "")
+    if path:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR", "")
+    if runtime_dir:
+        return os.path.join(runtime_dir, "stdisplay.sock")
+    return None
+
+
+def encode_request(tool: str, args: list[str]) -> bytes:
+    """Encode a request as NUL separated fields.
+
+    The fields are the protocol version, the tool, the environment variables
+    TERM, COLORTERM and NO_COLOR, and the arguments, none of which can hold a
+    NUL.
+    """
+    fields = [
+        PROTOCOL,
+        tool.encode("ascii"),
+        *(
+            os.fsencode(os.environ.get(name, ""))
+            for name in ("TERM", "COLORTERM", "NO_COLOR")
+        ),
+        *(os.fsencode(arg) for arg in args),
+    ]
+    return b"\0".join(fields)
+
+
+def encode_response(status: bytes, output: bytes = b"") -> bytes:
+    """Encode the status and output with its length, to detect truncation."""
+    return status + len(output).to_bytes(8, "big") + output
+
+
+def _request(path: str, request: bytes) -> Optional[bytes]:
+    """Send a request and return the output, None if not answered."""
+    ## Only imported once a daemon is known to listen, as they take longer
+    ## to import than most tools take to run.
+    # pylint: disable=import-outside-toplevel
+    import socket
+    import struct
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(CLIENT_TIMEOUT)
+        client.connect(path)
+        ## Only a daemon of the same user, or root, is trusted to sanitize.
+        _, uid, _ = struct.unpack(
+            UCRED_FORMAT,
+            client.getsockopt(
+                socket.SOL_SOCKET,
+                socket.SO_PEERCRED,
+                struct.calcsize(UCRED_FORMAT),
+            ),
+        )
+        if uid not in (0, os.geteuid()):
+            return None
+        client.sendall(request)
+        client.shutdown(socket.SHUT_WR)
+        chunks = []
+        while chunk := client.recv(2**16):
+            chunks.append(chunk)
+    response = b"".join(chunks)
+    if response[:1] != STATUS_OK:
+        return None
+    output = response[9:]
+    if int.from_bytes(response[1:9], "big") != len(output):
+        return None
+    return output
+
+
+def run_client(tool: str, args: list[str]) -> bool:
+    """Print the output of a tool rendered by the daemon, if running.
+
+    Nothing is printed unless the whole output was received, so the caller
+    can sanitize in process if this fails.
+
+    Parameters
+    ----------
+    tool : str
+        Name of the tool, "stprint" or "stecho".
+    args : list[str]
+        Untrusted arguments of the tool.
+
+    Returns
+    -------
+    bool
+        True if the daemon printed the output, False if the caller has to.
+    """
+    path = get_socket_path()
+    ## Arguments of a real process can't hold a NUL, but those of a caller
+    ## of main() can.
+    if (
+        path is None
+        or "TERM" not in os.environ
+        or any("\0" in arg for arg in args)
+    ):
+        return False
+    try:
+        if not S_ISSOCK(os.stat(path).st_mode):
+            return False
+        output = _request(path, encode_request(tool, args))
+    except (OSError, UnicodeError):
+        return False
+    if output is None:
+        return False
+    sys.stdout.flush()
+    sys.stdout.buffer.write(output)
+    sys.stdout.flush()
+    return True
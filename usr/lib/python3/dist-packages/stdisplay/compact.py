@@ -0,0 +1,391 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+"""
+Compact the SGR sequences of sanitized text to the fewest bytes rendering
+the same.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from stdisplay.stdisplay import DETECT_SGR, get_sanitizer, parse_sgr_field
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Optional
+    from stdisplay.stdisplay import SgrSupport
+
+## SGR sequence of sanitized text, where every ESC starts an accepted one.
+SGR_SEQUENCE_RE = re.compile(r"\x1b\[([0-9;:]*)m")
+## Start of an SGR sequence cut by the end of a chunk.
+PARTIAL_SGR_RE = re.compile(r"\x1b(\[[0-9;:]*)?")
+## Slots of the attribute state, in the order codes are emitted.
+INTENSITY, ITALIC, UNDERLINE, BLINK, INVERSE, CONCEAL, STRIKE = range(7)
+FG, BG = range(7, 9)
+## Codes setting and resetting each flag slot.
+FLAG_CODES: dict[int, tuple[int, int]] = {
+    ITALIC: (3, 23),
+    UNDERLINE: (4, 24),
+    BLINK: (5, 25),
+    INVERSE: (7, 27),
+    CONCEAL: (8, 28),
+    STRIKE: (9, 29),
+}
+## Codes of the default color of the color slots.
+DEFAULT_COLOR_CODES: dict[int, str] = {FG: "39", BG: "49"}
+## Rendition after SGR 0. The intensity slot holds the codes of bold and
+## faint in the order they were last set, which terminals where the last one
+## wins depend on, after an unknown intensity if any. Color slots hold the
+## normalized parameters setting the color, "" being the default color.
+DEFAULT_STATE: tuple[object, ...] = ((),) + (False,) * 6 + ("", "")
+## Largest number of distinct sequences parsed or checked that are cached.
+SGR_CACHE_SIZE: int = 2**10
+
+## Pseudo slots of operations resetting the rendition and making it unknown.
+RESET, OPAQUE = -1, -2
+## Operation of each code without parameters of its own.
+SGR_OPERATIONS: dict[int, tuple[int, object]] = {
+    0: (RESET, None),
+    1: (INTENSITY, 1),
+    2: (INTENSITY, 2),
+    22: (INTENSITY, 0),
+    39: (FG, ""),
+    49: (BG, ""),
+    **{
+        code: (slot, code == codes[0])
+        for slot, codes in FLAG_CODES.items()
+        for code in codes
+    },
+    **{code: (FG, str(code)) for code in [*range(30, 38), *range(90, 98)]},
+    **{code: (BG, str(code)) for code in [*range(40, 48), *range(100, 108)]},
+}
+
+
+def _normalize_color(fields: list[str]) -> Optional[str]:
+    """Normalize the fields of an extended color, None if invalid."""
+    if len(fields) < 3:
+        return None
+    numbers = [parse_sgr_field(field) for field in fields]
+    if (
+        len(numbers) != {5: 3, 2: 5}.get(numbers[1])
+        or not 0 <= min(numbers[2:]) <= max(numbers[2:]) <= 255
+    ):
+        return None
+    return ":".join(map(str, numbers))
+
+
+@lru_cache(maxsize=SGR_CACHE_SIZE)
+def parse_sgr(params: str) -> tuple[tuple[int, object], ...]:
+    """Parse the parameters of an SGR sequence into state operations.
+
+    Each operation is a slot and the value it gets, which for the intensity
+    slot is the code set last, 0 clearing it. The pseudo slots RESET and
+    OPAQUE get None. OPAQUE replaces every operation of sequences with codes
+    whose rendition isn't tracked, such as SGR 21, double underline on some
+    terminals and bold off on others, or extended colors whose parameters
+    terminals read differently. Fields are read with parse_sgr_field(), so
+    that zero-padded fields of any length are parsed.
+
+    Parameters
+    ----------
+    params : str
+        Parameters of a sequence accepted by stdisplay(), without the CSI
+        and the final "m".
+
+    Returns
+    -------
+    tuple[tuple[int, object], ...]
+        Operations in the order the terminal applies them.
+
+    Examples
+    --------
+    >>> parse_sgr(";01;38;5;009")
+    ((-1, None), (0, 1), (7, '38;5;9'))
+    >>> parse_sgr("21")
+    ((-2, None),)
+    """
+    operations: list[tuple[int, object]] = []
+    fields = params.split(";")
+    index = 0
+    while index < len(fields):
+        param = fields[index]
+        if ":" in param:
+            color = _normalize_color(param.split(":"))
+            count = 1
+        else:
+            code = parse_sgr_field(param or "0")
+            if code not in (38, 48):
+                if code not in SGR_OPERATIONS:
+                    return ((OPAQUE, None),)
+                operations.append(SGR_OPERATIONS[code])
+                index += 1
+                continue
+            mode = fields[index + 1] if index + 1 < len(fields) else ""
+            count = {"5": 3, "2": 5}.get(mode.lstrip("0"), 0)
+            color = _normalize_color(fields[index : index + count])
+            if color is not None:
+                color = color.replace(":", ";")
+        if color is None or color[:3] not in ("38:", "48:", "38;", "48;"):
+            return ((OPAQUE, None),)
+        operations.append((FG if color[0] == "3" else BG, color))
+        index += count
+    return tuple(operations)
+
+
+def _get_intensity_codes(old: object, new: object) -> Optional[list[str]]:
+    """Get the codes changing the intensity slot, None if unreachable."""
+    if not isinstance(new, tuple):
+        return None
+    if not isinstance(old, tuple):
+        old = (old,)
+    if new[: len(old)] == old:
+        return [str(code) for code in new[len(old) :]]
+    if new and not isinstance(new[0], int):
+        ## Codes added to an unknown intensity.
+        return None
+    return ["22", *map(str, new)]
+
+
+def _get_codes(
+    source: tuple[object, ...], target: tuple[object, ...]
+) -> Optional[list[str]]:
+    """Get the codes changing the rendition from source to target.
+
+    Returns None if a slot differs and its target value is unknown, only
+    replaying the original sequences reaches it then.
+    """
+    codes: list[str] = []
+    for slot, (old, new) in enumerate(zip(source, target)):
+        if old == new:
+            continue
+        if slot == INTENSITY:
+            intensity_codes = _get_intensity_codes(old, new)
+            if intensity_codes is None:
+                return None
+            codes.extend(intensity_codes)
+        elif isinstance(new, bool):
+            codes.append(str(FLAG_CODES[slot][0 if new else 1]))
+        elif isinstance(new, str):
+            codes.append(new or DEFAULT_COLOR_CODES[slot])
+        else:
+            return None
+    return codes
+
+
+def _apply_sgr(
+    rendition: tuple[object, ...], params: str
+) -> tuple[object, ...]:
+    """Get the rendition an SGR sequence changes a rendition to."""
+    state = list(rendition)
+    for slot, value in parse_sgr(params):
+        if slot == RESET:
+            state = list(DEFAULT_STATE)
+        elif slot == OPAQUE:
+            state = [object()] * len(DEFAULT_STATE)
+        elif slot == INTENSITY:
+            intensity = state[INTENSITY]
+            if not isinstance(intensity, tuple):
+                intensity = (intensity,)
+            if not value:
+                state[INTENSITY] = ()
+            else:
+                ## Setting a code again makes it the last one set.
+                state[INTENSITY] = (
+                    *(code for code in intensity if code != value),
+                    value,
+                )
+        else:
+            state[slot] = value
+    return tuple(state)
+
+
+class SgrCompactor:
+    """Compact the SGR sequences of sanitized text fed in chunks.
+
+    Sequences are parsed to track the rendition they set, and held back
+    until text follows them. Only then the fewest bytes reaching the same
+    rendition from the one already written are emitted: nothing when it
+    didn't change, such as for a reset before every character, otherwise
+    the shorter of the codes of the slots that changed and a reset followed
+    by the codes of the slots that aren't default.
+
+    The rendition before the first sequence is unknown, as are slots set by
+    codes that aren't tracked, see parse_sgr(). Sequences changing a slot to
+    an unknown value are written as they are. So are sequences that would
+    be replaced by one the sanitizer of the same SGR configuration doesn't
+    accept, so that the output is always left unchanged by stdisplay().
+
+    The concatenated output of every feed() plus finish() is identical to
+    compacting the whole input at once.
+
+    Parameters
+    ----------
+    sgr : SgrSupport = DETECT_SGR
+        Number of SGR codes the terminal supports, detected with
+        get_sgr_support() when DETECT_SGR. None disables SGR.
+    exclude_sgr : Optional[list[str]] = None
+        SGR codes to be excluded.
+
+    Examples
+    --------
+    >>> compactor = SgrCompactor(sgr=2**4)
+    >>> compactor.feed("\\x1b[0m\\x1b[31ma\\x1b[0m\\x1b[31mb\\x1b[0")
+    '\\x1b[0;31mab'
+    >>> compactor.feed("m\\x1b[31m\\x1b[1mc")
+    '\\x1b[1mc'
+    >>> compactor.finish()
+    ''
+    """
+
+    def __init__(
+        self,
+        sgr: SgrSupport = DETECT_SGR,
+        exclude_sgr: Optional[list[str]] = None,
+    ) -> None:
+        self.sanitizer = get_sanitizer(sgr=sgr, exclude_sgr=exclude_sgr)
+        ## Unknown slots hold placeholders, equal only to themselves.
+        unknown = object()
+        self.emitted: tuple[object, ...] = (unknown,) * len(DEFAULT_STATE)
+        self.desired: tuple[object, ...] = self.emitted
+        self._pending: list[str] = []
+        self._partial: str = ""
+        self._renditions: dict[
+            tuple[tuple[object, ...], str], tuple[object, ...]
+        ] = {}
+        self._sequences: dict[
+            tuple[tuple[object, ...], tuple[object, ...], str], str
+        ] = {}
+
+    def _apply(self, params: str) -> None:
+        """Apply the parameters of a sequence to the desired rendition."""
+        key = (self.desired, params)
+        desired = self._renditions.get(key)
+        if desired is None:
+            if len(self._renditions) >= SGR_CACHE_SIZE:
+                self._renditions.clear()
+            ## A sequence always changes a rendition the same way, even an
+            ## unknown one, so the placeholders it creates can be reused.
+            desired = _apply_sgr(self.desired, params)
+            self._renditions[key] = desired
+        self.desired = desired
+
+    def _get_sequence(self) -> str:
+        """Get the shortest sequence reaching the desired rendition."""
+        pending = "".join(self._pending)
+        key = (self.emitted, self.desired, pending)
+        sequence = self._sequences.get(key)
+        if sequence is None:
+            if len(self._sequences) >= SGR_CACHE_SIZE:
+                self._sequences.clear()
+            sequence = pending
+            for source, prefix in [(self.emitted, []), (DEFAULT_STATE, ["0"])]:
+                codes = _get_codes(source, self.desired)
+                if codes is None or not codes and not prefix:
+                    continue
+                candidate = "\x1b[" + ";".join(prefix + codes) + "m"
+                if len(candidate) < len(sequence) and (
+                    self.sanitizer.sanitize(candidate) == candidate
+                ):
+                    sequence = candidate
+            self._sequences[key] = sequence
+        return sequence
+
+    def _flush(self, output: list[str]) -> None:
+        """Emit the sequences held back, as few as possible."""
+        if not self._pending:
+            return
+        if self.desired != self.emitted:
+            output.append(self._get_sequence())
+        self._pending = []
+        self.emitted = self.desired
+
+    def feed(self, sanitized_text: str) -> str:
+        """Compact a chunk of sanitized text.
+
+        Parameters
+        ----------
+        sanitized_text : str
+            Chunk of text sanitized by stdisplay() with the same SGR
+            configuration.
+
+        Returns
+        -------
+        str
+            Compacted text, without sequences that aren't followed by text
+            yet.
+        """
+        if self._partial:
+            sanitized_text = self._partial + sanitized_text
+            self._partial = ""
+        if not self._pending and "\x1b" not in sanitized_text:
+            return sanitized_text
+        last_esc = sanitized_text.rfind("\x1b")
+        if last_esc >= 0 and PARTIAL_SGR_RE.fullmatch(
+            sanitized_text, last_esc
+        ):
+            self._partial = sanitized_text[last_esc:]
+            sanitized_text = sanitized_text[:last_esc]
+        output: list[str] = []
+        position = 0
+        for match in SGR_SEQUENCE_RE.finditer(sanitized_text):
+            if match.start() > position:
+                self._flush(output)
+                output.append(sanitized_text[position : match.start()])
+            self._pending.append(match.group())
+            self._apply(match.group(1))
+            position = match.end()
+        if position < len(sanitized_text):
+            self._flush(output)
+            output.append(sanitized_text[position:])
+        return "".join(output)
+
+    def finish(self) -> str:
+        """Compact what is left at the end of the text.
+
+        Returns
+        -------
+        str
+            Sequences held back, reaching the rendition the text ends with.
+        """
+        output: list[str] = []
+        if self._partial:
+            self._flush(output)
+            output.append(self._partial)
+            self._partial = ""
+        self._flush(output)
+        return "".join(output)
+
+
+def compact_sgr(
+    sanitized_text: str,
+    sgr: SgrSupport = DETECT_SGR,
+    exclude_sgr: Optional[list[str]] = None,
+) -> str:
+    """Compact the SGR sequences of sanitized text, see SgrCompactor.
+
+    Parameters
+    ----------
+    sanitized_text : str
+        Text sanitized by stdisplay() with the same SGR configuration.
+    sgr : SgrSupport = DETECT_SGR
+        Number of SGR codes the terminal supports, detected with
+        get_sgr_support() when DETECT_SGR. None disables SGR.
+    exclude_sgr : Optional[list[str]] = None
+        SGR codes to be excluded.
+
+    Returns
+    -------
+    str
+        Text rendering the same with as few SGR sequences as possible.
+
+    Examples
+    --------
+    >>> compact_sgr("\\x1b[31ma\\x1b[31mb\\x1b[0m\\x1b[0m", sgr=2**4)
+    '\\x1b[31mab\\x1b[0m'
+    """
+    compactor = SgrCompactor(sgr=sgr, exclude_sgr=exclude_sgr)
+    return compactor.feed(sanitized_text) + compactor.finish()
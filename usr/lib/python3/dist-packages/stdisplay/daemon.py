@@ -0,0 +1,139 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+"""
+Long lived daemon rendering stprint and stecho for their clients.
+"""
+
+import os
+import signal
+import sys
+from collections.abc import Callable
+from socket import AF_UNIX, SOCK_STREAM, socket
+from socketserver import (
+    StreamRequestHandler,
+    ThreadingMixIn,
+    UnixStreamServer,
+)
+from typing import Any, Optional
+from stdisplay.client import (
+    CLIENT_TIMEOUT,
+    encode_response,
+    get_socket_path,
+    MAX_REQUEST_SIZE,
+    PROTOCOL,
+    STATUS_DECLINED,
+    STATUS_OK,
+)
+from stdisplay.stdisplay import detect_sgr_support, stdisplay
+
+## Output of each tool served, from its arguments and SGR support.
+TOOLS: dict[str, Callable[[list[str], int], str]] = {
+    "stprint": lambda args, sgr: stdisplay("".join(args), sgr=sgr),
+    "stecho": lambda args, sgr: stdisplay(" ".join(args), sgr=sgr) + "\n",
+}
+
+
+class SanitizeHandler(StreamRequestHandler):
+    """Answer a single request, see stdisplay.client.encode_request()."""
+
+    timeout = CLIENT_TIMEOUT
+    server: "SanitizeServer"
+
+    def render(self, request: bytes) -> Optional[bytes]:
+        """Render a request, None if it has to be declined."""
+        fields = request.split(b"\0")
+        if len(fields) < 5 or fields[0] != PROTOCOL:
+            return None
+        tool, term, colorterm, no_color, *args = (
+            os.fsdecode(field) for field in fields[1:]
+        )
+        if tool not in TOOLS:
+            return None
+        ## Curses only reads the terminfo database of the first terminal set
+        ## up, other terminals are only served if their SGR support doesn't
+        ## depend on it.
+        if term != self.server.term and not no_color:
+            return None
+        sgr = detect_sgr_support(term, colorterm, no_color)
+        return TOOLS[tool](args, sgr).encode("ascii", errors="replace")
+
+    def handle(self) -> None:
+        request = self.rfile.read(MAX_REQUEST_SIZE + 1)
+        output = None
+        if len(request) <= MAX_REQUEST_SIZE:
+            output = self.render(request)
+        if output is None:
+            self.wfile.write(encode_response(STATUS_DECLINED))
+        else:
+            self.wfile.write(encode_response(STATUS_OK, output))
+
+
+class SanitizeServer(ThreadingMixIn, UnixStreamServer):
+    """Serve requests on a UNIX socket only the user can use.
+
+    Every request is answered by its own thread, so that a client slow to
+    send its request doesn't hold back the others.
+
+    Parameters
+    ----------
+    path : str
+        Path of the socket. A stale socket is replaced, a socket another
+        daemon is listening on raises FileExistsError.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path: str) -> None:
+        with socket(AF_UNIX, SOCK_STREAM) as probe:
+            try:
+                probe.connect(path)
+            except FileNotFoundError:
+                pass
+            except ConnectionRefusedError:
+                os.unlink(path)
+            else:
+                raise FileExistsError(f"daemon already listening on {path}")
+        ## Set up the terminal of the daemon environment once, so that
+        ## requests never wait for the terminfo database.
+        self.term: str = os.environ.get("TERM", "")
+        detect_sgr_support(self.term, None, None)
+        umask = os.umask(0o177)
+        try:
+            super().__init__(path, SanitizeHandler)
+        finally:
+            os.umask(umask)
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.unlink(self.server_address)  # type: ignore[arg-type]
+        except FileNotFoundError:
+            pass
+
+
+def main() -> None:
+    """Serve on the socket of stdisplay.client.get_socket_path()."""
+    path = get_socket_path()
+    if path is None:
+        print(
+            "stdisplay-daemon: set STDISPLAY_SOCKET or XDG_RUNTIME_DIR",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+    def terminate(*_: Any) -> None:
+        sys.exit(0)
+
+    signal.signal(signal.SIGTERM, terminate)
+    with SanitizeServer(path) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+"""
+Parse SGR exclusions into keys checked with set lookups.
+"""
+
+from __future__ import annotations
+
+from re import compile as re_compile, Pattern
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Optional
+
+## Building blocks of exclude_sgr entries that SgrExclusions parses into
+## literal keys, entries with any other construct keep their regular
+## expression.
+EXCLUDE_TOKEN_RE: Pattern[str] = re_compile(
+    ## Separators.
+    r"\(:\|;\)|\(;\|:\)|\[:;\]|\[;:\]|[;:]"
+    ## Wildcard fields.
+    + r"|\\d[+*]|\[0-9\][+*]|\.\*"
+    ## Zero prefix, digits, digit ranges and alternatives of digits.
+    + r"|0\*|[0-9]|\[(?:[0-9](?:-[0-9])?)+\]|\((?:[0-9]+\|)*[0-9]+\)"
+)
+EXCLUDE_SEPARATORS: dict[str, tuple[str, ...]] = {
+    ";": (";",),
+    ":": (":",),
+    "(:|;)": (":", ";"),
+    "(;|:)": (":", ";"),
+    "[:;]": (":", ";"),
+    "[;:]": (":", ";"),
+}
+## Keys of wildcard fields: "*" is one or more digits, "**" is any digits,
+## including none.
+EXCLUDE_WILDCARDS: dict[str, str] = {
+    r"\d+": "*",
+    "[0-9]+": "*",
+    r"\d*": "**",
+    "[0-9]*": "**",
+    ".*": "**",
+}
+## Upper bound of keys a single exclude_sgr entry expands to.
+EXCLUDE_EXPANSION_LIMIT: int = 4096
+## A field and the separator following it, see SgrExclusions.excludes().
+SGR_FIELD_RE: Pattern[str] = re_compile(r"([0-9]*)([;:]?)")
+
+
+def _split_alternatives(entry: str) -> list[str]:
+    """Split a regular expression at its top level alternations."""
+    alternatives = []
+    depth = 0
+    start = 0
+    for index, char in enumerate(entry):
+        if char in "([":
+            depth += 1
+        elif char in ")]":
+            depth -= 1
+        elif char == "|" and not depth:
+            alternatives.append(entry[start:index])
+            start = index + 1
+    alternatives.append(entry[start:])
+    return alternatives
+
+
+def _expand_digits(token: str) -> list[str]:
+    """Expand a digit, digit range or alternative of digits token."""
+    if token.startswith("("):
+        return token[1:-1].split("|")
+    if not token.startswith("["):
+        return [token]
+    digits = []
+    inner = token[1:-1]
+    index = 0
+    while index < len(inner):
+        if inner[index + 1 : index + 2] == "-":
+            first, last = int(inner[index]), int(inner[index + 2])
+            digits += [str(digit) for digit in range(first, last + 1)]
+            index += 3
+        else:
+            digits.append(inner[index])
+            index += 1
+    return digits
+
+
+def _parse_field(tokens: list[str], last: bool) -> Optional[list[str]]:
+    """Parse the tokens of an exclusion field into keys.
+
+    Keys of literal fields are their digits without leading zeros, prefixed
+    with "=" if the field doesn't start with "0*" and therefore doesn't allow
+    leading zeros. Wildcards are keyed as in EXCLUDE_WILDCARDS.
+    """
+    if len(tokens) == 1 and tokens[0] in EXCLUDE_WILDCARDS:
+        ## ".*" followed by a separator could match across separators.
+        if last or tokens[0] != ".*":
+            return [EXCLUDE_WILDCARDS[tokens[0]]]
+        return None
+    zero_prefix = bool(tokens) and tokens[0] == "0*"
+    digit_tokens = tokens[1:] if zero_prefix else tokens
+    if not digit_tokens or any(
+        t == "0*" or t in EXCLUDE_WILDCARDS for t in digit_tokens
+    ):
+        return None
+    keys = [""]
+    for token in digit_tokens:
+        keys = [key + digit for key in keys for digit in _expand_digits(token)]
+        if len(keys) > EXCLUDE_EXPANSION_LIMIT:
+            return None
+    ## Leading zeros in the field would be required, which the keys can't
+    ## express, except for the "0*0" of all zeros.
+    if any(k.startswith("0") and (k != "0" or not zero_prefix) for k in keys):
+        return None
+    return [key.lstrip("0") if zero_prefix else "=" + key for key in keys]
+
+
+def _parse_alternative(alternative: str) -> Optional[list[tuple[str, ...]]]:
+    """Parse an exclusion alternative into keys, None if unsupported."""
+    keys: list[tuple[str, ...]] = [()]
+    field: list[str] = []
+    position = 0
+    while position < len(alternative):
+        match = EXCLUDE_TOKEN_RE.match(alternative, position)
+        if not match:
+            return None
+        position = match.end()
+        token = match.group()
+        if token not in EXCLUDE_SEPARATORS:
+            field.append(token)
+            continue
+        field_keys = _parse_field(field, last=False)
+        if field_keys is None:
+            return None
+        keys = [
+            key + (field_key, separator)
+            for key in keys
+            for field_key in field_keys
+            for separator in EXCLUDE_SEPARATORS[token]
+        ]
+        if len(keys) > EXCLUDE_EXPANSION_LIMIT:
+            return None
+        field = []
+    ## A trailing separator may be followed by anything.
+    field_keys = _parse_field(field, last=True) if field else ["**"]
+    if field_keys is None or len(keys) * len(field_keys) > (
+        EXCLUDE_EXPANSION_LIMIT
+    ):
+        return None
+    return [key + (field_key,) for key in keys for field_key in field_keys]
+
+
+class _KeyNode:
+    """Node of the exclusion trie, see SgrExclusions."""
+
+    __slots__ = ("last", "last_exact", "children")
+
+    def __init__(self) -> None:
+        ## Keys of exclusions ending at this field, separately for the keys
+        ## that don't allow leading zeros.
+        self.last: set[str] = set()
+        self.last_exact: set[str] = set()
+        ## Nodes of the next field by key of this field and separator.
+        self.children: dict[tuple[str, str], _KeyNode] = {}
+
+    def add(self, key: tuple[str, ...]) -> None:
+        """Add the key of an exclusion, starting at this node."""
+        node = self
+        for index in range(0, len(key) - 1, 2):
+            node = node.children.setdefault(
+                (key[index], key[index + 1]), _KeyNode()
+            )
+        if key[-1].startswith("="):
+            node.last_exact.add(key[-1][1:])
+        else:
+            node.last.add(key[-1])
+
+    def excludes_last(self, field: str, max_digits: int) -> bool:
+        """Check if an exclusion ending at this node matches the field."""
+        if "**" in self.last:
+            return True
+        if not field:
+            return False
+        if "*" in self.last or (field[0] == "0" and "" in self.last):
+            return True
+        digits = field.lstrip("0")
+        exact = self.last_exact if field[0] != "0" else set()
+        for end in range(1, min(len(digits), max_digits) + 1):
+            if digits[:end] in self.last or digits[:end] in exact:
+                return True
+        return False
+
+
+class SgrExclusions:
+    """SGR exclusions parsed into literal keys.
+
+    The usual exclude_sgr entries are parsed once into keys: fields of
+    digits, digit ranges or alternatives of digits, optionally prefixed with
+    "0*", or digit wildcards, separated by ";", ":" or either. The key of a
+    field is its digits without leading zeros. Keys are stored in a trie of
+    fields, so checking a code is a few set lookups per field, independently
+    of the number of entries. Entries using any other construct are kept as a
+    regular expression.
+
+    Matching is identical to the regular expression of the entries: every
+    field but the last must match a whole parameter, the last one is a prefix,
+    like a match anchored at the code but not at the end of the sequence.
+
+    Parameters
+    ----------
+    exclude_sgr : Optional[list[str]] = None
+        SGR codes to be excluded.
+
+    Examples
+    --------
+    >>> exclusions = SgrExclusions(["0*38(:|;)0*5(:|;)25[0-5]", "0*1m"])
+    >>> exclusions.excludes("\x1b[0038;5;255m", 2)
+    True
+    >>> exclusions.regex
+    re.compile('(?:0*1m)')
+    """
+
+    def __init__(self, exclude_sgr: Optional[list[str]] = None) -> None:
+        self.keys: set[tuple[str, ...]] = set()
+        self.regex: Optional[Pattern[str]] = None
+        unparsed = []
+        for entry in exclude_sgr or []:
+            parsed = [
+                _parse_alternative(a) for a in _split_alternatives(entry)
+            ]
+            if any(keys is None for keys in parsed):
+                unparsed.append(entry)
+                continue
+            for keys in parsed:
+                self.keys.update(keys or [])
+        self._root: _KeyNode = _KeyNode()
+        for key in self.keys:
+            self._root.add(key)
+        ## Longest digits of a last field, bounding the prefixes looked up.
+        self.max_digits: int = max(
+            (len(key[-1].lstrip("=")) for key in self.keys), default=0
+        )
+        if unparsed:
+            self.regex = re_compile("(?:" + "|".join(unparsed) + ")")
+
+    def __bool__(self) -> bool:
+        return bool(self.keys) or self.regex is not None
+
+    def _excludes_keys(
+        self, untrusted_text: str, position: int, node: _KeyNode
+    ) -> bool:
+        """Look up keys of the fields at the position in a trie node."""
+        match = SGR_FIELD_RE.match(untrusted_text, position)
+        if not match:
+            return False
+        field, separator = match.groups()
+        if node.excludes_last(field, self.max_digits):
+            return True
+        if not separator or not node.children:
+            return False
+        keys = ["**"]
+        if field:
+            keys += [field.lstrip("0"), "*"]
+            if field[0] != "0":
+                keys.append("=" + field)
+        for key in keys:
+            child = node.children.get((key, separator))
+            if child and self._excludes_keys(
+                untrusted_text, match.end(), child
+            ):
+                return True
+        return False
+
+    def excludes(self, untrusted_text: str, position: int) -> bool:
+        """Check if the code starting at the position is excluded.
+
+        Parameters
+        ----------
+        untrusted_text : str
+            Text containing the sequence.
+        position : int
+            Index of the first character of the code.
+
+        Returns
+        -------
+        bool
+            If any exclusion matches at the position.
+        """
+        if self.regex and self.regex.match(untrusted_text, position):
+            return True
+        return bool(self.keys) and self._excludes_keys(
+            untrusted_text, position, self._root
+        )
@@ -0,0 +1,209 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+"""
+Read untrusted files as text with bounded memory.
+"""
+
+from __future__ import annotations
+
+from codecs import getincrementaldecoder
+from collections.abc import Iterator
+from mmap import ACCESS_READ, ALLOCATIONGRANULARITY, mmap
+from os import fstat
+from stat import S_ISREG
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import BinaryIO
+
+## Mapped window offsets must be multiples of the allocation granularity,
+## which is the page size on Linux. A 1 MiB window is a multiple of every
+## common granularity.
+MMAP_WINDOW_SIZE: int = (
+    max(1, 2**20 // ALLOCATIONGRANULARITY) * ALLOCATIONGRANULARITY
+)
+
+
+def _map_window(fileno: int, size: int, offset: int, window_size: int) -> mmap:
+    """Map the window of a file starting at the given offset."""
+    return mmap(
+        fileno,
+        min(window_size, size - offset),
+        access=ACCESS_READ,
+        offset=offset,
+    )
+
+
+def _iter_mapped_windows(
+    first_window: mmap, fileno: int, size: int, window_size: int
+) -> Iterator[bytes | mmap]:
+    """Map a file one window at a time, unmapping the previous window."""
+    with first_window:
+        yield first_window
+    for offset in range(window_size, size, window_size):
+        with _map_window(fileno, size, offset, window_size) as window:
+            yield window
+
+
+def _iter_read_chunks(untrusted_file: BinaryIO, size: int) -> Iterator[bytes]:
+    """Read whatever is available from a file, up to size bytes at a time."""
+    read = getattr(untrusted_file, "read1", untrusted_file.read)
+    while chunk := read(size):
+        yield chunk
+
+
+def iter_file_bytes(
+    untrusted_file: BinaryIO, window_size: int = MMAP_WINDOW_SIZE
+) -> Iterator[bytes | mmap]:
+    """Read an untrusted file as consecutive pieces of bytes.
+
+    Regular files are memory mapped one page aligned window at a time, so
+    reading starts at once and resident memory stays near one window whatever
+    the file size. Other files, such as pipes and terminals, are read as data
+    becomes available.
+
+    Only the size the file has when reading starts is mapped. Truncating a
+    regular file while it is read might terminate the process with SIGBUS.
+    Regular files that can't be mapped, such as the files of sysfs and procfs,
+    are read instead.
+
+    Parameters
+    ----------
+    untrusted_file : BinaryIO
+        File opened for reading in binary mode.
+    window_size : int = MMAP_WINDOW_SIZE
+        Number of bytes read at a time, must be a multiple of
+        mmap.ALLOCATIONGRANULARITY.
+
+    Yields
+    ------
+    bytes | mmap
+        Data read, or mapped window which is unmapped once the next one is
+        requested.
+
+    Raises
+    ------
+    ValueError
+        If the window size is not a positive multiple of the allocation
+        granularity.
+    """
+    if window_size < 1 or window_size % ALLOCATIONGRANULARITY:
+        raise ValueError(
+            "window_size must be a positive multiple of "
+            + f"{ALLOCATIONGRANULARITY}, got {window_size}"
+        )
+    try:
+        fileno = untrusted_file.fileno()
+        status = fstat(fileno)
+    except (AttributeError, OSError, ValueError):
+        status = None
+    ## Empty files can't be mapped, and what is mapped must not be in the
+    ## file buffer already.
+    if (
+        status is not None
+        and S_ISREG(status.st_mode)
+        and status.st_size > 0
+        and untrusted_file.tell() == 0
+    ):
+        try:
+            first_window = _map_window(fileno, status.st_size, 0, window_size)
+        except (OSError, ValueError):
+            ## Pseudo file systems report a size but refuse with ENODEV.
+            pass
+        else:
+            ## Mapping doesn't move the file position, do as if it was read.
+            untrusted_file.seek(status.st_size)
+            yield from _iter_mapped_windows(
+                first_window, fileno, status.st_size, window_size
+            )
+            return
+    yield from _iter_read_chunks(untrusted_file, window_size)
+
+
+def iter_file_text(
+    untrusted_file: BinaryIO, window_size: int = MMAP_WINDOW_SIZE
+) -> Iterator[str]:
+    """Decode an untrusted UTF-8 file as consecutive pieces of text.
+
+    The file is read with iter_file_bytes(). Invalid UTF-8 sequences are
+    replaced by U+FFFD and line endings are kept, as when opening the file
+    with errors="replace" and newline="\\n". Sequences split at window edges
+    are decoded incrementally.
+
+    Parameters
+    ----------
+    untrusted_file : BinaryIO
+        File opened for reading in binary mode.
+    window_size : int = MMAP_WINDOW_SIZE
+        Number of bytes decoded at a time, must be a multiple of
+        mmap.ALLOCATIONGRANULARITY.
+
+    Yields
+    ------
+    str
+        Decoded text, possibly empty.
+
+    Raises
+    ------
+    ValueError
+        If the window size is not a positive multiple of the allocation
+        granularity.
+    """
+    decoder = getincrementaldecoder("utf-8")(errors="replace")
+    for window in iter_file_bytes(untrusted_file, window_size):
+        yield decoder.decode(window)
+    yield decoder.decode(b"", final=True)
+
+
+def iter_records(
+    untrusted_file: BinaryIO,
+    separator: bytes = b"\0",
+    chunk_size: int = MMAP_WINDOW_SIZE,
+) -> Iterator[bytes]:
+    """Split an untrusted file into records, such as NUL delimited strings.
+
+    Records are yielded as soon as their separator is read. A last record
+    without a separator is yielded unless it is empty, like xargs -0 does.
+
+    Parameters
+    ----------
+    untrusted_file : BinaryIO
+        File opened for reading in binary mode.
+    separator : bytes = b"\\0"
+        Single byte separating records.
+    chunk_size : int = MMAP_WINDOW_SIZE
+        Largest number of bytes read at a time.
+
+    Yields
+    ------
+    bytes
+        Record, without its separator.
+
+    Raises
+    ------
+    ValueError
+        If the separator is not a single byte.
+
+    Examples
+    --------
+    >>> from io import BytesIO
+    >>> list(iter_records(BytesIO(b"a\\0\\0b c\\0d")))
+    [b'a', b'', b'b c', b'd']
+    """
+    if len(separator) != 1:
+        raise ValueError(f"separator must be a single byte, got {separator!r}")
+    pieces: list[bytes] = []
+    for chunk in _iter_read_chunks(untrusted_file, chunk_size):
+        records = chunk.split(separator)
+        if len(records) > 1:
+            pieces.append(records[0])
+            yield b"".join(pieces)
+            yield from records[1:-1]
+            pieces = []
+        if records[-1]:
+            pieces.append(records[-1])
+    if pieces:
+        yield b"".join(pieces)
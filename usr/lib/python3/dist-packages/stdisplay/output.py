@@ -0,0 +1,384 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+"""
+Block buffered output of sanitized text for the safe terminal utilities.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from io import UnsupportedOperation
+from os import environ, writev
+from types import TracebackType
+from stdisplay.files import iter_records
+from stdisplay.stdisplay import get_sanitizer
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from queue import Queue
+    from threading import Thread
+    from typing import BinaryIO, Optional, TextIO
+    from stdisplay.compact import SgrCompactor
+
+## Bytes gathered before writing a block in throughput mode.
+OUTPUT_BLOCK_SIZE: int = 2**16
+## Blocks queued per file by FanOutWriter before writes wait for it.
+OUTPUT_QUEUE_SIZE: int = 64
+## Values of $STDISPLAY_BUFFERING.
+BUFFERING_MODES: tuple[str, ...] = ("line", "block")
+
+
+def get_line_buffered(fp: TextIO) -> bool:
+    """Choose the flush policy of a file.
+
+    If the environment variable $STDISPLAY_BUFFERING is "line" or "block",
+    it is used. Otherwise, terminals are line buffered and everything else,
+    such as pipes and files, is block buffered.
+
+    Parameters
+    ----------
+    fp : TextIO
+        File output is written to.
+
+    Returns
+    -------
+    bool
+        True if each line should be flushed as soon as it is complete.
+    """
+    buffering = environ.get("STDISPLAY_BUFFERING", "")
+    if buffering in BUFFERING_MODES:
+        return buffering == "line"
+    try:
+        return fp.isatty()
+    except ValueError:
+        return False
+
+
+def get_compact_sgr() -> bool:
+    """Check if $STDISPLAY_COMPACT_SGR asks for compacted SGR sequences.
+
+    See stdisplay.compact.SgrCompactor.
+    """
+    return bool(environ.get("STDISPLAY_COMPACT_SGR", ""))
+
+
+class BlockWriter:
+    """Write sanitized text to the binary buffer of files in large blocks.
+
+    Writes are gathered and written once per block, instead of once per line
+    through each TextIOWrapper. In line buffered mode, the gathered text is
+    written and flushed whenever a write completes a line, so that
+    interactive output is never delayed. Sanitized bytes are written as is,
+    sanitized text is encoded as ASCII, anything else is replaced by "?",
+    like the text layer of the utilities does.
+
+    When SGR sequences are compacted, everything written must be sanitized
+    with the detected SGR support, as the text of the utilities is.
+    Sequences at the end of a write are held back until text follows them
+    or the writer is exited.
+
+    Parameters
+    ----------
+    sinks : Sequence[TextIO]
+        Text files written to. Their text layer is flushed, then their
+        binary buffer is used.
+    line_buffered : Optional[bool] = None
+        Flush policy, chosen by get_line_buffered() on the first file when
+        None.
+    block_size : int = OUTPUT_BLOCK_SIZE
+        Bytes gathered before writing a block.
+    compact_sgr : Optional[bool] = None
+        Compact SGR sequences with an SgrCompactor, chosen by
+        get_compact_sgr() when None.
+
+    Examples
+    --------
+    >>> from io import BytesIO, TextIOWrapper
+    >>> output = BytesIO()
+    >>> sink = TextIOWrapper(output)
+    >>> with BlockWriter([sink], line_buffered=False) as writer:
+    ...     writer.write("a b\\n")
+    ...     writer.write("c d\\n")
+    ...     output.getvalue()
+    4
+    4
+    b''
+    >>> output.getvalue()
+    b'a b\\nc d\\n'
+    """
+
+    def __init__(
+        self,
+        sinks: Sequence[TextIO],
+        line_buffered: Optional[bool] = None,
+        block_size: int = OUTPUT_BLOCK_SIZE,
+        compact_sgr: Optional[bool] = None,
+    ) -> None:
+        if block_size < 1:
+            raise ValueError(
+                f"block_size must be at least 1, got {block_size}"
+            )
+        self.buffers: list[BinaryIO] = []
+        for sink in sinks:
+            sink.flush()
+            self.buffers.append(sink.buffer)
+        if line_buffered is None:
+            line_buffered = bool(sinks) and get_line_buffered(sinks[0])
+        self.line_buffered: bool = line_buffered
+        self.block_size: int = block_size
+        self._pending: list[bytes] = []
+        self._pending_size: int = 0
+        if compact_sgr is None:
+            compact_sgr = get_compact_sgr()
+        self.compactor: Optional[SgrCompactor] = None
+        if compact_sgr:
+            ## Only imported on request, like the SGR support it detects.
+            # pylint: disable=import-outside-toplevel,redefined-outer-name
+            from stdisplay.compact import SgrCompactor
+
+            self.compactor = SgrCompactor()
+
+    def write(self, data: str | bytes) -> int:
+        """Gather sanitized text or bytes, writing a block when due."""
+        size = len(data)
+        if self.compactor is not None:
+            if not isinstance(data, str):
+                ## Sanitized bytes are ASCII.
+                data = bytes(data).decode("latin-1")
+            data = self.compactor.feed(data)
+        if isinstance(data, str):
+            data = data.encode("ascii", errors="replace")
+        if data:
+            self._pending.append(data)
+            self._pending_size += len(data)
+            if self._pending_size >= self.block_size or (
+                self.line_buffered and b"\n" in data
+            ):
+                self.flush()
+        return size
+
+    def _finish_sgr(self) -> None:
+        """Gather the SGR sequences held back by the compactor, if any."""
+        if self.compactor is not None:
+            compactor, self.compactor = self.compactor, None
+            self.write(compactor.finish())
+
+    def _take_block(self) -> bytes:
+        """Join and forget the gathered bytes."""
+        data = b"".join(self._pending)
+        self._pending = []
+        self._pending_size = 0
+        return data
+
+    def flush(self) -> None:
+        """Write the gathered text as one block and flush the files."""
+        if self._pending:
+            data = self._take_block()
+            for buffer in self.buffers:
+                buffer.write(data)
+        for buffer in self.buffers:
+            buffer.flush()
+
+    def __enter__(self) -> "BlockWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self._finish_sgr()
+        self.flush()
+
+
+def _write_blocks(buffer: BinaryIO, blocks: list[bytes]) -> None:
+    """Write blocks with as few system calls as possible."""
+    try:
+        fileno = buffer.fileno()
+    except (UnsupportedOperation, AttributeError):
+        buffer.write(b"".join(blocks))
+        buffer.flush()
+        return
+    buffer.flush()
+    views = [memoryview(block) for block in blocks]
+    while views:
+        written = writev(fileno, views)
+        while views and written >= len(views[0]):
+            written -= len(views.pop(0))
+        if written:
+            views[0] = views[0][written:]
+
+
+class FanOutWriter(BlockWriter):
+    """Write sanitized text to many files, each at its own pace.
+
+    Every block is joined once and queued for each file, where a thread
+    writes whatever is queued with a single writev(). A slow file only holds
+    back writes once its queue is full, other files keep being written
+    meanwhile. Writing stops at the first error of a file, while the other
+    files are still written, like tee does. The first error is raised when
+    the writer is closed. Errors other than OSError are raised by the next
+    flush, as a bug in writing a file isn't a reason to go on.
+
+    Parameters
+    ----------
+    sinks : Sequence[TextIO]
+        Text files written to. Their text layer is flushed, then their
+        binary buffer is used.
+    line_buffered : Optional[bool] = None
+        Flush policy, chosen by get_line_buffered() on the first file when
+        None.
+    block_size : int = OUTPUT_BLOCK_SIZE
+        Bytes gathered before writing a block.
+    queue_size : int = OUTPUT_QUEUE_SIZE
+        Blocks queued per file before writes wait for it.
+    compact_sgr : Optional[bool] = None
+        Compact SGR sequences with an SgrCompactor, chosen by
+        get_compact_sgr() when None.
+    """
+
+    def __init__(
+        self,
+        sinks: Sequence[TextIO],
+        line_buffered: Optional[bool] = None,
+        block_size: int = OUTPUT_BLOCK_SIZE,
+        queue_size: int = OUTPUT_QUEUE_SIZE,
+        compact_sgr: Optional[bool] = None,
+    ) -> None:
+        super().__init__(sinks, line_buffered, block_size, compact_sgr)
+        if queue_size < 1:
+            raise ValueError(
+                f"queue_size must be at least 1, got {queue_size}"
+            )
+        ## Only sttee with files needs threads, spare the other tools the
+        ## imports.
+        # pylint: disable=import-outside-toplevel,redefined-outer-name
+        from queue import Queue
+        from threading import Thread
+
+        self.errors: list[OSError] = []
+        self._failure: Optional[Exception] = None
+        self._queues: list[Queue[Optional[bytes]]] = []
+        self._threads: list[Thread] = []
+        for buffer in self.buffers:
+            queue: Queue[Optional[bytes]] = Queue(maxsize=queue_size)
+            thread = Thread(target=self._drain, args=(buffer, queue))
+            thread.daemon = True
+            thread.start()
+            self._queues.append(queue)
+            self._threads.append(thread)
+
+    def _drain(self, buffer: BinaryIO, queue: Queue[Optional[bytes]]) -> None:
+        """Write the blocks queued for a file until closed."""
+        failed = False
+        while True:
+            blocks = [queue.get()]
+            while not queue.empty() and blocks[-1] is not None:
+                blocks.append(queue.get_nowait())
+            closed = blocks[-1] is None
+            if not failed:
+                try:
+                    _write_blocks(buffer, [b for b in blocks if b is not None])
+                except OSError as error:
+                    ## Keep taking blocks, so that writes never wait for a
+                    ## file that is no longer written.
+                    failed = True
+                    self.errors.append(error)
+                except Exception as error:  # pylint: disable=broad-except
+                    failed = True
+                    if self._failure is None:
+                        self._failure = error
+            if closed:
+                return
+
+    def _raise_failure(self) -> None:
+        """Raise the unexpected error of a thread once, if any."""
+        failure, self._failure = self._failure, None
+        if failure is not None:
+            raise failure
+
+    def flush(self) -> None:
+        """Queue the gathered text as one block for every file.
+
+        Raises
+        ------
+        Exception
+            If writing to any file failed with an error other than OSError.
+        """
+        self._raise_failure()
+        if self._pending:
+            data = self._take_block()
+            for queue in self._queues:
+                queue.put(data)
+
+    def close(self) -> None:
+        """Write everything queued, wait for it and raise the first error.
+
+        Raises
+        ------
+        Exception
+            If writing to any file failed, OSError unless it was unexpected.
+        """
+        self._finish_sgr()
+        self.flush()
+        for queue in self._queues:
+            queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._queues = []
+        self._threads = []
+        self._raise_failure()
+        if self.errors:
+            raise self.errors[0]
+
+    def __enter__(self) -> "FanOutWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+def write_records(
+    untrusted_file: BinaryIO, fp: TextIO, suffix: str = ""
+) -> None:
+    """Sanitize NUL delimited records of a file to NUL delimited records.
+
+    Each record is decoded like a command line argument, so that the output
+    of a record is identical to the output of a process given it as an
+    argument. Sanitized text never holds a NUL, so neither do the records
+    written. SGR sequences are compacted per record when
+    get_compact_sgr() asks for it, so that records stay independent.
+
+    Parameters
+    ----------
+    untrusted_file : BinaryIO
+        File opened for reading in binary mode.
+    fp : TextIO
+        Text file written to.
+    suffix : str = ""
+        Trusted text appended to each sanitized record, before its NUL.
+    """
+    sanitize = get_sanitizer().sanitize
+    compact: Optional[Callable[[str], str]] = None
+    if get_compact_sgr():
+        # pylint: disable=import-outside-toplevel
+        from stdisplay.compact import compact_sgr as compact
+
+    with BlockWriter([fp], compact_sgr=False) as writer:
+        for untrusted_record in iter_records(untrusted_file):
+            untrusted_text = untrusted_record.decode(
+                "utf-8", errors="surrogateescape"
+            )
+            sanitized_text = sanitize(untrusted_text)
+            if compact is not None:
+                sanitized_text = compact(sanitized_text)
+            writer.write(sanitized_text + suffix + "\0")
@@ -0,0 +1,313 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+"""
+Sanitize large amounts of text across multiple processes.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Buffer, Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from itertools import batched, chain
+from os import cpu_count, PathLike
+from pathlib import Path
+from typing import Optional, TypeVar
+from stdisplay.binary import get_complete_length, stdisplay_bytes
+from stdisplay.files import MMAP_WINDOW_SIZE
+from stdisplay.stdisplay import DETECT_SGR, resolve_sgr, stdisplay
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from stdisplay.binary import SupportsWriteBytes
+    from stdisplay.stdisplay import SgrSupport
+
+UntrustedItem = str | PathLike[str]
+Task = TypeVar("Task")
+Result = TypeVar("Result")
+
+## Bytes sanitized by a worker at once. Large enough that inter-process
+## communication is a small part of the work, small enough that every
+## worker gets several segments of a file of a few hundred megabytes.
+PARALLEL_SEGMENT_SIZE: int = 8 * MMAP_WINDOW_SIZE
+
+
+def read_item(untrusted_item: UntrustedItem) -> str:
+    """Get the text of an item, reading it from disk if it is a path.
+
+    Parameters
+    ----------
+    untrusted_item : str | PathLike[str]
+        Text, or path to a file whose contents are decoded as UTF-8 with
+        invalid sequences replaced, the same way stcat reads files.
+
+    Returns
+    -------
+    str
+        Untrusted text.
+    """
+    if isinstance(untrusted_item, PathLike):
+        return Path(untrusted_item).read_text(
+            encoding="utf-8", errors="replace", newline="\n"
+        )
+    return untrusted_item
+
+
+def _run_chunk(
+    func: Callable[[str], str], chunk: tuple[UntrustedItem, ...]
+) -> list[str]:
+    """Apply a function to every item of a chunk, in a worker process."""
+    return [func(read_item(untrusted_item)) for untrusted_item in chunk]
+
+
+def _iter_ordered(
+    func: Callable[[Task], Result], tasks: Iterable[Task], max_workers: int
+) -> Iterator[Result]:
+    """Run a function on every task in a process pool, in input order.
+
+    At most two tasks per worker are in flight, so that an arbitrarily long
+    iterable is consumed lazily with bounded memory.
+    """
+    pending: deque[Future[Result]] = deque()
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for task in tasks:
+            pending.append(executor.submit(func, task))
+            if len(pending) >= 2 * max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _map_ordered(
+    func: Callable[[str], str],
+    untrusted_items: Iterable[UntrustedItem],
+    chunk_size: int,
+    max_workers: int,
+) -> Iterator[str]:
+    """Generator behind map_ordered(), arguments already validated."""
+    for results in _iter_ordered(
+        partial(_run_chunk, func),
+        batched(untrusted_items, chunk_size),
+        max_workers,
+    ):
+        yield from results
+
+
+def map_ordered(
+    func: Callable[[str], str],
+    untrusted_items: Iterable[UntrustedItem],
+    chunk_size: int = 64,
+    max_workers: Optional[int] = None,
+) -> Iterator[str]:
+    """Apply a sanitizer to many items in a process pool, in input order.
+
+    Items are sent to workers in chunks to amortize inter-process
+    communication. At most two chunks per worker are in flight, so an
+    arbitrarily long iterable is consumed lazily with bounded memory.
+
+    Parameters
+    ----------
+    func : Callable[[str], str]
+        Picklable function sanitizing one text.
+    untrusted_items : Iterable[str | PathLike[str]]
+        Texts or paths to files, see read_item().
+    chunk_size : int = 64
+        Number of items sent to a worker at once.
+    max_workers : Optional[int] = None
+        Number of worker processes, defaults to the number of CPUs.
+
+    Returns
+    -------
+    Iterator[str]
+        Result of each item, in the order of the input.
+
+    Raises
+    ------
+    ValueError
+        If chunk_size or max_workers is lower than 1.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if max_workers is None:
+        max_workers = cpu_count() or 1
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    return _map_ordered(func, untrusted_items, chunk_size, max_workers)
+
+
+def stdisplay_many(
+    untrusted_items: Iterable[UntrustedItem],
+    sgr: SgrSupport = DETECT_SGR,
+    exclude_sgr: Optional[list[str]] = None,
+    chunk_size: int = 64,
+    max_workers: Optional[int] = None,
+) -> Iterator[str]:
+    """Sanitize many texts or files with stdisplay() in parallel.
+
+    SGR support is detected once in the calling process, so every worker
+    applies the same policy and results are identical to calling stdisplay()
+    on each item serially.
+
+    Parameters
+    ----------
+    untrusted_items : Iterable[str | PathLike[str]]
+        Texts or paths to files, see read_item().
+    sgr : SgrSupport = DETECT_SGR
+        Number of SGR codes the terminal supports, detected with
+        get_sgr_support() when DETECT_SGR. None disables SGR.
+    exclude_sgr : Optional[list[str]] = None
+        SGR codes to be excluded.
+    chunk_size : int = 64
+        Number of items sent to a worker at once.
+    max_workers : Optional[int] = None
+        Number of worker processes, defaults to the number of CPUs.
+
+    Returns
+    -------
+    Iterator[str]
+        Sanitized text of each item, in the order of the input.
+
+    Examples
+    --------
+    >>> list(stdisplay_many(["\\x1b[2Ja", Path("/etc/hostname")], sgr=-1))
+    ['_[2Ja', 'localhost\\n']
+    """
+    sgr = resolve_sgr(sgr)
+    return map_ordered(
+        partial(stdisplay, sgr=sgr, exclude_sgr=exclude_sgr),
+        untrusted_items,
+        chunk_size=chunk_size,
+        max_workers=max_workers,
+    )
+
+
+def iter_line_segments(
+    untrusted: Iterable[Buffer], segment_size: int = PARALLEL_SEGMENT_SIZE
+) -> Iterator[bytes]:
+    """Regroup consecutive pieces of bytes into segments ending a line.
+
+    Each segment but the last is at least segment_size bytes long and ends
+    with the last line feed received, or when a line is longer than the
+    segment, with its last space or tab. None of them can be part of a
+    sanitized sequence, so sanitizing each segment on its own gives the
+    same result as sanitizing the whole input. Once twice segment_size bytes
+    are held without whitespace, they are split before any sequence that may
+    continue, see get_complete_length(), so that memory stays bounded
+    whatever the length of a line. Only a single SGR sequence longer than
+    that is held until it ends.
+
+    Parameters
+    ----------
+    untrusted : Iterable[Buffer]
+        Untrusted bytes, such as the windows of iter_file_bytes().
+    segment_size : int = PARALLEL_SEGMENT_SIZE
+        Minimum number of bytes of a segment.
+
+    Yields
+    ------
+    bytes
+        Segment of the untrusted bytes.
+
+    Examples
+    --------
+    >>> list(iter_line_segments([b"a\\nb", b"c\\nd e", b"f"], 4))
+    [b'a\\nbc\\n', b'd ef']
+    """
+    pending = bytearray()
+    ## Splitting before segment_size or where it was tried already is
+    ## pointless.
+    searched = segment_size - 1
+    ## Length of a line without whitespace split anyway, doubled whenever
+    ## only a sequence that may continue was held, to keep looking for its
+    ## start linear.
+    overlong = 2 * segment_size
+    for untrusted_item in untrusted:
+        pending += untrusted_item
+        if len(pending) < segment_size:
+            continue
+        end = pending.rfind(b"\n", searched) + 1
+        if not end:
+            end = 1 + max(
+                pending.rfind(b" ", searched), pending.rfind(b"\t", searched)
+            )
+        if not end and len(pending) >= overlong:
+            end = get_complete_length(pending)
+            if end < segment_size:
+                end = 0
+                overlong = 2 * len(pending)
+        if end:
+            yield bytes(pending[:end])
+            del pending[:end]
+            searched = segment_size - 1
+            overlong = 2 * segment_size
+        else:
+            searched = len(pending)
+    if pending:
+        yield bytes(pending)
+
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def stdisplay_bytes_parallel(
+    fp: SupportsWriteBytes,
+    untrusted: Iterable[Buffer],
+    sgr: SgrSupport = DETECT_SGR,
+    exclude_sgr: Optional[list[str]] = None,
+    segment_size: int = PARALLEL_SEGMENT_SIZE,
+    max_workers: Optional[int] = None,
+) -> int:
+    """Sanitize untrusted UTF-8 bytes in parallel and write them in order.
+
+    The bytes are split by iter_line_segments() and every segment is
+    sanitized with stdisplay_bytes() in a process pool. The output is
+    identical to stdisplay_bytes_to(). Input of a single segment is
+    sanitized in the calling process, without starting a pool.
+
+    Parameters
+    ----------
+    fp : SupportsWriteBytes
+        Binary file or BlockWriter the sanitized bytes are written to.
+    untrusted : Iterable[Buffer]
+        Untrusted UTF-8 bytes, such as the windows of iter_file_bytes().
+    sgr : SgrSupport = DETECT_SGR
+        Number of SGR codes the terminal supports, detected with
+        get_sgr_support() when DETECT_SGR. None disables SGR.
+    exclude_sgr : Optional[list[str]] = None
+        SGR codes to be excluded.
+    segment_size : int = PARALLEL_SEGMENT_SIZE
+        Minimum number of bytes sent to a worker at once.
+    max_workers : Optional[int] = None
+        Number of worker processes, defaults to the number of CPUs.
+
+    Returns
+    -------
+    int
+        Number of sanitized bytes written.
+
+    Raises
+    ------
+    ValueError
+        If segment_size or max_workers is lower than 1.
+    """
+    if segment_size < 1:
+        raise ValueError("segment_size must be at least 1")
+    if max_workers is None:
+        max_workers = cpu_count() or 1
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    sgr = resolve_sgr(sgr)
+    sanitize = partial(stdisplay_bytes, sgr=sgr, exclude_sgr=exclude_sgr)
+    segments = iter_line_segments(untrusted, segment_size)
+    first = next(segments, b"")
+    second = next(segments, None)
+    if second is None:
+        return fp.write(sanitize(first)) if first else 0
+    written = 0
+    for sanitized_segment in _iter_ordered(
+        sanitize, chain([first, second], segments), max_workers
+    ):
+        written += fp.write(sanitized_segment)
+    return written
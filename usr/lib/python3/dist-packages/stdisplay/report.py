@@ -0,0 +1,215 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+"""
+Sanitize text reporting what was sanitized, with cumulative counters.
+"""
+
+from __future__ import annotations
+
+from threading import Lock
+from time import perf_counter
+from stdisplay.stdisplay import (
+    DETECT_SGR,
+    get_sanitizer,
+    is_safe_ascii,
+    Sanitizer,
+)
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Optional
+    from stdisplay.stdisplay import SgrSupport
+
+
+# pylint: disable=too-few-public-methods
+class SanitizeReport:
+    """Sanitized text and statistics of a single sanitization.
+
+    Attributes
+    ----------
+    text : str
+        Sanitized text.
+    fast_path : bool
+        If the text was safe ASCII and skipped the SGR engine.
+    replaced : int
+        Number of characters replaced with underscores, including the ESC of
+        rejected sequences.
+    rejected_sequences : int
+        Number of ESC characters that didn't start an allowed SGR sequence.
+    accepted_sequences : int
+        Number of SGR sequences kept.
+    seconds : float
+        Time spent sanitizing.
+    """
+
+    def __init__(
+        self,
+        untrusted_text: str,
+        text: str,
+        seconds: float,
+        fast_path: bool,
+    ) -> None:
+        self.text: str = text
+        self.fast_path: bool = fast_path
+        self.seconds: float = seconds
+        self.replaced: int = 0
+        self.rejected_sequences: int = 0
+        self.accepted_sequences: int = 0
+        if not fast_path:
+            ## Sanitization replaces characters with underscores one for one
+            ## and never replaces an underscore, only allowed sequences keep
+            ## their ESC.
+            self.replaced = text.count("_") - untrusted_text.count("_")
+            self.accepted_sequences = text.count("\x1b")
+            self.rejected_sequences = (
+                untrusted_text.count("\x1b") - self.accepted_sequences
+            )
+
+    def __repr__(self) -> str:
+        return (
+            f"SanitizeReport(replaced={self.replaced}, "
+            + f"rejected_sequences={self.rejected_sequences}, "
+            + f"accepted_sequences={self.accepted_sequences}, "
+            + f"fast_path={self.fast_path}, seconds={self.seconds:.6f})"
+        )
+
+
+class SanitizeCounters:
+    """Thread-safe cumulative counters of sanitization reports.
+
+    Meant to be scraped by long running services, to see how much input goes
+    through the SGR engines and which producers send escape sequences.
+    """
+
+    FIELDS: tuple[str, ...] = (
+        "calls",
+        "fast_path_calls",
+        "characters",
+        "replaced",
+        "rejected_sequences",
+        "accepted_sequences",
+        "seconds",
+    )
+
+    def __init__(self) -> None:
+        self._lock: Lock = Lock()
+        self._counters: dict[str, float] = dict.fromkeys(self.FIELDS, 0)
+
+    def add(self, report: SanitizeReport, characters: int) -> None:
+        """Add a report of sanitizing a number of characters."""
+        with self._lock:
+            counters = self._counters
+            counters["calls"] += 1
+            counters["fast_path_calls"] += report.fast_path
+            counters["characters"] += characters
+            counters["replaced"] += report.replaced
+            counters["rejected_sequences"] += report.rejected_sequences
+            counters["accepted_sequences"] += report.accepted_sequences
+            counters["seconds"] += report.seconds
+
+    def snapshot(self) -> dict[str, float]:
+        """Return a consistent copy of the counters."""
+        with self._lock:
+            return dict(self._counters)
+
+    def reset(self) -> None:
+        """Set every counter to zero."""
+        with self._lock:
+            self._counters = dict.fromkeys(self.FIELDS, 0)
+
+
+## Counters of every report not given its own counters.
+SANITIZE_COUNTERS: SanitizeCounters = SanitizeCounters()
+
+
+def sanitize_report(
+    sanitizer: Sanitizer,
+    untrusted_text: str,
+    counters: Optional[SanitizeCounters] = SANITIZE_COUNTERS,
+) -> SanitizeReport:
+    """Sanitize untrusted text with a Sanitizer and report statistics.
+
+    Parameters
+    ----------
+    sanitizer : Sanitizer
+        Sanitizer of the SGR policy to apply.
+    untrusted_text : str
+        The unsafe text to be sanitized.
+    counters : Optional[SanitizeCounters] = SANITIZE_COUNTERS
+        Counters the report is added to, None to not count it.
+
+    Returns
+    -------
+    SanitizeReport
+        Sanitized text and statistics.
+    """
+    start = perf_counter()
+    fast_path = is_safe_ascii(untrusted_text)
+    text = untrusted_text if fast_path else sanitizer.sanitize(untrusted_text)
+    seconds = perf_counter() - start
+    report = SanitizeReport(untrusted_text, text, seconds, fast_path)
+    if counters is not None:
+        counters.add(report, len(untrusted_text))
+    return report
+
+
+def stdisplay_report(
+    untrusted_text: str,
+    sgr: SgrSupport = DETECT_SGR,
+    exclude_sgr: Optional[list[str]] = None,
+    engine: str = "regex",
+) -> SanitizeReport:
+    """Sanitize untrusted text like stdisplay() and report statistics.
+
+    The report is added to SANITIZE_COUNTERS, see get_sanitize_counters().
+    stdisplay() itself doesn't collect statistics, so that it doesn't pay
+    for them.
+
+    Parameters
+    ----------
+    untrusted_text : str
+        The unsafe text to be sanitized.
+    sgr : SgrSupport = DETECT_SGR
+        Number of SGR codes the terminal supports, detected with
+        get_sgr_support() when DETECT_SGR. None disables SGR.
+    exclude_sgr : Optional[list[str]] = None
+        SGR codes to be excluded.
+    engine : str = "regex"
+        Engine validating SGR sequences, one of SGR_ENGINES.
+
+    Returns
+    -------
+    SanitizeReport
+        Sanitized text and statistics.
+
+    Examples
+    --------
+    >>> report = stdisplay_report("\\x1b[31mred\\x1b[2J\\a", sgr=2**4)
+    >>> report.text
+    '\\x1b[31mred_[2J_'
+    >>> report.replaced, report.rejected_sequences, report.accepted_sequences
+    (2, 1, 1)
+    """
+    sanitizer = get_sanitizer(sgr=sgr, exclude_sgr=exclude_sgr, engine=engine)
+    return sanitize_report(sanitizer, untrusted_text)
+
+
+def get_sanitize_counters() -> dict[str, float]:
+    """Return the cumulative counters of stdisplay_report().
+
+    Returns
+    -------
+    dict[str, float]
+        Number of calls, calls that took the safe ASCII fast path, characters
+        sanitized, characters replaced, rejected and accepted sequences and
+        seconds spent, see SanitizeReport.
+    """
+    return SANITIZE_COUNTERS.snapshot()
+
+
+def reset_sanitize_counters() -> None:
+    """Set the cumulative counters of stdisplay_report() to zero."""
+    SANITIZE_COUNTERS.reset()
@@ -6,35 +6,75 @@
 
 """Safely print stdin or file to stdout."""
 
-from pathlib import Path
+from __future__ import annotations
+
+from os import cpu_count, environ, fstat
+from stat import S_ISREG
 from sys import argv, stdin, stdout
-from stdisplay.stdisplay import stdisplay
+from stdisplay.binary import stdisplay_bytes_to
+from stdisplay.files import iter_file_bytes
+from stdisplay.output import BlockWriter
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import BinaryIO
+
+
+def get_jobs() -> int:
+    """Get the number of processes regular files are sanitized with.
+
+    It is the environment variable $STDISPLAY_JOBS if it is a positive
+    integer, the number of CPUs if it is 0, and 1 otherwise.
+    """
+    try:
+        jobs = int(environ.get("STDISPLAY_JOBS", ""))
+    except ValueError:
+        return 1
+    if jobs < 0:
+        return 1
+    return jobs or cpu_count() or 1
+
+
+def is_regular_file(untrusted_file: BinaryIO) -> bool:
+    """Check if a file is a regular file, rather than a pipe or terminal."""
+    try:
+        return S_ISREG(fstat(untrusted_file.fileno()).st_mode)
+    except (AttributeError, OSError, ValueError):
+        return False
+
+
+def write_file(
+    writer: BlockWriter, untrusted_file: BinaryIO, jobs: int
+) -> None:
+    """Sanitize a file and write it."""
+    if jobs > 1 and is_regular_file(untrusted_file):
+        ## Regular files are split at line ends and sanitized by a process
+        ## pool when they are large, in order. Only done on request, the
+        ## pool takes a while to start.
+        # pylint: disable=import-outside-toplevel
+        from stdisplay.parallel import stdisplay_bytes_parallel
+
+        stdisplay_bytes_parallel(
+            writer, iter_file_bytes(untrusted_file), max_workers=jobs
+        )
+    else:
+        stdisplay_bytes_to(writer, iter_file_bytes(untrusted_file))
 
 
 def main() -> None:
     """Safely print stdin or file to stdout."""
-    stdout.reconfigure(  # type: ignore
-        encoding="ascii", errors="replace", newline="\n"
-    )
-    if stdin is not None:
-        stdin.reconfigure(  # type: ignore
-            encoding="utf-8", errors="replace", newline="\n"
-        )
-    if len(argv) == 1:
-        if stdin is not None:
-            for untrusted_line in stdin:
-                stdout.write(stdisplay(untrusted_line))
-            stdout.flush()
-        return
-    for untrusted_arg in argv[1:]:
-        if untrusted_arg == "-":
-            if stdin is not None:
-                for untrusted_line in stdin:
-                    stdout.write(stdisplay(untrusted_line))
-        else:
-            path = Path(untrusted_arg)
-            untrusted_text = path.read_text(
-                encoding="utf-8", errors="replace", newline="\n"
-            )
-            stdout.write(stdisplay(untrusted_text))
-    stdout.flush()
+    jobs = get_jobs()
+    ## Bytes are sanitized and written as is, with no text layer.
+    with BlockWriter([stdout]) as writer:
+        for untrusted_arg in argv[1:] or ["-"]:
+            if untrusted_arg == "-":
+                ## Read as data becomes available and written line by line
+                ## on terminals, so interactive output is never delayed.
+                if stdin is not None:
+                    write_file(writer, stdin.buffer, jobs)
+            else:
+                ## Regular files are memory mapped and sanitized in chunks,
+                ## so that output starts at once and the file is never held
+                ## in memory.
+                with open(untrusted_arg, "rb") as untrusted_file:
+                    write_file(writer, untrusted_file, jobs)
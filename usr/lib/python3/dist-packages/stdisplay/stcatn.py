@@ -9,8 +9,45 @@ Safely print stdin or file to stdout with tweaks
 (trim trailing whitespace, ensure final newline).
 """
 
+from collections.abc import Buffer, Iterable
+from re import compile as re_compile, MULTILINE, Pattern
 from sys import argv, stdin, stdout
-from stdisplay.stdisplay import stdisplay
+from stdisplay.binary import BytesStreamSanitizer
+from stdisplay.files import iter_file_bytes
+from stdisplay.output import BlockWriter
+
+## Sanitized text has no whitespace other than spaces, tabs and line feeds,
+## so this strips what str.rstrip() would from every line of a block.
+TRAILING_WHITESPACE_RE: Pattern[bytes] = re_compile(rb"[ \t]+$", MULTILINE)
+
+
+def write_trimmed(
+    writer: BlockWriter, untrusted_iter: Iterable[Buffer]
+) -> None:
+    """
+    Sanitize consecutive pieces of UTF-8 bytes, trim trailing whitespace of
+    every line and ensure a final newline, whole blocks of lines at a time.
+    """
+    stream = BytesStreamSanitizer()
+    held = b""
+    last = b"\n"
+    for untrusted_chunk in untrusted_iter:
+        text = held + stream.feed(untrusted_chunk)
+        ## Whitespace at the end of the block is only trailing if the line
+        ## ends before anything else follows, so it is held back.
+        end = len(text.rstrip(b" \t"))
+        if end:
+            writer.write(TRAILING_WHITESPACE_RE.sub(b"", text[:end]))
+            last = text[end - 1 : end]
+        held = text[end:]
+    text = TRAILING_WHITESPACE_RE.sub(b"", held + stream.finish())
+    writer.write(text)
+    if text:
+        last = text[-1:]
+    elif held:
+        last = b""
+    if last != b"\n":
+        writer.write(b"\n")
 
 
 def main() -> None:
@@ -18,35 +55,11 @@ def main() -> None:
     Safely print stdin or file to stdout with tweaks
     (trim trailing whitespace, ensure final newline).
     """
-    stdout.reconfigure(  # type: ignore
-        encoding="ascii", errors="replace", newline="\n"
-    )
-    if stdin is not None:
-        stdin.reconfigure(  # type: ignore
-            encoding="utf-8", errors="replace", newline="\n"
-        )
-    if len(argv) == 1:
-        if stdin is not None:
-            for untrusted_line in stdin:
-                stdout.write(stdisplay(untrusted_line).rstrip() + "\n")
-            stdout.flush()
-        return
-    for untrusted_arg in argv[1:]:
-        if untrusted_arg == "-":
-            if stdin is not None:
-                for untrusted_line in stdin:
-                    stdout.write(stdisplay(untrusted_line).rstrip() + "\n")
-        else:
-            ## We cannot read the entire file in at once like we do with
-            ## stcat, since we need to trim trailing whitespace from each
-            ## individual line in the file.
-            with open(
-                untrusted_arg,
-                "r",
-                encoding="utf-8",
-                errors="replace",
-                newline="\n",
-            ) as untrusted_file:
-                for untrusted_line in untrusted_file:
-                    stdout.write(stdisplay(untrusted_line).rstrip() + "\n")
-    stdout.flush()
+    with BlockWriter([stdout]) as writer:
+        for untrusted_arg in argv[1:] or ["-"]:
+            if untrusted_arg == "-":
+                if stdin is not None:
+                    write_trimmed(writer, iter_file_bytes(stdin.buffer))
+            else:
+                with open(untrusted_arg, "rb") as untrusted_file:
+                    write_trimmed(writer, iter_file_bytes(untrusted_file))
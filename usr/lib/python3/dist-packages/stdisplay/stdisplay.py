@@ -8,10 +8,88 @@
 Sanitize text to be safely printed to the terminal.
 """
 
-from curses import setupterm, tigetnum, error as curses_error
+# pylint: disable=too-many-lines
+
+from __future__ import annotations
+
+import sys
+from collections import namedtuple
+from collections.abc import Callable, Iterable, Iterator
+from enum import Enum
+from functools import lru_cache, partial
 from os import environ
-from re import compile as re_compile, sub as re_sub
-from typing import Optional
+from re import compile as re_compile, Match, Pattern
+from stdisplay.exclusions import SgrExclusions
+
+## The tools are short lived, so importing typing would be a noticeable part
+## of their run time. Annotations are not evaluated, so it is only imported
+## by type checkers.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Optional, Protocol
+
+    # pylint: disable=too-few-public-methods
+    class SupportsWrite(Protocol):
+        """Text file or anything else sanitized text can be written to."""
+
+        def write(self, text: str, /) -> int:
+            """Write text and return the number of characters written."""
+
+
+class _DetectSgr(Enum):
+    """Marker of SGR support detected with get_sgr_support()."""
+
+    DETECT = "detect"
+
+
+## Default SGR support of the sanitizers, detected when they are created.
+## An explicit None disables SGR, like any value below 8.
+DETECT_SGR = _DetectSgr.DETECT
+
+if TYPE_CHECKING:
+    from typing import Literal, Union
+
+    SgrSupport = Union[int, None, Literal[_DetectSgr.DETECT]]
+
+## Upper bound of distinct (sgr, exclude_sgr) combinations whose compiled
+## pattern is kept. SGR support is normalized to one of five levels, so this
+## is only ever reached by callers cycling through many exclusion lists.
+SGR_REGEX_CACHE_SIZE: int = 64
+## Statistics of the compiled pattern cache, see get_sgr_regex_cache_info().
+SgrRegexCacheInfo = namedtuple(
+    "SgrRegexCacheInfo", ["hits", "misses", "maxsize", "currsize"]
+)
+
+## Characters allowed regardless of SGR support, see is_safe_ascii().
+SAFE_ASCII_BYTES: bytes = bytes([0x09, 0x0A, *range(0x20, 0x7F)])
+
+## An ESC that may still become an allowed SGR sequence, the only construct
+## whose sanitization depends on characters after it.
+INCOMPLETE_SGR_RE: Pattern[str] = re_compile(r"\x1b(?:\[[0-9;:]*)?")
+SGR_PARAMETERS_RE: Pattern[str] = re_compile(r"[0-9;:]*")
+
+## Characters sanitized at a time by stdisplay_to().
+STDISPLAY_CHUNK_SIZE: int = 2**16
+
+## Engines validating SGR sequences, see Sanitizer.
+SGR_ENGINES: tuple[str, ...] = ("regex", "fsm")
+## Candidates for the "fsm" engine: an ESC, possibly starting a sequence that
+## is syntactically SGR, and every other character outside the allow list.
+ESC_SEQUENCE_RE: Pattern[str] = re_compile(r"\x1b(?:\[([0-9;:]*)m)?")
+UNSAFE_NON_ESC_RE: Pattern[str] = re_compile(r"[^\x1b\n\t\x20-\x7E]")
+## Verdicts of SgrRecognizer on sequence parameters up to this long are kept,
+## up to this many, as colored output repeats the same few sequences.
+SGR_VERDICT_CACHE_SIZE: int = 1024
+SGR_VERDICT_MAX_LENGTH: int = 64
+## Single parameter SGR codes allowed per normalized SGR level, mirroring the
+## palettes of get_sgr_pattern().
+SGR_SINGLE_CODES: dict[int, frozenset[int]] = {
+    2**3: frozenset([0, *range(30, 38), *range(40, 48)]),
+    2**4: frozenset([1, *range(90, 98), *range(100, 108)]),
+    88: frozenset(
+        [2, 3, 4, 5, 7, 8, 9, 21, 22, 23, 24, 25, 27, 28, 29, 39, 49]
+    ),
+}
 
 
 def get_sgr_support() -> int:
@@ -66,19 +144,129 @@ def get_sgr_support() -> int:
     >>> os.environ["NO_COLOR"] = "1"
     >>> get_sgr_support()
     -1
+
+    The result is cached per combination of the environment variables TERM,
+    COLORTERM and NO_COLOR, the terminfo database is only queried the first
+    time a combination is seen. Use refresh_sgr_support() to query it again.
+    """
+    return _detect_sgr_support(
+        environ.get("TERM"), environ.get("COLORTERM"), environ.get("NO_COLOR")
+    )
+
+
+def detect_sgr_support(
+    term: Optional[str], colorterm: Optional[str], no_color: Optional[str]
+) -> int:
+    """Returns number of SGR codes supported by another environment.
+
+    Detection is the same as get_sgr_support(), from the given values of the
+    environment variables instead of the ones of the process.
+
+    Parameters
+    ----------
+    term : Optional[str]
+        Value of TERM.
+    colorterm : Optional[str]
+        Value of COLORTERM.
+    no_color : Optional[str]
+        Value of NO_COLOR.
+
+    Returns
+    -------
+    int
+        Number of supported SGR codes.
+
+    Notes
+    -----
+    The curses module reads the terminfo database only on the first successful
+    setupterm() of the process, see refresh_sgr_support().
+
+    Examples
+    --------
+    >>> detect_sgr_support("xterm", "truecolor", None)
+    16777216
+    >>> detect_sgr_support("xterm", "truecolor", "1")
+    -1
     """
-    if environ.get("NO_COLOR"):
+    return _detect_sgr_support(term, colorterm, no_color)
+
+
+@lru_cache(maxsize=8)
+def _detect_sgr_support(
+    term: Optional[str], colorterm: Optional[str], no_color: Optional[str]
+) -> int:
+    """Detect SGR support of the given environment, see get_sgr_support()."""
+    if no_color:
         return -1
-    colorterm: str | None = environ.get("COLORTERM")
     if colorterm and colorterm.lower() in ("truecolor", "24bit"):
         return 2**24
+    ## Importing curses and loading the terminfo database is deferred to the
+    ## first time it is needed, callers passing SGR support explicitly never
+    ## pay for it.
+    # pylint: disable=import-outside-toplevel
+    from curses import setupterm, tigetnum, error as curses_error
+
+    ## The file descriptor is only used to query terminal settings, it
+    ## doesn't change the capabilities read, so replaced standard output
+    ## without a file descriptor (io.StringIO) can't break the detection.
     try:
-        setupterm()
+        fd = sys.stdout.fileno()
+    except (AttributeError, OSError, ValueError):
+        fd = 1
+    try:
+        setupterm(term, fd)
         return tigetnum("colors")
     except curses_error:
         return -2
 
 
+def resolve_sgr(sgr: SgrSupport) -> int:
+    """Get the number of SGR codes of an SGR support argument.
+
+    Parameters
+    ----------
+    sgr : SgrSupport
+        Number of SGR codes, DETECT_SGR to detect it with get_sgr_support(),
+        or None to disable SGR.
+
+    Returns
+    -------
+    int
+        Number of SGR codes, -1 when SGR is disabled.
+
+    Examples
+    --------
+    >>> resolve_sgr(None)
+    -1
+    >>> resolve_sgr(2**4)
+    16
+    """
+    if sgr is DETECT_SGR:
+        return get_sgr_support()
+    if sgr is None:
+        return -1
+    return sgr
+
+
+def refresh_sgr_support() -> int:
+    """Forget cached SGR support and detect it again.
+
+    Returns
+    -------
+    int
+        Number of supported SGR codes.
+
+    Notes
+    -----
+    The curses module reads the terminfo database only on the first successful
+    setupterm() of the process. Refreshing honors changes to NO_COLOR and
+    COLORTERM, but a different TERM in the same process reports the colors of
+    the first terminal set up.
+    """
+    _detect_sgr_support.cache_clear()
+    return get_sgr_support()
+
+
 def exclude_pattern(original_pattern: str, negate_pattern: list[str]) -> str:
     """Exclude matching next expression if provided expression matches.
 
@@ -233,10 +421,468 @@ def get_sgr_pattern(
     return str(sgr_re)
 
 
+def normalize_sgr(sgr: Optional[int]) -> int:
+    """Reduce the number of supported SGR codes to the level it enables.
+
+    Only a handful of thresholds change the generated pattern, therefore
+    terminals advertising 256 or 88 colors share the same pattern, as do all
+    values that disable SGR.
+
+    Parameters
+    ----------
+    sgr : Optional[int]
+        Number of SGR codes the terminal supports.
+
+    Returns
+    -------
+    int
+        Lowest number of SGR codes that generates the same pattern, 0 when SGR
+        is disabled.
+
+    Examples
+    --------
+    >>> normalize_sgr(256)
+    88
+    >>> normalize_sgr(-1)
+    0
+    """
+    if not sgr:
+        return 0
+    for level in (2**24, 88, 2**4, 2**3):
+        if sgr >= level:
+            return level
+    return 0
+
+
+@lru_cache(maxsize=SGR_REGEX_CACHE_SIZE)
+def _compile_sgr_regex(sgr: int, exclude_sgr: tuple[str, ...]) -> Pattern[str]:
+    """Compile the sanitization pattern of a normalized SGR configuration."""
+    sgr_pattern = get_sgr_pattern(sgr=sgr, exclude_sgr=list(exclude_sgr))
+    sgr_pattern = r"(\x1b(?!\[" + sgr_pattern + r")|[^\x1b\n\t\x20-\x7E])"
+    return re_compile(sgr_pattern)
+
+
+def get_sgr_regex(
+    sgr: Optional[int],
+    exclude_sgr: Optional[list[str]] = None,
+) -> Pattern[str]:
+    """Get the compiled sanitization pattern, reusing previous compilations.
+
+    Compiled patterns are kept in a bounded and thread-safe cache keyed by the
+    normalized SGR level and the exclusion list, so that sanitizing one line at
+    a time doesn't rebuild the pattern for every line.
+
+    Parameters
+    ----------
+    sgr : Optional[int]
+        Number of SGR codes the terminal supports.
+    exclude_sgr : Optional[list[str]] = None
+        SGR codes to be excluded.
+
+    Returns
+    -------
+    Pattern[str]
+        Compiled regular expression matching every character to be replaced.
+
+    Examples
+    --------
+    >>> clear_sgr_regex_cache()
+    >>> get_sgr_regex(2**4) is get_sgr_regex(2**5)
+    True
+    >>> get_sgr_regex_cache_info()
+    SgrRegexCacheInfo(hits=1, misses=1, maxsize=64, currsize=1)
+    """
+    return _compile_sgr_regex(
+        normalize_sgr(sgr), tuple(exclude_sgr) if exclude_sgr else ()
+    )
+
+
+def get_sgr_regex_cache_info() -> SgrRegexCacheInfo:
+    """Return hits, misses and size of the compiled pattern cache."""
+    ## Pylint doesn't understand the lru_cache wrapper.
+    # pylint: disable=no-value-for-parameter
+    return SgrRegexCacheInfo(*_compile_sgr_regex.cache_info())
+
+
+def clear_sgr_regex_cache() -> None:
+    """Discard compiled patterns and reset the cache counters."""
+    _compile_sgr_regex.cache_clear()
+    _compile_sgr_candidate_regex.cache_clear()
+
+
+@lru_cache(maxsize=SGR_REGEX_CACHE_SIZE)
+def _compile_sgr_candidate_regex(sgr: int) -> Pattern[str]:
+    """Compile the pattern matching every ESC and unsafe character.
+
+    Allowed SGR sequences are matched whole, with their parameters captured
+    as the first group, so that exclusions are checked by
+    SgrRecognizer.replace_esc() instead of a lookahead at every code.
+    """
+    sgr_pattern = get_sgr_pattern(sgr=sgr, exclude_sgr=None)
+    return re_compile(
+        r"\x1b(?:\[(?=([0-9;:]*)m)"
+        + sgr_pattern
+        + r")?"
+        + r"|[^\x1b\n\t\x20-\x7E]"
+    )
+
+
+def is_safe_ascii(untrusted_text: str) -> bool:
+    """Check if text only has characters allowed regardless of SGR support.
+
+    Such text needs no sanitization. The check deletes every safe byte with
+    bytes.translate(), anything left over (including ESC) needs the full
+    pattern. Both this and str.isascii() run in C without a per character
+    Python loop.
+
+    Examples
+    --------
+    >>> is_safe_ascii("Hello,\tworld!\n")
+    True
+    >>> is_safe_ascii("\x1b[31m")
+    False
+    >>> is_safe_ascii("caf\u00e9")
+    False
+    """
+    return untrusted_text.isascii() and not untrusted_text.encode(
+        "ascii"
+    ).translate(None, SAFE_ASCII_BYTES)
+
+
+def parse_sgr_field(field: str) -> int:
+    """Get the value of an SGR field, bounded by its number of digits.
+
+    Leading zeros are dropped before converting, so that zero-padded fields of
+    any length don't reach the digit limit of int().
+
+    Parameters
+    ----------
+    field : str
+        Field of SGR parameters, between semicolons or colons.
+
+    Returns
+    -------
+    int
+        Value of the field, -1 if it is empty, not a number or has more than
+        three significant digits.
+
+    Examples
+    --------
+    >>> parse_sgr_field("0031")
+    31
+    >>> parse_sgr_field("1000")
+    -1
+    """
+    digits = field.lstrip("0") or "0"
+    if not field.isdigit() or len(digits) > 3:
+        return -1
+    return int(digits)
+
+
+class SgrRecognizer:
+    """Linear time SGR validator, the "fsm" engine of Sanitizer.
+
+    Accepts exactly what get_sgr_pattern() accepts, without running the
+    pattern: parameters are split once and every code is checked by a small
+    state machine, so adversarial parameter lists can't cause backtracking.
+    Exclusions keep their regular expression semantics and are checked at the
+    start of every code by SgrExclusions, like the negative lookahead of
+    exclude_pattern().
+
+    Parameters
+    ----------
+    sgr : int
+        Number of SGR codes the terminal supports.
+    exclude_sgr : Optional[list[str]] = None
+        SGR codes to be excluded.
+
+    Examples
+    --------
+    >>> SgrRecognizer(2**24).sanitize("\x1b[;1;38;5;9m\x1b[38;;5;9m")
+    '\x1b[;1;38;5;9m_[38;;5;9m'
+    """
+
+    def __init__(
+        self, sgr: int, exclude_sgr: Optional[list[str]] = None
+    ) -> None:
+        self.level: int = normalize_sgr(sgr)
+        single_codes: set[int] = set()
+        for level, codes in SGR_SINGLE_CODES.items():
+            if self.level >= level:
+                single_codes.update(codes)
+        self.single_codes: frozenset[int] = frozenset(single_codes)
+        self.exclusions: SgrExclusions = SgrExclusions(exclude_sgr)
+        ## Verdicts of accepts() by parameters, unless exclusions kept as a
+        ## pattern could look past the parameters.
+        self._verdicts: Optional[dict[str, bool]] = (
+            {} if self.exclusions.regex is None else None
+        )
+
+    def extended_fields(self, fields: list[str]) -> int:
+        """Count fields of the 8-bit or 24-bit code starting the list.
+
+        Parameters
+        ----------
+        fields : list[str]
+            Fields of the code, starting with the 38 or 48 introducer.
+
+        Returns
+        -------
+        int
+            Number of fields of the code, 0 if it is invalid.
+        """
+        if self.level < 88 or len(fields) < 3:
+            return 0
+        mode = fields[1].lstrip("0")
+        if mode == "5":
+            count = 3
+        elif mode == "2" and self.level >= 2**24:
+            count = 5
+        else:
+            return 0
+        if len(fields) < count:
+            return 0
+        for field in fields[2:count]:
+            if not 0 <= parse_sgr_field(field) <= 255:
+                return 0
+        return count
+
+    def code_fields(self, fields: list[str]) -> int:
+        """Count fields of the code starting the list.
+
+        Parameters
+        ----------
+        fields : list[str]
+            Non-empty fields separated by semicolons, starting with the code.
+
+        Returns
+        -------
+        int
+            Number of fields of the code, 0 if it is invalid.
+        """
+        field = fields[0]
+        if ":" in field:
+            ## Colon separated 8-bit and 24-bit codes are a single field.
+            parts = field.split(":")
+            if parts[0].lstrip("0") in ("38", "48") and self.extended_fields(
+                parts
+            ) == len(parts):
+                return 1
+            return 0
+        if field.lstrip("0") in ("38", "48"):
+            return self.extended_fields(fields[:5])
+        return 1 if parse_sgr_field(field) in self.single_codes else 0
+
+    def accepts(self, untrusted_text: str, start: int, end: int) -> bool:
+        """Validate SGR parameters of a sequence.
+
+        Parameters
+        ----------
+        untrusted_text : str
+            Text containing the sequence.
+        start : int
+            Index of the first parameter, after "ESC [".
+        end : int
+            Index of the "m" terminator.
+
+        Returns
+        -------
+        bool
+            If the sequence is allowed.
+        """
+        if not self.level:
+            return False
+        fields = untrusted_text[start:end].split(";")
+        position = start
+        index = 0
+        while index < len(fields):
+            if not fields[index]:
+                ## Empty fields are separators, allowed between codes.
+                index += 1
+                position += 1
+                continue
+            count = self.code_fields(fields[index : index + 5])
+            if not count:
+                return False
+            if self.exclusions and self.exclusions.excludes(
+                untrusted_text, position
+            ):
+                return False
+            for field in fields[index : index + count]:
+                position += len(field) + 1
+            index += count
+        return True
+
+    def replace_esc(self, match: Match[str]) -> str:
+        """Replace ESC unless it starts an allowed SGR sequence."""
+        parameters = match.group(1)
+        if parameters is None:
+            return "_" + match.group(0)[1:]
+        verdicts = self._verdicts
+        if verdicts is None or len(parameters) > SGR_VERDICT_MAX_LENGTH:
+            allowed = self.accepts(match.string, match.start(1), match.end(1))
+        else:
+            verdict = verdicts.get(parameters)
+            if verdict is None:
+                if len(verdicts) >= SGR_VERDICT_CACHE_SIZE:
+                    verdicts.clear()
+                verdict = self.accepts(parameters, 0, len(parameters))
+                verdicts[parameters] = verdict
+            allowed = verdict
+        if allowed:
+            return match.group(0)
+        return "_" + match.group(0)[1:]
+
+    def sanitize(self, untrusted_text: str) -> str:
+        """Sanitize untrusted text, see stdisplay()."""
+        if "\x1b" in untrusted_text:
+            untrusted_text = ESC_SEQUENCE_RE.sub(
+                self.replace_esc, untrusted_text
+            )
+        return UNSAFE_NON_ESC_RE.sub("_", untrusted_text)
+
+
+class Sanitizer:
+    """Sanitize untrusted text with a fixed SGR policy.
+
+    SGR support and exclusions are resolved once on creation, so that
+    sanitizing many strings with the same policy only runs the compiled
+    pattern. Printable ASCII without ESC skips the pattern entirely. See
+    stdisplay() for what is sanitized.
+
+    Two engines validate SGR sequences with identical results. The "regex"
+    engine runs the pattern of get_sgr_pattern(), the "fsm" engine runs
+    SgrRecognizer, which is linear in the length of the sequence parameters.
+    Both check exclusions with SgrExclusions on allowed sequences, so that
+    their cost doesn't grow with the number of exclusions.
+
+    Parameters
+    ----------
+    sgr : SgrSupport = DETECT_SGR
+        Number of SGR codes the terminal supports, detected with
+        get_sgr_support() when DETECT_SGR. None disables SGR.
+    exclude_sgr : Optional[list[str]] = None
+        SGR codes to be excluded.
+    engine : str = "regex"
+        One of SGR_ENGINES.
+
+    Raises
+    ------
+    ValueError
+        If the engine is unknown.
+
+    Examples
+    --------
+    >>> sanitizer = Sanitizer(sgr=2**4)
+    >>> sanitizer.sanitize("\x1b[31mred\x1b[2J")
+    '\x1b[31mred_[2J'
+    >>> sanitizer.sanitize_bytes(b"caf\xc3\xa9 \xff")
+    b'caf_ _'
+    >>> list(sanitizer.sanitize_iter(["a\tb\n", "\x07"]))
+    ['a\tb\n', '_']
+    """
+
+    def __init__(
+        self,
+        sgr: SgrSupport = DETECT_SGR,
+        exclude_sgr: Optional[list[str]] = None,
+        engine: str = "regex",
+    ) -> None:
+        if engine not in SGR_ENGINES:
+            raise ValueError(f"Unknown SGR engine: {engine!r}")
+        sgr = resolve_sgr(sgr)
+        self.sgr: int = sgr
+        self.exclude_sgr: tuple[str, ...] = (
+            tuple(exclude_sgr) if exclude_sgr else ()
+        )
+        self.engine: str = engine
+        self._sub: Callable[[str], str]
+        if engine == "fsm":
+            self._sub = SgrRecognizer(
+                sgr=self.sgr, exclude_sgr=list(self.exclude_sgr)
+            ).sanitize
+        elif self.exclude_sgr:
+            ## Exclusions are checked on allowed sequences only, instead of
+            ## being a lookahead at every code of the pattern.
+            self._sub = partial(
+                _compile_sgr_candidate_regex(normalize_sgr(self.sgr)).sub,
+                SgrRecognizer(
+                    sgr=self.sgr, exclude_sgr=list(self.exclude_sgr)
+                ).replace_esc,
+            )
+        else:
+            self._sub = partial(get_sgr_regex(sgr=self.sgr).sub, "_")
+
+    def sanitize(self, untrusted_text: str) -> str:
+        """Sanitize untrusted text, see stdisplay()."""
+        if is_safe_ascii(untrusted_text):
+            return untrusted_text
+        return self._sub(untrusted_text)
+
+    def sanitize_bytes(self, untrusted_bytes: bytes) -> bytes:
+        """Sanitize untrusted UTF-8 encoded bytes.
+
+        Invalid UTF-8 sequences are replaced like any other illegal character.
+        The result is ASCII encoded. See stdisplay.binary.stdisplay_bytes().
+        """
+        # pylint: disable=import-outside-toplevel,cyclic-import
+        from stdisplay.binary import get_bytes_sanitizer
+
+        bytes_sanitizer = get_bytes_sanitizer(
+            sgr=self.sgr,
+            exclude_sgr=list(self.exclude_sgr),
+            engine=self.engine,
+        )
+        return bytes_sanitizer.sanitize(untrusted_bytes)
+
+    def sanitize_iter(self, untrusted_iter: Iterable[str]) -> Iterator[str]:
+        """Sanitize each item of an iterable of untrusted text."""
+        sanitize = self.sanitize
+        for untrusted_text in untrusted_iter:
+            yield sanitize(untrusted_text)
+
+
+@lru_cache(maxsize=SGR_REGEX_CACHE_SIZE)
+def _get_sanitizer(
+    sgr: int, exclude_sgr: tuple[str, ...], engine: str
+) -> Sanitizer:
+    """Create the shared sanitizer of a normalized SGR configuration."""
+    return Sanitizer(sgr=sgr, exclude_sgr=list(exclude_sgr), engine=engine)
+
+
+def get_sanitizer(
+    sgr: SgrSupport = DETECT_SGR,
+    exclude_sgr: Optional[list[str]] = None,
+    engine: str = "regex",
+) -> Sanitizer:
+    """Get the shared Sanitizer instance of an SGR configuration.
+
+    Parameters
+    ----------
+    sgr : SgrSupport = DETECT_SGR
+        Number of SGR codes the terminal supports, detected with
+        get_sgr_support() when DETECT_SGR. None disables SGR.
+    exclude_sgr : Optional[list[str]] = None
+        SGR codes to be excluded.
+    engine : str = "regex"
+        One of SGR_ENGINES.
+
+    Returns
+    -------
+    Sanitizer
+        Instance shared by every caller with the same configuration.
+    """
+    sgr = resolve_sgr(sgr)
+    return _get_sanitizer(
+        normalize_sgr(sgr), tuple(exclude_sgr) if exclude_sgr else (), engine
+    )
+
+
 def stdisplay(
     untrusted_text: str,
-    sgr: Optional[int] = get_sgr_support(),
+    sgr: SgrSupport = DETECT_SGR,
     exclude_sgr: Optional[list[str]] = None,
+    engine: str = "regex",
 ) -> str:
     """Sanitize untrusted text to be printed to the terminal.
 
@@ -250,10 +896,13 @@ def stdisplay(
     ----------
     untrusted_text : str
         The unsafe text to be sanitized.
-    sgr : Optional[int] = get_sgr_support()
-        Number of SGR codes the terminal supports.
+    sgr : SgrSupport = DETECT_SGR
+        Number of SGR codes the terminal supports, detected with
+        get_sgr_support() when DETECT_SGR. None disables SGR.
     exclude_sgr : Optional[list[str]] = None
         SGR codes to be excluded.
+    engine : str = "regex"
+        Engine validating SGR sequences, one of SGR_ENGINES. See Sanitizer.
 
     Returns
     -------
@@ -274,6 +923,187 @@ def stdisplay(
     >>> stdisplay("\x1b[38;5;0m\x1b[31m\x1b[38;2;0;0;0m", sgr=2**4)
     '_[38;5;0m\x1b[31m_[38;2;0;0;0m'
     """
-    sgr_pattern = get_sgr_pattern(sgr=sgr, exclude_sgr=exclude_sgr)
-    sgr_pattern = r"(\x1b(?!\[" + sgr_pattern + r")|[^\x1b\n\t\x20-\x7E])"
-    return str(re_sub(re_compile(sgr_pattern), "_", untrusted_text))
+    return get_sanitizer(
+        sgr=sgr, exclude_sgr=exclude_sgr, engine=engine
+    ).sanitize(untrusted_text)
+
+
+class StreamSanitizer:
+    """Sanitize untrusted text received in chunks of any size.
+
+    Each chunk is sanitized as soon as it is fed, except for a trailing ESC
+    that could still start an allowed SGR sequence, which is held back until
+    the sequence is either terminated or broken. The concatenated output of
+    every feed() plus finish() is identical to sanitizing the whole input at
+    once, while memory use is bounded by the chunk size plus the longest
+    unterminated SGR sequence.
+
+    SGR exclusions are expected to match SGR parameters only, exclusions
+    inspecting text after the sequence terminator see no further than the
+    current chunk.
+
+    Parameters
+    ----------
+    sgr : SgrSupport = DETECT_SGR
+        Number of SGR codes the terminal supports, detected with
+        get_sgr_support() when DETECT_SGR. None disables SGR.
+    exclude_sgr : Optional[list[str]] = None
+        SGR codes to be excluded.
+    engine : str = "regex"
+        One of SGR_ENGINES.
+
+    Examples
+    --------
+    >>> stream = StreamSanitizer(sgr=2**4)
+    >>> stream.feed("red: \x1b[3")
+    'red: '
+    >>> stream.feed("1mtext\x1b")
+    '\x1b[31mtext'
+    >>> stream.finish()
+    '_'
+    """
+
+    def __init__(
+        self,
+        sgr: SgrSupport = DETECT_SGR,
+        exclude_sgr: Optional[list[str]] = None,
+        engine: str = "regex",
+    ) -> None:
+        self.sanitizer: Sanitizer = get_sanitizer(
+            sgr=sgr, exclude_sgr=exclude_sgr, engine=engine
+        )
+        ## Pieces of the held back sequence, kept as a list so that a long
+        ## sequence fed in small chunks is only joined once.
+        self._pending: list[str] = []
+
+    def _continues_pending(self, untrusted_chunk: str) -> bool:
+        """Check if the whole chunk extends the held back sequence."""
+        start = 0
+        if self._pending == ["\x1b"]:
+            if not untrusted_chunk.startswith("["):
+                return False
+            start = 1
+        match = SGR_PARAMETERS_RE.match(untrusted_chunk, start)
+        return match is not None and match.end() == len(untrusted_chunk)
+
+    def feed(self, untrusted_chunk: str) -> str:
+        """Sanitize the next chunk of untrusted text.
+
+        Parameters
+        ----------
+        untrusted_chunk : str
+            Continuation of previously fed text.
+
+        Returns
+        -------
+        str
+            Sanitized text, possibly shorter than the chunk if its end is held
+            back.
+        """
+        if not untrusted_chunk:
+            return ""
+        if self._pending:
+            if self._continues_pending(untrusted_chunk):
+                self._pending.append(untrusted_chunk)
+                return ""
+            self._pending.append(untrusted_chunk)
+            untrusted_chunk = "".join(self._pending)
+            self._pending = []
+        esc = untrusted_chunk.rfind("\x1b")
+        if esc != -1 and INCOMPLETE_SGR_RE.fullmatch(untrusted_chunk, esc):
+            self._pending.append(untrusted_chunk[esc:])
+            untrusted_chunk = untrusted_chunk[:esc]
+        return self.sanitizer.sanitize(untrusted_chunk)
+
+    def finish(self) -> str:
+        """Sanitize text held back at the end of input.
+
+        Returns
+        -------
+        str
+            Sanitized remainder, the stream can be reused afterwards.
+        """
+        untrusted_text = "".join(self._pending)
+        self._pending = []
+        return self.sanitizer.sanitize(untrusted_text)
+
+
+def _iter_chunks(
+    untrusted: str | Iterable[str], chunk_size: int
+) -> Iterator[str]:
+    """Split text, lines or a readable stream into bounded chunks."""
+    items: Iterable[str]
+    if isinstance(untrusted, str):
+        items = [untrusted]
+    elif callable(getattr(untrusted, "read", None)):
+        items = iter(partial(getattr(untrusted, "read"), chunk_size), "")
+    else:
+        items = untrusted
+    for item in items:
+        for start in range(0, len(item), chunk_size):
+            yield item[start : start + chunk_size]
+
+
+# pylint: disable=too-many-arguments,too-many-positional-arguments
+def stdisplay_to(
+    fp: SupportsWrite,
+    untrusted: str | Iterable[str],
+    sgr: SgrSupport = DETECT_SGR,
+    exclude_sgr: Optional[list[str]] = None,
+    engine: str = "regex",
+    chunk_size: int = STDISPLAY_CHUNK_SIZE,
+) -> int:
+    """Sanitize untrusted text and write it to a file in bounded chunks.
+
+    The output is identical to writing stdisplay() of the whole input, but
+    neither the input nor the output has to be held in memory at once: memory
+    use is bounded by the chunk size when reading from a stream.
+
+    Parameters
+    ----------
+    fp : SupportsWrite
+        Text file or BlockWriter the sanitized text is written to.
+    untrusted : str | Iterable[str]
+        The unsafe text, an iterable of consecutive pieces of it, such as
+        lines, or a text file, which is read chunk_size characters at a time.
+    sgr : SgrSupport = DETECT_SGR
+        Number of SGR codes the terminal supports, detected with
+        get_sgr_support() when DETECT_SGR. None disables SGR.
+    exclude_sgr : Optional[list[str]] = None
+        SGR codes to be excluded.
+    engine : str = "regex"
+        Engine validating SGR sequences, one of SGR_ENGINES. See Sanitizer.
+    chunk_size : int = STDISPLAY_CHUNK_SIZE
+        Largest number of characters sanitized at a time.
+
+    Returns
+    -------
+    int
+        Number of characters written.
+
+    Raises
+    ------
+    ValueError
+        If the chunk size is lower than 1.
+
+    Examples
+    --------
+    >>> from io import StringIO
+    >>> output = StringIO()
+    >>> stdisplay_to(output, StringIO("\x1b[31mred\x1b[2J"), sgr=2**4)
+    12
+    >>> output.getvalue()
+    '\x1b[31mred_[2J'
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+    stream = StreamSanitizer(sgr=sgr, exclude_sgr=exclude_sgr, engine=engine)
+    written = 0
+    for untrusted_chunk in _iter_chunks(untrusted, chunk_size):
+        sanitized_chunk = stream.feed(untrusted_chunk)
+        if sanitized_chunk:
+            written += fp.write(sanitized_chunk)
+    sanitized_chunk = stream.finish()
+    if sanitized_chunk:
+        written += fp.write(sanitized_chunk)
+    return written
@@ -6,8 +6,9 @@
 
 """Safely print argument to stdout with echo's formatting."""
 
-from sys import argv, stdout
-from stdisplay.stdisplay import stdisplay
+from os import environ
+from sys import argv, stdin, stdout
+from stdisplay.client import run_client
 
 
 def main() -> None:
@@ -15,6 +16,21 @@ def main() -> None:
     stdout.reconfigure(  # type: ignore
         encoding="ascii", errors="replace", newline="\n"
     )
+    ## Equivalent of one call per NUL delimited record of stdin, the tools
+    ## take no options.
+    if environ.get("STDISPLAY_BATCH", ""):
+        # pylint: disable=import-outside-toplevel
+        from stdisplay.output import write_records
+
+        if stdin is not None:
+            write_records(stdin.buffer, stdout, "\n")
+        return
+    if run_client("stecho", argv[1:]):
+        return
+    ## Only imported when the daemon isn't running, see stdisplay.daemon.
+    # pylint: disable=import-outside-toplevel
+    from stdisplay.stdisplay import stdisplay
+
     if len(argv) > 1:
         untrusted_text = " ".join(argv[1:])
         stdout.write(stdisplay(untrusted_text))
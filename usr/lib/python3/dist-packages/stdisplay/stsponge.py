@@ -6,29 +6,149 @@
 
 """Safely print stdin to stdout or file."""
 
-from sys import argv, stdin, stdout
-from stdisplay.stdisplay import stdisplay
+from __future__ import annotations
+
+import os
+from collections.abc import Buffer, Iterable
+from shutil import copyfileobj
+from stat import S_IMODE, S_ISREG
+from sys import argv, stderr, stdin, stdout
+from tempfile import mkstemp, SpooledTemporaryFile
+from stdisplay.binary import BytesStreamSanitizer
+from stdisplay.files import iter_file_bytes
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import IO
+
+## Bytes of sanitized input kept in memory before spilling to a temporary
+## file, overridden by $STSPONGE_MEMORY.
+STSPONGE_MEMORY: int = 2**24
+
+
+def get_memory_limit() -> int:
+    """Return the bytes kept in memory, from $STSPONGE_MEMORY if valid."""
+    try:
+        return max(0, int(os.environ.get("STSPONGE_MEMORY", "")))
+    except ValueError:
+        return STSPONGE_MEMORY
+
+
+def soak(untrusted_iter: Iterable[Buffer], max_size: int) -> IO[bytes]:
+    """
+    Sanitize all the input once, in memory up to max_size bytes and in an
+    anonymous temporary file past it.
+    """
+    # pylint: disable=consider-using-with
+    spool = SpooledTemporaryFile(max_size=max_size, mode="w+b")
+    stream = BytesStreamSanitizer()
+    for untrusted_bytes in untrusted_iter:
+        spool.write(stream.feed(untrusted_bytes))
+    spool.write(stream.finish())
+    return spool
+
+
+def write_in_place(spool: IO[bytes], path: str) -> None:
+    """Write the soaked input to a file, truncating it."""
+    with open(path, "wb") as out_file:
+        copyfileobj(spool, out_file)
+
+
+def keep_owner(fd: int, status: os.stat_result) -> bool:
+    """
+    Give a file the owner and group of another, unless they are the same.
+    Return False if that isn't permitted.
+    """
+    current = os.fstat(fd)
+    if (current.st_uid, current.st_gid) == (status.st_uid, status.st_gid):
+        return True
+    try:
+        os.fchown(fd, status.st_uid, status.st_gid)
+    except PermissionError:
+        return False
+    return True
+
+
+def replace(spool: IO[bytes], path: str) -> None:
+    """
+    Write the soaked input to a file. Symbolic links are followed. Regular
+    files are replaced atomically by a temporary file in the same directory,
+    keeping their permissions and owner. Anything else, such as a device, is
+    written in place, as are regular files with hard links and files whose
+    directory or owner doesn't allow replacing them.
+    """
+    path = os.path.realpath(path)
+    try:
+        status = os.stat(path)
+    except FileNotFoundError:
+        status = None
+    spool.seek(0)
+    if status is not None and (
+        not S_ISREG(status.st_mode) or status.st_nlink > 1
+    ):
+        ## Replacing would split hard links of the file.
+        write_in_place(spool, path)
+        return
+    if status is not None:
+        mode = S_IMODE(status.st_mode)
+    else:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    try:
+        fd, tmp_path = mkstemp(
+            dir=os.path.dirname(path),
+            prefix="." + os.path.basename(path) + ".",
+        )
+    except OSError:
+        if status is None:
+            raise
+        ## The file is writable but its directory is not.
+        write_in_place(spool, path)
+        return
+    try:
+        owner_kept = status is None or keep_owner(fd, status)
+        if owner_kept:
+            with open(fd, "wb") as out_file:
+                copyfileobj(spool, out_file)
+                out_file.flush()
+                ## Changing the owner clears the set-user-ID and set-group-ID
+                ## bits, set the mode afterwards.
+                os.fchmod(fd, mode)
+                os.fsync(fd)
+            os.replace(tmp_path, path)
+        else:
+            os.close(fd)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    if not owner_kept:
+        ## Only privileged users can give the file its owner back.
+        os.unlink(tmp_path)
+        write_in_place(spool, path)
 
 
 def main() -> None:
     """Safely print stdin to stdout or file."""
-    stdout.reconfigure(  # type: ignore
-        encoding="ascii", errors="replace", newline="\n"
-    )
-    if stdin is not None:
-        stdin.reconfigure(  # type: ignore
-            encoding="utf-8", errors="replace", newline="\n"
-        )
-    untrusted_text_list = []
-    if stdin is not None:
-        for untrusted_text in stdin:
-            untrusted_text_list.append(untrusted_text)
-    if len(argv) == 1:
-        stdout.write(stdisplay("".join(untrusted_text_list)))
-        stdout.flush()
-    else:
-        for file in argv[1:]:
-            with open(
-                file, "w", encoding="ascii", errors="replace", newline="\n"
-            ) as out_file:
-                out_file.write(stdisplay("".join(untrusted_text_list)))
+    untrusted_iter = iter_file_bytes(stdin.buffer) if stdin is not None else []
+    with soak(untrusted_iter, get_memory_limit()) as spool:
+        if len(argv) == 1:
+            spool.seek(0)
+            stdout.flush()
+            copyfileobj(spool, stdout.buffer)
+            stdout.flush()
+        else:
+            failed = False
+            for file in argv[1:]:
+                try:
+                    replace(spool, file)
+                except OSError as error:
+                    ## Such as a directory that doesn't exist, the other
+                    ## files are still written.
+                    print(
+                        f"stsponge: {file}: {error.strerror or error}",
+                        file=stderr,
+                    )
+                    failed = True
+            if failed:
+                raise SystemExit(1)
@@ -6,20 +6,23 @@
 
 """Safely print stdin to stdout and file."""
 
+from __future__ import annotations
+
+from os import environ
 from sys import argv, stdin, stdout
-from typing import TextIO
-from stdisplay.stdisplay import stdisplay
+from stdisplay.binary import stdisplay_bytes_to
+from stdisplay.files import iter_file_bytes
+from stdisplay.output import BlockWriter, FanOutWriter
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Literal, TextIO
 
 
 def main() -> None:
     """Safely print stdin to stdout and file."""
-    stdout.reconfigure(  # type: ignore
-        encoding="ascii", errors="replace", newline="\n"
-    )
-    if stdin is not None:
-        stdin.reconfigure(  # type: ignore
-            encoding="utf-8", errors="replace", newline="\n"
-        )
+    ## Equivalent of "tee --append", the tools take no options.
+    mode: Literal["a", "w"] = "a" if environ.get("STTEE_APPEND", "") else "w"
     output_files: list[TextIO] = []
     try:
         if len(argv) > 1:
@@ -28,19 +31,19 @@ def main() -> None:
                 output_files.append(
                     open(
                         file_arg,
-                        "w",
+                        mode,
                         encoding="ascii",
                         errors="replace",
                         newline="\n",
                     )
                 )
-        if stdin is not None:
-            for untrusted_text in stdin:
-                rendered_text: str = stdisplay(untrusted_text)
-                stdout.write(rendered_text)
-                for output_file in output_files:
-                    output_file.write(rendered_text)
-        stdout.flush()
+        ## Sanitized once and written to every file in the same blocks, line
+        ## by line when stdout is a terminal. Each file is written by its own
+        ## thread, so that a slow file doesn't hold back the others.
+        writer = FanOutWriter if output_files else BlockWriter
+        with writer([stdout, *output_files]) as fan_out:
+            if stdin is not None:
+                stdisplay_bytes_to(fan_out, iter_file_bytes(stdin.buffer))
     finally:
         for output_file in output_files:
             output_file.close()
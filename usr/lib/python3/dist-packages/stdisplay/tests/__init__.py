@@ -9,6 +9,7 @@
 import importlib
 import os
 import shutil
+import subprocess
 import sys
 import tempfile
 import unittest
@@ -17,6 +18,52 @@ from typing import Optional, Any
 from unittest.mock import patch
 from stdisplay.stdisplay import get_sgr_support
 
+## Modules that the tools only import once they need them. Each costs a
+## noticeable part of the run time of a tool, see
+## ci/benchmarks/bench_startup.py.
+DEFERRED_MODULES: frozenset[str] = frozenset(
+    {
+        "curses",
+        "html.parser",
+        "queue",
+        "socket",
+        "threading",
+        "typing",
+        "unicodedata",
+    }
+)
+
+
+def get_deferred_imports(code: str, stdin: str = "") -> set[str]:
+    """
+    Run code in a new interpreter without color or a daemon, and return the
+    deferred modules it imported. The site module is skipped, as site
+    customizations may import any module.
+    """
+    env = dict(os.environ)
+    env.update(
+        {
+            "NO_COLOR": "1",
+            "PYTHONPATH": os.pathsep.join(path for path in sys.path if path),
+            "STDISPLAY_SOCKET": os.devnull,
+        }
+    )
+    code = (
+        "import sys\n"
+        + "startup = set(sys.modules)\n"
+        + code
+        + "\nsys.stderr.write(' '.join(set(sys.modules) - startup))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-P", "-S", "-c", code],
+        input=stdin,
+        capture_output=True,
+        check=True,
+        env=env,
+        text=True,
+    )
+    return set(result.stderr.split()) & DEFERRED_MODULES
+
 
 # pylint: disable=too-many-instance-attributes
 class TestSTBase(unittest.TestCase):
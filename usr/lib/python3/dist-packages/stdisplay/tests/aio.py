@@ -0,0 +1,109 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+# pylint: disable=missing-module-docstring
+
+import asyncio
+import multiprocessing
+import random
+import threading
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from stdisplay.aio import (
+    ASYNC_CHUNK_SIZE,
+    sanitize_batch,
+    stdisplay_async,
+    stdisplay_reader,
+)
+from stdisplay.binary import stdisplay_bytes
+from stdisplay.stdisplay import stdisplay
+from stdisplay.tests.binary import BYTES_ALPHABET
+
+
+def sanitize_with_thread(untrusted_text: str) -> str:
+    """Sanitize text and tell which thread did it."""
+    return f"{threading.get_ident()}:{stdisplay(untrusted_text, sgr=-1)}"
+
+
+class TestAio(unittest.IsolatedAsyncioTestCase):
+    """
+    Test the asyncio API.
+    """
+
+    async def test_stdisplay_reader(self) -> None:
+        """
+        Test that chunks of a stream are sanitized like the whole stream.
+        """
+        rng = random.Random(22)
+        for _ in range(100):
+            data = bytes(rng.choices(BYTES_ALPHABET, k=rng.randrange(60)))
+            reader = asyncio.StreamReader()
+            reader.feed_data(data)
+            reader.feed_eof()
+            chunks = [
+                chunk
+                async for chunk in stdisplay_reader(
+                    reader, sgr=2**8, chunk_size=rng.randint(1, 8)
+                )
+            ]
+            with self.subTest(data=data):
+                self.assertNotIn(b"", chunks)
+                self.assertEqual(
+                    b"".join(chunks), stdisplay_bytes(data, sgr=2**8)
+                )
+
+    async def test_sanitize_batch(self) -> None:
+        """
+        Test that small batches are sanitized inline and large ones in the
+        executor.
+        """
+        inline = str(threading.get_ident())
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            for texts, limit, in_loop in [
+                ([], 0, True),
+                (["ab", "\x1b[2J"], 6, True),
+                (["ab", "\x1b[2J"], 5, False),
+            ]:
+                with self.subTest(texts=texts, limit=limit):
+                    results = await sanitize_batch(
+                        sanitize_with_thread,
+                        iter(texts),
+                        inline_limit=limit,
+                        executor=executor,
+                    )
+                    self.assertEqual(
+                        [result.split(":", 1)[1] for result in results],
+                        [stdisplay(text, sgr=-1) for text in texts],
+                    )
+                    for result in results:
+                        self.assertEqual(
+                            result.startswith(inline + ":"), in_loop
+                        )
+
+    async def test_stdisplay_async(self) -> None:
+        """
+        Test sanitizing in the loop, in chunks in threads and in processes.
+        """
+        text = "\x1b[31mcaf\u00e9\x1b[2J\n" * 500
+        self.assertGreater(len(text), ASYNC_CHUNK_SIZE)
+        expected = stdisplay(text, sgr=2**4)
+        self.assertEqual(await stdisplay_async(text, sgr=2**4), expected)
+        self.assertEqual(
+            await stdisplay_async(text, sgr=2**4, inline_limit=0), expected
+        )
+        ## Forking would copy the threads of the default executor.
+        with ProcessPoolExecutor(
+            max_workers=1, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            self.assertEqual(
+                await stdisplay_async(
+                    text, sgr=2**4, inline_limit=0, executor=executor
+                ),
+                expected,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+# pylint: disable=missing-module-docstring
+
+import random
+import unittest
+from collections.abc import Buffer
+from io import BytesIO
+from unittest.mock import patch
+from stdisplay.binary import (
+    BytesStreamSanitizer,
+    stdisplay_bytes,
+    stdisplay_bytes_to,
+)
+from stdisplay.stdisplay import SGR_ENGINES, stdisplay
+from stdisplay.tests.stdisplay import simple_escape_cases
+
+## Pieces of SGR sequences, ASCII controls, valid, truncated, overlong,
+## surrogate and out of range UTF-8.
+BYTES_ALPHABET = [
+    *b"\x1b[0123458;:m a\n\t\x07\x7f_",
+    *b"\xc3\xa9\xe2\x82\xac\xf0\x9f\x98\x80\xed\xa0\xe0\xf4\x8f\x90\xbf",
+    *b"\xff\xc0\xc1\xf5",
+]
+
+
+class TestBinary(unittest.TestCase):
+    """
+    Test sanitizing UTF-8 bytes without decoding them.
+    """
+
+    def _check(self, rng: random.Random, untrusted_bytes: bytes) -> None:
+        untrusted_text = untrusted_bytes.decode("utf-8", errors="replace")
+        for sgr in (-1, 2**4, 2**8, 2**24):
+            for engine in SGR_ENGINES:
+                for exclude_sgr in (None, ["0*31"]):
+                    expected = stdisplay(
+                        untrusted_text,
+                        sgr=sgr,
+                        exclude_sgr=exclude_sgr,
+                        engine=engine,
+                    ).encode("ascii")
+                    stream = BytesStreamSanitizer(
+                        sgr=sgr, exclude_sgr=exclude_sgr, engine=engine
+                    )
+                    output = b""
+                    start = 0
+                    while start < len(untrusted_bytes):
+                        end = start + rng.randint(1, 5)
+                        output += stream.feed(untrusted_bytes[start:end])
+                        start = end
+                    output += stream.finish()
+                    with self.subTest(
+                        untrusted_bytes=untrusted_bytes,
+                        sgr=sgr,
+                        exclude_sgr=exclude_sgr,
+                        engine=engine,
+                    ):
+                        self.assertEqual(
+                            stdisplay_bytes(
+                                memoryview(untrusted_bytes),
+                                sgr=sgr,
+                                exclude_sgr=exclude_sgr,
+                                engine=engine,
+                            ),
+                            expected,
+                        )
+                        self.assertEqual(output, expected)
+
+    def test_differential(self) -> None:
+        """
+        Test that random bytes are sanitized like decoded text, in one piece
+        and in random chunks, on the decoding and on the bytes path.
+        """
+        rng = random.Random(20)
+        cases = [text.encode("utf-8") for text, _ in simple_escape_cases]
+        cases.extend(
+            bytes(rng.choices(BYTES_ALPHABET, k=rng.randrange(24)))
+            for _ in range(150)
+        )
+        for density in (0, 8):
+            with patch("stdisplay.binary.NON_ASCII_DENSITY", density):
+                for untrusted_bytes in cases:
+                    self._check(rng, untrusted_bytes)
+
+    def test_stdisplay_bytes_to(self) -> None:
+        """
+        Test writing buffers split across chunk boundaries.
+        """
+        untrusted: list[Buffer] = [
+            b"a\xe2\x82",
+            memoryview(b"\xac\x1b[3"),
+            bytearray(b"1m"),
+        ]
+        output = BytesIO()
+        written = stdisplay_bytes_to(output, untrusted, sgr=2**4, chunk_size=2)
+        self.assertEqual(output.getvalue(), b"a_\x1b[31m")
+        self.assertEqual(written, len(output.getvalue()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,215 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+# pylint: disable=missing-module-docstring
+
+import random
+import re
+import unittest
+from stdisplay.compact import SgrCompactor, compact_sgr
+from stdisplay.stdisplay import stdisplay
+
+## Codes of the generated sequences, each made of a few of them.
+CODES = [
+    "",
+    "0",
+    "00",
+    "1",
+    "2",
+    "22",
+    "3",
+    "23",
+    "4",
+    "24",
+    "7",
+    "27",
+    "9",
+    "29",
+    "21",
+    "31",
+    "031",
+    "91",
+    "39",
+    "41",
+    "49",
+    "38;5;9",
+    "38:5:9",
+    "48;2;1;2;3",
+    "38",
+]
+## Flag slots of the reference rendition, by the codes setting them.
+FLAGS = {3: "italic", 4: "underline", 5: "blink", 7: "inverse", 9: "strike"}
+## Rendition after SGR 0 of the reference terminal. Bold and faint are kept
+## in the order they were last set, so that both terminals showing them
+## together and terminals where the last one wins render the same.
+DEFAULT: dict[str, object] = {
+    "intensity": (),
+    **dict.fromkeys(FLAGS.values(), 0),
+    "fg": None,
+    "bg": None,
+}
+## Configurations the output is checked with.
+CONFIGS: list[tuple[int, list[str]]] = [(2**4, []), (2**24, []), (88, ["0*9"])]
+
+
+def apply_sgr(state: dict[str, object], params: str) -> None:
+    """
+    Apply an SGR sequence to the rendition of a simple terminal, with its own
+    parser. SGR 21 is a double underline and a bare SGR 38 uses whatever
+    follows as the color, like some terminals do.
+    """
+    fields = params.split(";")
+    while fields:
+        field = fields.pop(0)
+        code = int(field.split(":")[0] or "0")
+        if ":" in field or code in (38, 48):
+            count = 2 if fields[:1] == ["5"] else 4
+            if ":" in field:
+                color = [int(number) for number in field.split(":")[1:]]
+            else:
+                color = [int(number or "0") for number in fields[:count]]
+                del fields[:count]
+            state["fg" if code == 38 else "bg"] = tuple(color)
+        elif code == 0:
+            state.update(DEFAULT)
+        elif code in (1, 2):
+            intensity = [c for c in state["intensity"] if c != code]  # type: ignore
+            state["intensity"] = (*intensity, code)
+        elif code == 22:
+            state["intensity"] = ()
+        elif code == 21:
+            state["underline"] = 2
+        elif code < 30 and code % 20 in FLAGS:
+            state[FLAGS[code % 20]] = int(code < 10)
+        elif code in (39, 49):
+            state["fg" if code == 39 else "bg"] = None
+        else:
+            fg = code in range(30, 38) or code in range(90, 98)
+            state["fg" if fg else "bg"] = code
+
+
+def render(text: str, initial: dict[str, object]) -> list[tuple[object, ...]]:
+    """
+    Render text from an initial rendition, returning the rendition of every
+    character and the final one.
+    """
+    state = dict(initial)
+    rendered: list[tuple[object, ...]] = []
+    for part in re.split(r"(\x1b\[[0-9;:]*m)", text):
+        if part.startswith("\x1b"):
+            apply_sgr(state, part[2:-1])
+        else:
+            rendered.extend((char, *state.values()) for char in part)
+    rendered.append(("end", *state.values()))
+    return rendered
+
+
+def random_text(rng: random.Random, length: int) -> str:
+    """Generate text with many redundant SGR sequences."""
+    pieces = []
+    for _ in range(length):
+        if rng.random() < 0.6:
+            codes = rng.choices(CODES, k=rng.randint(1, 3))
+            pieces.append("\x1b[" + ";".join(codes) + "m")
+        else:
+            pieces.append(rng.choice(["a", "b", "\n", " "]))
+    return "".join(pieces)
+
+
+class TestCompact(unittest.TestCase):
+    """
+    Test compacting SGR sequences.
+    """
+
+    def test_rendition(self) -> None:
+        """
+        Test that compacted text renders the same from any rendition and is
+        left unchanged by stdisplay().
+        """
+        rng = random.Random(23)
+        initials: list[dict[str, object]] = [
+            DEFAULT,
+            {**DEFAULT, "intensity": (2,), "fg": 31, "inverse": 1},
+            {**DEFAULT, "underline": 2, "bg": (5, 9)},
+        ]
+        for _ in range(300):
+            text = random_text(rng, rng.randrange(30))
+            for sgr, exclude_sgr in CONFIGS:
+                sanitized = stdisplay(text, sgr=sgr, exclude_sgr=exclude_sgr)
+                compacted = compact_sgr(
+                    sanitized, sgr=sgr, exclude_sgr=exclude_sgr
+                )
+                with self.subTest(sanitized=sanitized, sgr=sgr):
+                    self.assertLessEqual(len(compacted), len(sanitized))
+                    self.assertEqual(
+                        stdisplay(compacted, sgr=sgr, exclude_sgr=exclude_sgr),
+                        compacted,
+                    )
+                    for initial in initials:
+                        self.assertEqual(
+                            render(compacted, initial),
+                            render(sanitized, initial),
+                        )
+
+    def test_chunks(self) -> None:
+        """
+        Test that text compacted in chunks is compacted like the whole text.
+        """
+        rng = random.Random(230)
+        for _ in range(300):
+            sanitized = stdisplay(random_text(rng, 20), sgr=2**24)
+            cuts = sorted(
+                rng.sample(range(len(sanitized) + 1), min(3, len(sanitized)))
+            )
+            compactor = SgrCompactor(sgr=2**24)
+            chunks = [
+                compactor.feed(sanitized[start:end])
+                for start, end in zip([0, *cuts], [*cuts, len(sanitized)])
+            ]
+            chunks.append(compactor.finish())
+            with self.subTest(sanitized=sanitized, cuts=cuts):
+                self.assertEqual(
+                    "".join(chunks), compact_sgr(sanitized, sgr=2**24)
+                )
+
+    def test_redundant(self) -> None:
+        """
+        Test that redundant sequences are dropped.
+        """
+        for sanitized, compacted in [
+            ("\x1b[0m\x1b[31mx" * 1000, "\x1b[0;31m" + "x" * 1000),
+            ("\x1b[1;31ma\x1b[31;1mb\x1b[0m\n", "\x1b[1;31mab\x1b[0m\n"),
+            ("\x1b[1;2ma\x1b[22;2mb", "\x1b[1;2ma\x1b[22;2mb"),
+            ("\x1b[1ma\x1b[1;4mb\x1b[m", "\x1b[1ma\x1b[4mb\x1b[m"),
+            ("\x1b[38;5;9ma\x1b[38;5;09mb", "\x1b[38;5;9mab"),
+            ("\x1b[21ma\x1b[21mb", "\x1b[21ma\x1b[21mb"),
+            ("\x1b[0m\x1b[2m\x1b[1mX", "\x1b[0;2;1mX"),
+            (
+                "\x1b[0m\x1b[1;2mX\x1b[22m\x1b[2;1mY",
+                "\x1b[0;1;2mX\x1b[0;2;1mY",
+            ),
+            ("\x1b[1ma\x1b[2mb\x1b[1mc", "\x1b[1ma\x1b[2mb\x1b[1mc"),
+            ("plain", "plain"),
+        ]:
+            with self.subTest(sanitized=sanitized):
+                self.assertEqual(compact_sgr(sanitized, sgr=2**24), compacted)
+
+    def test_long_fields(self) -> None:
+        """
+        Test fields beyond the digit limit of int().
+        """
+        zeros = "0" * 5000
+        for sanitized, compacted in [
+            ("\x1b[" + zeros + "31mX", "\x1b[31mX"),
+            ("\x1b[38;5;" + zeros + "9mX\x1b[38;5;9mY", "\x1b[38;5;9mXY"),
+            ("\x1b[38:5:" + zeros + "9mX", "\x1b[38:5:9mX"),
+        ]:
+            with self.subTest(compacted=compacted):
+                self.assertEqual(stdisplay(sanitized, sgr=2**24), sanitized)
+                self.assertEqual(compact_sgr(sanitized, sgr=2**24), compacted)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+# pylint: disable=missing-module-docstring
+
+import os
+import socket
+import time
+from pathlib import Path
+from threading import Thread
+from unittest.mock import patch
+import stdisplay.tests
+from stdisplay.client import (
+    CLIENT_TIMEOUT,
+    encode_request,
+    get_socket_path,
+    run_client,
+)
+from stdisplay.daemon import SanitizeServer
+
+
+class TestDaemon(stdisplay.tests.TestSTBase):
+    """
+    Test the daemon and its clients.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.module = "stecho"
+        self.path = os.path.join(self.tmpdir, "stdisplay.sock")
+        self.server = SanitizeServer(self.path)
+        self.thread = Thread(target=self.server.serve_forever)
+        self.thread.start()
+        patcher = patch.dict(os.environ, {"STDISPLAY_SOCKET": self.path})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.thread.join()
+        self.server.server_close()
+        super().tearDown()
+
+    def test_get_socket_path(self) -> None:
+        """
+        Test choosing the socket path.
+        """
+        cases: list[tuple[dict[str, str], str | None]] = [
+            ({"STDISPLAY_SOCKET": "/a", "XDG_RUNTIME_DIR": "/b"}, "/a"),
+            (
+                {"STDISPLAY_SOCKET": "", "XDG_RUNTIME_DIR": "/b"},
+                "/b/stdisplay.sock",
+            ),
+            ({"STDISPLAY_SOCKET": "", "XDG_RUNTIME_DIR": ""}, None),
+        ]
+        for environ, path in cases:
+            with self.subTest(environ=environ):
+                with patch.dict(os.environ, environ):
+                    self.assertEqual(get_socket_path(), path)
+
+    def test_daemon(self) -> None:
+        """
+        Test output rendered by the daemon and in process being identical.
+        """
+        self.assertEqual(Path(self.path).stat().st_mode & 0o777, 0o600)
+        cases = [
+            [],
+            [""],
+            ["a", "b"],
+            [self.text_dirty],
+            [self.text_malicious_unicode],
+            ["a\udcffb\n", "\x1b[31mred"],
+        ]
+        for module in ["stecho", "stprint"]:
+            self.module = module
+            for argv in cases:
+                with self.subTest(module=module, argv=argv):
+                    with patch.dict(os.environ, {"STDISPLAY_SOCKET": ""}):
+                        expected = self._test_util(argv=argv)
+                    with patch(
+                        "stdisplay.client._request", side_effect=OSError
+                    ):
+                        self.assertEqual(expected, self._test_util(argv=argv))
+                    self.assertEqual(expected, self._test_util(argv=argv))
+                    with patch("sys.stdout"):
+                        self.assertEqual(
+                            "\0" not in "".join(argv),
+                            run_client(module, argv),
+                        )
+                    with patch.dict(os.environ, {"NO_COLOR": "1"}):
+                        self.assertNotIn("\x1b", self._test_util(argv=argv))
+
+    def test_declined(self) -> None:
+        """
+        Test requests the daemon declines or can't answer.
+        """
+        with patch.dict(os.environ, {"TERM": "other-terminal"}):
+            self.assertFalse(run_client("stecho", ["a"]))
+            with patch.dict(os.environ, {"NO_COLOR": "1"}):
+                with patch("sys.stdout") as stdout:
+                    self.assertTrue(run_client("stecho", ["a"]))
+                    stdout.buffer.write.assert_called_once_with(b"a\n")
+        self.assertFalse(run_client("unknown", ["a"]))
+        with patch("stdisplay.client.PROTOCOL", b"stdisplay0"):
+            self.assertFalse(run_client("stecho", ["a"]))
+        with patch.dict(os.environ, {"STDISPLAY_SOCKET": self.path + "x"}):
+            self.assertFalse(run_client("stecho", ["a"]))
+        self.assertIn(b"\0a\0b", encode_request("stprint", ["a", "b"]))
+        with self.assertRaises(FileExistsError):
+            SanitizeServer(self.path)
+
+    def test_slow_client(self) -> None:
+        """
+        Test a client that doesn't send its request not holding back others.
+        """
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as slow:
+            slow.connect(self.path)
+            start = time.monotonic()
+            with patch("sys.stdout") as stdout:
+                self.assertTrue(run_client("stecho", ["a"]))
+                stdout.buffer.write.assert_called_once_with(b"a\n")
+            self.assertLess(time.monotonic() - start, CLIENT_TIMEOUT / 2)
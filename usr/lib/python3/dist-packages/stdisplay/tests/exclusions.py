@@ -0,0 +1,117 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+# pylint: disable=missing-module-docstring
+
+import random
+import unittest
+from stdisplay.exclusions import SgrExclusions
+from stdisplay.stdisplay import get_sgr_regex, Sanitizer, SGR_ENGINES
+
+
+class TestSgrExclusions(unittest.TestCase):
+    """
+    Test SGR exclusions parsed into keys.
+    """
+
+    def test_parse(self) -> None:
+        """
+        Test which entries are parsed and which keep their pattern.
+        """
+        cases: list[tuple[str, set[tuple[str, ...]]]] = [
+            ("0*30", {("30",)}),
+            ("0*4[0-2]", {("40",), ("41",), ("42",)}),
+            ("0*31|0*32", {("31",), ("32",)}),
+            ("0*0", {("",)}),
+            ("31", {("=31",)}),
+            ("0*38:0*5", {("38", ":", "5")}),
+            ("0*48(:|;)", {("48", ":", "**"), ("48", ";", "**")}),
+            (r"0*38;\d+", {("38", ";", "*")}),
+            (
+                "0*38;0*(2|5);.*",
+                {("38", ";", "2", ";", "**")} | {("38", ";", "5", ";", "**")},
+            ),
+        ]
+        for entry, keys in cases:
+            with self.subTest(entry=entry):
+                exclusions = SgrExclusions([entry])
+                self.assertEqual(exclusions.keys, keys)
+                self.assertIsNone(exclusions.regex)
+        for entry in ["0*05", "0", "0*31m", ".*;0*1", "0*3[^1]", "(?:0*31)"]:
+            with self.subTest(entry=entry):
+                exclusions = SgrExclusions(["0*1", entry])
+                self.assertEqual(exclusions.keys, {("1",)})
+                self.assertIsNotNone(exclusions.regex)
+        self.assertFalse(SgrExclusions())
+        self.assertFalse(SgrExclusions([]))
+
+    def test_excludes(self) -> None:
+        """
+        Test matching codes at a position.
+        """
+        exclusions = SgrExclusions(["0*38;0*5;0*25[0-4]", "0*31", "9"])
+        cases = [
+            ("38;5;250", True),
+            ("00038;005;0254;1", True),
+            ("38;5;255", False),
+            ("38:5:250", False),
+            ("38;5", False),
+            ("31", True),
+            ("00031", True),
+            ("3", False),
+            ("1", False),
+            ("9", True),
+            ("97", True),
+            ("09", False),
+        ]
+        for text, excluded in cases:
+            with self.subTest(text=text):
+                self.assertEqual(exclusions.excludes(f"[{text}m", 1), excluded)
+
+    def test_differential(self) -> None:
+        """
+        Test that parsed exclusions agree with the exclusion pattern.
+        """
+        pieces = [
+            *("\x1b[", "\x1b", "m", "m", ";", ";;", ":", "\n"),
+            *("0", "00", "01", "1", "2", "3", "4", "5", "9", "25", "255"),
+            *("30", "31", "38;5;", "48;2;", "38:2:", "38:5:", "107"),
+        ]
+        exclude_sgr_list: list[list[str]] = [
+            ["0*31", "0*0"],
+            ["31", "3", "0*1;0*31"],
+            ["0*38(:|;)0*5(:|;)25[0-5]", "0*1m"],
+            ["0*38;", r"[0-9]*;0*1", r"0*38:0*2:\d*:0*0"],
+            ["0*4[0-7]|0*9[0-7]", "0*2[0-4][0-9]", "00", "0*05"],
+        ]
+        ## Sanitizers are reused, so that verdicts cached by one text apply
+        ## to the next ones.
+        sanitizers = {
+            (index, sgr, engine): Sanitizer(
+                sgr=sgr, exclude_sgr=exclude_sgr, engine=engine
+            )
+            for index, exclude_sgr in enumerate(exclude_sgr_list)
+            for sgr in (2**3, 2**4, 88, 2**24)
+            for engine in SGR_ENGINES
+        }
+        rand = random.Random(0)
+        for _ in range(500):
+            text = "".join(rand.choices(pieces, k=rand.randint(1, 12)))
+            index = rand.randrange(len(exclude_sgr_list))
+            exclude_sgr = exclude_sgr_list[index]
+            for sgr in (2**3, 2**4, 88, 2**24):
+                expected = get_sgr_regex(sgr, exclude_sgr).sub("_", text)
+                for engine in SGR_ENGINES:
+                    with self.subTest(
+                        text=text, sgr=sgr, exclude=exclude_sgr, engine=engine
+                    ):
+                        self.assertEqual(
+                            sanitizers[index, sgr, engine].sanitize(text),
+                            expected,
+                        )
+
+
+if __name__ == "__main__":
+    unittest.main()
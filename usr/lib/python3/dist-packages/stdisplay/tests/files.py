@@ -0,0 +1,115 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+# pylint: disable=missing-module-docstring
+
+import errno
+import os
+import tempfile
+import unittest
+from io import BytesIO
+from mmap import ALLOCATIONGRANULARITY
+from unittest.mock import patch
+from stdisplay.files import iter_file_bytes, iter_file_text
+
+
+class TestIterFileText(unittest.TestCase):
+    """
+    Test decoding files in windows.
+    """
+
+    def setUp(self) -> None:
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+
+    def tearDown(self) -> None:
+        os.unlink(self.path)
+
+    def _expected(self) -> str:
+        with open(
+            self.path, "r", encoding="utf-8", errors="replace", newline="\n"
+        ) as file:
+            return file.read()
+
+    def test_windows(self) -> None:
+        """
+        Test multibyte and invalid sequences split at window edges.
+        """
+        window = ALLOCATIONGRANULARITY
+        cases = [
+            b"",
+            b"a\r\nb\rc\n",
+            b"a" * (window - 1) + "\u00e4".encode("utf-8") + b"b",
+            b"a" * (window - 2) + "\u20ac".encode("utf-8") * 3,
+            b"a" * (window - 1) + b"\xe2\x82" + b"a" * window + b"\xff",
+            b"\xf0\x9f\x98" * window,
+        ]
+        for content in cases:
+            with self.subTest(content=content[-8:]):
+                with open(self.path, "wb") as file:
+                    file.write(content)
+                for window_size in [window, window * 3]:
+                    with open(self.path, "rb") as file:
+                        text = "".join(iter_file_text(file, window_size))
+                    self.assertEqual(text, self._expected())
+                self.assertEqual(
+                    "".join(iter_file_text(BytesIO(content), window)),
+                    self._expected(),
+                )
+
+    def test_position(self) -> None:
+        """
+        Test files that were already read from.
+        """
+        with open(self.path, "wb") as file:
+            file.write(b"a b\nc d\n")
+        with open(self.path, "rb") as file:
+            file.readline()
+            self.assertEqual("".join(iter_file_text(file)), "c d\n")
+
+    def test_window_size(self) -> None:
+        """
+        Test invalid window sizes.
+        """
+        for window_size in [0, -ALLOCATIONGRANULARITY, 1000]:
+            with self.subTest(window_size=window_size):
+                with self.assertRaises(ValueError):
+                    next(iter_file_text(BytesIO(b"a"), window_size))
+
+    def test_bytes(self) -> None:
+        """
+        Test reading bytes of regular and other files.
+        """
+        window = ALLOCATIONGRANULARITY
+        content = b"a\xff\r\n" * window + b"\xe2"
+        with open(self.path, "wb") as file:
+            file.write(content)
+        with open(self.path, "rb") as file:
+            file.read(3)
+            windows = [bytes(data) for data in iter_file_bytes(file, window)]
+        self.assertEqual(b"".join(windows), content[3:])
+        self.assertEqual(len(windows), 5)
+        windows = [bytes(data) for data in iter_file_bytes(BytesIO(content))]
+        self.assertEqual(b"".join(windows), content)
+
+    def test_unmappable(self) -> None:
+        """
+        Test regular files that can't be mapped, like sysfs and procfs files.
+        """
+        content = b"00:00:00:00:00:00\n"
+        with open(self.path, "wb") as file:
+            file.write(content)
+        with patch(
+            "stdisplay.files.mmap",
+            side_effect=OSError(errno.ENODEV, os.strerror(errno.ENODEV)),
+        ) as mapper:
+            with open(self.path, "rb") as file:
+                windows = list(iter_file_bytes(file))
+        mapper.assert_called_once()
+        self.assertEqual(windows, [content])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+# pylint: disable=missing-module-docstring
+
+import os
+import tempfile
+import time
+import unittest
+from io import BytesIO, TextIOWrapper
+from threading import Event
+from typing import Optional, TextIO
+from unittest.mock import patch
+from stdisplay.output import BlockWriter, FanOutWriter, get_line_buffered
+
+
+class SlowBytesIO(BytesIO):
+    """
+    In-memory file whose writes wait for an event or fail with an error.
+    """
+
+    def __init__(self, error: Optional[Exception] = None) -> None:
+        super().__init__()
+        self.error = error
+        self.ready = Event()
+
+    def write(self, data: bytes) -> int:  # type: ignore[override]
+        self.ready.wait()
+        if self.error is not None:
+            raise self.error
+        return super().write(data)
+
+
+class TestBlockWriter(unittest.TestCase):
+    """
+    Test block buffered output.
+    """
+
+    def test_get_line_buffered(self) -> None:
+        """
+        Test choosing the flush policy.
+        """
+        sink = TextIOWrapper(BytesIO())
+        cases = [("", False), ("line", True), ("block", False), ("x", False)]
+        for buffering, line_buffered in cases:
+            with self.subTest(buffering=buffering):
+                with patch.dict(
+                    os.environ, {"STDISPLAY_BUFFERING": buffering}
+                ):
+                    self.assertEqual(get_line_buffered(sink), line_buffered)
+        with patch.dict(os.environ, {"STDISPLAY_BUFFERING": ""}):
+            with patch.object(sink, "isatty", return_value=True):
+                self.assertTrue(get_line_buffered(sink))
+
+    def test_policies(self) -> None:
+        """
+        Test when blocks are written in each mode.
+        """
+        for line_buffered in [False, True]:
+            with self.subTest(line_buffered=line_buffered):
+                outputs = [BytesIO(), BytesIO()]
+                sinks = [TextIOWrapper(output) for output in outputs]
+                sinks[0].write("text layer ")
+                with BlockWriter(sinks, line_buffered, 8) as writer:
+                    self.assertEqual(writer.write("a b"), 3)
+                    self.assertEqual(outputs[0].getvalue(), b"text layer ")
+                    writer.write("\nc")
+                    self.assertEqual(
+                        outputs[1].getvalue(),
+                        b"a b\nc" if line_buffered else b"",
+                    )
+                    writer.write(" d e f g")
+                    self.assertEqual(outputs[1].getvalue(), b"a b\nc d e f g")
+                    writer.write("\xe9\n")
+                self.assertEqual(
+                    [output.getvalue() for output in outputs],
+                    [b"text layer a b\nc d e f g?\n", b"a b\nc d e f g?\n"],
+                )
+        with self.assertRaises(ValueError):
+            BlockWriter([], block_size=0)
+
+    def test_compact_sgr(self) -> None:
+        """
+        Test compacting SGR sequences of text and bytes on request.
+        """
+        env = {"NO_COLOR": "", "COLORTERM": "truecolor"}
+        for compact_sgr, expected in [
+            ("", b"\x1b[0m\x1b[31ma\x1b[0m\x1b[31mb\n\x1b[0m"),
+            ("1", b"\x1b[0;31mab\n\x1b[0m"),
+        ]:
+            with self.subTest(compact_sgr=compact_sgr):
+                output = BytesIO()
+                sink = TextIOWrapper(output)
+                with patch.dict(
+                    os.environ, {**env, "STDISPLAY_COMPACT_SGR": compact_sgr}
+                ):
+                    with BlockWriter([sink], True) as writer:
+                        self.assertEqual(writer.write("\x1b[0m\x1b[31ma"), 10)
+                        writer.write(b"\x1b[0m\x1b[31mb\n\x1b[0m")
+                self.assertEqual(output.getvalue(), expected)
+
+
+class TestFanOutWriter(unittest.TestCase):
+    """
+    Test writing to many files.
+    """
+
+    def test_fan_out(self) -> None:
+        """
+        Test writing regular files and in-memory files.
+        """
+        with tempfile.TemporaryFile() as regular:
+            output = BytesIO()
+            sinks: list[TextIO] = [
+                TextIOWrapper(regular),
+                TextIOWrapper(output),
+            ]
+            blocks = [f"line {i}\n" for i in range(1000)]
+            with FanOutWriter(sinks, False, 100, queue_size=2) as writer:
+                for block in blocks:
+                    writer.write(block)
+            regular.seek(0)
+            expected = "".join(blocks).encode("ascii")
+            self.assertEqual(regular.read(), expected)
+            self.assertEqual(output.getvalue(), expected)
+
+    def test_slow_sink(self) -> None:
+        """
+        Test a slow and failing file not holding back the others.
+        """
+        slow = SlowBytesIO(OSError("No space left on device"))
+        fast = SlowBytesIO()
+        fast.ready.set()
+        sinks = [TextIOWrapper(slow), TextIOWrapper(fast)]
+        writer = FanOutWriter(sinks, True, queue_size=4)
+        for _ in range(3):
+            writer.write("line\n")
+        writer.write("end")
+        writer.flush()
+        ## The fast file is written while the slow one waits.
+        for _ in range(500):
+            if fast.getvalue() == b"line\n" * 3 + b"end":
+                break
+            time.sleep(0.01)
+        self.assertEqual(fast.getvalue(), b"line\n" * 3 + b"end")
+        self.assertEqual(slow.getvalue(), b"")
+        slow.ready.set()
+        for _ in range(10):
+            writer.write("more\n")
+        with self.assertRaisesRegex(OSError, "No space"):
+            writer.close()
+        self.assertEqual(
+            fast.getvalue(), b"line\n" * 3 + b"end" + b"more\n" * 10
+        )
+        with self.assertRaises(ValueError):
+            FanOutWriter([], queue_size=0)
+
+    def test_unexpected_error(self) -> None:
+        """
+        Test an unexpected error of a file reaching the writer instead of
+        leaving it waiting for the file.
+        """
+        broken = SlowBytesIO(RuntimeError("unexpected"))
+        fine = SlowBytesIO()
+        broken.ready.set()
+        fine.ready.set()
+        sinks = [TextIOWrapper(broken), TextIOWrapper(fine)]
+        writer = FanOutWriter(sinks, True, queue_size=1)
+        with self.assertRaisesRegex(RuntimeError, "unexpected"):
+            for _ in range(10000):
+                writer.write("line\n")
+            writer.close()
+        writer.close()
+        self.assertEqual(broken.getvalue(), b"")
+        self.assertTrue(fine.getvalue().endswith(b"line\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
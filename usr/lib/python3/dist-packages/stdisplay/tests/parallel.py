@@ -0,0 +1,183 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+# pylint: disable=missing-module-docstring
+
+import random
+import shutil
+import tempfile
+import unittest
+from io import BytesIO
+from pathlib import Path
+from stdisplay.binary import get_complete_length, stdisplay_bytes
+from stdisplay.parallel import (
+    iter_line_segments,
+    map_ordered,
+    stdisplay_bytes_parallel,
+    stdisplay_many,
+)
+from stdisplay.stdisplay import stdisplay
+from stdisplay.tests.stdisplay import simple_escape_cases
+
+
+class TestParallel(unittest.TestCase):
+    """
+    Test multi-process bulk sanitization.
+    """
+
+    def setUp(self) -> None:
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.tmpdir)
+
+    def test_stdisplay_many(self) -> None:
+        """
+        Test that results are in order and identical to the serial path.
+        """
+        texts = [text for text, _ in simple_escape_cases]
+        texts.extend(f"\x1b[3{i % 10}mline {i}\x1b[m\n" for i in range(200))
+        for sgr in (-1, 2**24):
+            expected = [stdisplay(text, sgr=sgr) for text in texts]
+            for chunk_size in (1, 7, 1000):
+                with self.subTest(sgr=sgr, chunk_size=chunk_size):
+                    self.assertEqual(
+                        list(
+                            stdisplay_many(
+                                iter(texts),
+                                sgr=sgr,
+                                chunk_size=chunk_size,
+                                max_workers=2,
+                            )
+                        ),
+                        expected,
+                    )
+        self.assertEqual(list(stdisplay_many([], sgr=-1)), [])
+
+    def test_stdisplay_many_paths(self) -> None:
+        """
+        Test that paths are read and sanitized like stcat does.
+        """
+        path = Path(self.tmpdir, "file")
+        path.write_bytes(b"a\xffb\r\n\x1b[31mc\n")
+        self.assertEqual(
+            list(
+                stdisplay_many(
+                    [path, str(path), path], sgr=2**24, max_workers=1
+                )
+            ),
+            ["a_b_\n\x1b[31mc\n", str(path), "a_b_\n\x1b[31mc\n"],
+        )
+
+    def test_map_ordered_arguments(self) -> None:
+        """
+        Test argument validation.
+        """
+        with self.assertRaises(ValueError):
+            map_ordered(stdisplay, ["a"], chunk_size=0)
+        with self.assertRaises(ValueError):
+            map_ordered(stdisplay, ["a"], max_workers=0)
+
+    def test_iter_line_segments(self) -> None:
+        """
+        Test that segments are long enough and split where it is safe to.
+        """
+        rng = random.Random(21)
+        alphabet = [b"a", b"\xc3\xa9", b"\x1b[31m", b" ", b"\t", b"\n"]
+        for _ in range(200):
+            data = b"".join(rng.choices(alphabet, k=rng.randrange(80)))
+            cuts = sorted(rng.sample(range(len(data) + 1), min(3, len(data))))
+            pieces = [data[i:j] for i, j in zip([0, *cuts], [*cuts, None])]
+            segment_size = rng.randint(1, 16)
+            segments = list(iter_line_segments(pieces, segment_size))
+            with self.subTest(data=data, segment_size=segment_size):
+                self.assertEqual(b"".join(segments), data)
+                self.assertNotIn(b"", segments)
+                for segment in segments[:-1]:
+                    self.assertGreaterEqual(len(segment), segment_size)
+                    ## Lines without whitespace are split anywhere safe.
+                    if segment[-1:] not in [b"\n", b" ", b"\t"]:
+                        self.assertEqual(
+                            segment[segment_size - 1 :].translate(
+                                None, b"\n \t"
+                            ),
+                            segment[segment_size - 1 :],
+                        )
+                    self.assertEqual(
+                        get_complete_length(segment), len(segment)
+                    )
+                self.assertEqual(
+                    b"".join(stdisplay_bytes(s, sgr=2**24) for s in segments),
+                    stdisplay_bytes(data, sgr=2**24),
+                )
+
+    def test_iter_line_segments_long_line(self) -> None:
+        """
+        Test that lines without whitespace are split with bounded memory,
+        except inside a sequence that may continue.
+        """
+        rng = random.Random(210)
+        alphabet = [
+            b"a",
+            b"\xc3\xa9",
+            b"\xe2\x82",
+            b"\x1b[31m",
+            b"\x1b[1",
+            b"9",
+        ]
+        for _ in range(200):
+            data = b"".join(rng.choices(alphabet, k=rng.randrange(200)))
+            pieces = [data[i : i + 7] for i in range(0, len(data), 7)]
+            segment_size = rng.randint(1, 16)
+            segments = list(iter_line_segments(pieces, segment_size))
+            with self.subTest(data=data, segment_size=segment_size):
+                self.assertEqual(b"".join(segments), data)
+                for segment in segments[:-1]:
+                    self.assertGreaterEqual(len(segment), segment_size)
+                self.assertLess(max(map(len, segments), default=0), 64)
+                self.assertEqual(
+                    b"".join(stdisplay_bytes(s, sgr=2**24) for s in segments),
+                    stdisplay_bytes(data, sgr=2**24),
+                )
+        line = b"a" * 2**20
+        pieces = [line[i : i + 4096] for i in range(0, len(line), 4096)]
+        segments = list(iter_line_segments(pieces, 2**16))
+        self.assertEqual(b"".join(segments), line)
+        self.assertLess(max(map(len, segments)), 2**18)
+        sequence = b"\x1b[" + b"0" * 2**16 + b"31mb" + b"a" * 2**16
+        pieces = [
+            sequence[i : i + 4096] for i in range(0, len(sequence), 4096)
+        ]
+        segments = list(iter_line_segments(pieces, 2**10))
+        self.assertEqual(b"".join(segments), sequence)
+        self.assertGreater(len(segments), 1)
+        self.assertGreaterEqual(len(segments[0]), 2**16 + 5)
+
+    def test_stdisplay_bytes_parallel(self) -> None:
+        """
+        Test that the output is identical to sanitizing the whole input.
+        """
+        data = b"".join(
+            b"\x1b[3%dm%d \xe2\x82\x1b[2J\xc3\xa9\x1b[m\n" % (i % 10, i)
+            for i in range(2000)
+        )
+        pieces = [data[i : i + 1000] for i in range(0, len(data), 1000)]
+        for sgr in (-1, 2**24):
+            expected = stdisplay_bytes(data, sgr=sgr)
+            for segment_size in (1, 4096, len(data)):
+                with self.subTest(sgr=sgr, segment_size=segment_size):
+                    output = BytesIO()
+                    written = stdisplay_bytes_parallel(
+                        output,
+                        pieces,
+                        sgr=sgr,
+                        segment_size=segment_size,
+                        max_workers=2,
+                    )
+                    self.assertEqual(output.getvalue(), expected)
+                    self.assertEqual(written, len(expected))
+        self.assertEqual(stdisplay_bytes_parallel(BytesIO(), []), 0)
+        with self.assertRaises(ValueError):
+            stdisplay_bytes_parallel(BytesIO(), [], segment_size=0)
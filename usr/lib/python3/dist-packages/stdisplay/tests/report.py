@@ -0,0 +1,110 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+# pylint: disable=missing-module-docstring
+
+import unittest
+from threading import Thread
+from stdisplay.report import (
+    get_sanitize_counters,
+    reset_sanitize_counters,
+    sanitize_report,
+    SanitizeCounters,
+    stdisplay_report,
+)
+from stdisplay.stdisplay import get_sanitizer, SGR_ENGINES, stdisplay
+
+
+class TestSanitizeReport(unittest.TestCase):
+    """
+    Test sanitization reports and counters.
+    """
+
+    def setUp(self) -> None:
+        reset_sanitize_counters()
+
+    def tearDown(self) -> None:
+        reset_sanitize_counters()
+
+    def test_report(self) -> None:
+        """
+        Test report statistics with every engine.
+        """
+        cases: list[tuple[str, int, tuple[int, int, int, bool]]] = [
+            ("plain text_\n", 2**4, (0, 0, 0, True)),
+            ("\x1b[31mred\x1b[0m", 2**4, (0, 0, 2, False)),
+            ("\x1b[31mred\x1b[2J\a", 2**4, (2, 1, 1, False)),
+            ("\x1b[31mred\x1b[0m", 0, (2, 2, 0, False)),
+            ("_\x00_ä\x1b]0;t\a", 2**8, (4, 1, 0, False)),
+            ("\x1b\x1b[1m\x1b", 2**8, (2, 2, 1, False)),
+        ]
+        for engine in SGR_ENGINES:
+            for text, sgr, expected in cases:
+                with self.subTest(engine=engine, text=text, sgr=sgr):
+                    report = stdisplay_report(text, sgr=sgr, engine=engine)
+                    self.assertEqual(
+                        report.text, stdisplay(text, sgr=sgr, engine=engine)
+                    )
+                    self.assertEqual(
+                        (
+                            report.replaced,
+                            report.rejected_sequences,
+                            report.accepted_sequences,
+                            report.fast_path,
+                        ),
+                        expected,
+                    )
+                    self.assertGreaterEqual(report.seconds, 0)
+
+    def test_counters(self) -> None:
+        """
+        Test cumulative counters.
+        """
+        stdisplay_report("plain", sgr=2**4)
+        stdisplay_report("\x1b[31mred\x1b[2J\a", sgr=2**4)
+        counters = get_sanitize_counters()
+        del counters["seconds"]
+        self.assertEqual(
+            counters,
+            {
+                "calls": 2,
+                "fast_path_calls": 1,
+                "characters": 18,
+                "replaced": 2,
+                "rejected_sequences": 1,
+                "accepted_sequences": 1,
+            },
+        )
+        reset_sanitize_counters()
+        self.assertEqual(set(get_sanitize_counters().values()), {0})
+
+        own_counters = SanitizeCounters()
+        sanitizer = get_sanitizer(sgr=2**4)
+        sanitize_report(sanitizer, "\x1b[2J", counters=own_counters)
+        sanitize_report(sanitizer, "\x1b[2J", counters=None)
+        self.assertEqual(own_counters.snapshot()["rejected_sequences"], 1)
+        self.assertEqual(get_sanitize_counters()["calls"], 0)
+
+    def test_counters_threads(self) -> None:
+        """
+        Test counters updated concurrently.
+        """
+
+        def work() -> None:
+            for _ in range(500):
+                stdisplay_report("\x1b[2J", sgr=2**4)
+
+        threads = [Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counters = get_sanitize_counters()
+        self.assertEqual(counters["calls"], 2000)
+        self.assertEqual(counters["rejected_sequences"], 2000)
+
+
+if __name__ == "__main__":
+    unittest.main()
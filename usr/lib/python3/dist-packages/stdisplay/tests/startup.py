@@ -0,0 +1,49 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2026 - 2026 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+# pylint: disable=missing-module-docstring
+
+import unittest
+from stdisplay.tests import get_deferred_imports
+
+
+class TestStartup(unittest.TestCase):
+    """
+    Test that the safe terminal utilities don't import what they don't use.
+    """
+
+    def test_deferred_imports(self) -> None:
+        """
+        Test that printing plain text imports no deferred module.
+        """
+        for module, argv in [
+            ("stprint", ["a"]),
+            ("stecho", ["a"]),
+            ("stcat", []),
+            ("stcatn", []),
+            ("sttee", []),
+            ("stsponge", []),
+        ]:
+            code = (
+                f"from stdisplay.{module} import main\n"
+                + f"sys.argv = {[module, *argv]!r}\n"
+                + "main()\n"
+            )
+            with self.subTest(module=module):
+                self.assertEqual(set(), get_deferred_imports(code, "a\n"))
+
+    def test_deferred_imports_used(self) -> None:
+        """
+        Test that deferred modules are imported once needed.
+        """
+        code = (
+            "from stdisplay.output import FanOutWriter\n"
+            + "FanOutWriter([sys.stdout]).close()\n"
+        )
+        self.assertEqual({"queue", "threading"}, get_deferred_imports(code))
+
+
+if __name__ == "__main__":
+    unittest.main()
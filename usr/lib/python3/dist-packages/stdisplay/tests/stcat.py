@@ -6,7 +6,10 @@
 
 # pylint: disable=missing-module-docstring
 
+import os
+from unittest.mock import patch
 import stdisplay.tests
+from stdisplay.parallel import PARALLEL_SEGMENT_SIZE
 
 
 class TestSTCat(stdisplay.tests.TestSTBase):
@@ -65,3 +68,17 @@ class TestSTCat(stdisplay.tests.TestSTBase):
             "a b\nc d",
             self._test_util(stdin="is ignored", argv=[self.tmpfiles["raw"]]),
         )
+
+    def test_stcat_jobs(self) -> None:
+        """
+        Test that files sanitized in parallel are printed like serially.
+        """
+        block = b"a b\n" * 2000 + self.text_dirty.encode("utf-8") + b"\xff\n"
+        with open(self.tmpfiles["fill"], "wb") as file:
+            file.write(block * (2 * PARALLEL_SEGMENT_SIZE // len(block) + 1))
+        argv = [self.tmpfiles["fill"], self.tmpfiles["dirty"]]
+        expected = self._test_util(argv=argv)
+        for jobs in ["2", "0", "-1", "x"]:
+            with self.subTest(jobs=jobs):
+                with patch.dict(os.environ, {"STDISPLAY_JOBS": jobs}):
+                    self.assertEqual(expected, self._test_util(argv=argv))
@@ -6,7 +6,12 @@
 
 # pylint: disable=missing-module-docstring
 
+import random
+from io import BytesIO, StringIO, TextIOWrapper
 import stdisplay.tests
+from stdisplay.output import BlockWriter
+from stdisplay.stcatn import write_trimmed
+from stdisplay.stdisplay import get_sanitizer
 
 
 class TestSTCatn(stdisplay.tests.TestSTBase):
@@ -43,3 +48,25 @@ class TestSTCatn(stdisplay.tests.TestSTBase):
             "a b\nc d\n",
             self._test_util(stdin="is ignored", argv=[self.tmpfiles["raw"]]),
         )
+
+    def test_stcatn_blocks(self) -> None:
+        """
+        Test trimming blocks split anywhere against trimming each line.
+        """
+        rng = random.Random(14)
+        sanitize = get_sanitizer().sanitize
+        alphabet = ["a", " ", "\t", "\n", "\r", "\x0b", "\x1b[31m", "\x1b"]
+        for _ in range(500):
+            text = "".join(rng.choices(alphabet, k=rng.randrange(12)))
+            expected = "".join(
+                sanitize(line).rstrip() + "\n"
+                for line in StringIO(text, newline="\n")
+            )
+            cuts = sorted(rng.sample(range(len(text) + 1), min(3, len(text))))
+            pieces = [text[i:j] for i, j in zip([0, *cuts], [*cuts, None])]
+            output = BytesIO()
+            sink = TextIOWrapper(output, encoding="ascii", newline="\n")
+            with BlockWriter([sink], line_buffered=False) as writer:
+                write_trimmed(writer, [p.encode() for p in pieces])
+            with self.subTest(text=text, pieces=pieces):
+                self.assertEqual(output.getvalue().decode(), expected)
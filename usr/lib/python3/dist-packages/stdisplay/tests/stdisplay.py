@@ -8,13 +8,33 @@
 Test the stdisplay module.
 """
 
+import os
+import random
+import subprocess
+import sys
 import unittest
+from io import StringIO
 from typing import (
     Any,
 )
+from unittest.mock import patch
 from stdisplay.stdisplay import (
+    DETECT_SGR,
+    clear_sgr_regex_cache,
     exclude_pattern,
+    get_sanitizer,
+    get_sgr_regex,
+    get_sgr_regex_cache_info,
+    get_sgr_support,
+    is_safe_ascii,
+    normalize_sgr,
+    refresh_sgr_support,
+    Sanitizer,
+    SGR_ENGINES,
+    SgrRecognizer,
     stdisplay,
+    stdisplay_to,
+    StreamSanitizer,
 )
 
 ## This is split into a global so it can be used by sanitize_string.py's tests.
@@ -306,6 +326,23 @@ class TestSTDisplay(unittest.TestCase):
         ]
         self.run_stdisplay_cases(cases, sgr=2**24, exclude_sgr=exclude_sgr)
 
+    def test_stdisplay_exclude_long_fields(self) -> None:
+        """
+        Test excluding SGR codes of fields beyond the digit limit of int().
+        """
+        zeros = "0" * 5000
+        cases = [
+            ("\x1b[" + zeros + "31mX", "_[" + zeros + "31mX"),
+            ("\x1b[" + zeros + "32mX", "\x1b[" + zeros + "32mX"),
+            ("\x1b[" + "9" * 5000 + "m", "_[" + "9" * 5000 + "m"),
+        ]
+        self.run_stdisplay_cases(cases, sgr=2**24, exclude_sgr=["0*31"])
+        self.run_stdisplay_cases(
+            [("\x1b[" + zeros + "31m", "\x1b[" + zeros + "31m")],
+            sgr=2**24,
+            exclude_sgr=["31"],
+        )
+
     def test_non_sgr_escape_sequences(self) -> None:
         """
         Ensure sequences outside the SGR allowlist are neutralized.
@@ -338,3 +375,320 @@ class TestSTDisplay(unittest.TestCase):
             ("\x1bP2$tight\x1b\\", "_P2$tight_\\"),
         ]
         self.run_stdisplay_cases(cases, sgr=2**24)
+
+
+class TestSTDisplayFsm(TestSTDisplay):
+    """
+    Test stdisplay with the "fsm" engine, every case of the "regex" engine
+    must give the same result.
+    """
+
+    def assert_stdisplay(
+        self, text: str, expected_result: str, **kwargs: Any
+    ) -> None:
+        """
+        Assert that stdisplay returned the expected results.
+        """
+        result = stdisplay(text, engine="fsm", **kwargs)
+        self.assertEqual(result, expected_result)
+
+
+class TestSanitizer(unittest.TestCase):
+    """
+    Test the Sanitizer API and what it is built from.
+    """
+
+    def test_normalize_sgr(self) -> None:
+        """
+        Test reduction of SGR support to the level that changes the pattern.
+        """
+        cases = [
+            (None, 0),
+            (-2, 0),
+            (0, 0),
+            (7, 0),
+            (8, 8),
+            (15, 8),
+            (16, 16),
+            (87, 16),
+            (88, 88),
+            (256, 88),
+            (2**24, 2**24),
+            (2**32, 2**24),
+        ]
+        for sgr, level in cases:
+            with self.subTest(sgr=sgr, level=level):
+                self.assertEqual(normalize_sgr(sgr), level)
+
+    def test_sgr_regex_cache(self) -> None:
+        """
+        Test that compiled patterns are reused and counted.
+        """
+        clear_sgr_regex_cache()
+        self.assertEqual(get_sgr_regex_cache_info().currsize, 0)
+        regex = get_sgr_regex(sgr=256)
+        self.assertIs(regex, get_sgr_regex(sgr=88))
+        self.assertIs(regex, get_sgr_regex(sgr=256, exclude_sgr=[]))
+        self.assertIsNot(regex, get_sgr_regex(sgr=2**24))
+        self.assertIsNot(regex, get_sgr_regex(sgr=256, exclude_sgr=["0*31"]))
+        info = get_sgr_regex_cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (2, 3, 3))
+        clear_sgr_regex_cache()
+        info = get_sgr_regex_cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (0, 0, 0))
+
+    def test_sgr_support_lazy(self) -> None:
+        """
+        Test that importing and sanitizing without SGR doesn't load curses.
+        """
+        code = (
+            "import sys\n"
+            "from stdisplay.stdisplay import stdisplay\n"
+            "stdisplay('\\x1b[31m', sgr=-1)\n"
+            "print('curses' in sys.modules, end='')\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-P", "-c", code],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        self.assertEqual(result.stdout, "False")
+
+    def test_sgr_support_environment(self) -> None:
+        """
+        Test that SGR support is detected per environment and refreshed.
+        """
+        with patch.dict(os.environ, {"NO_COLOR": "1"}):
+            self.assertEqual(get_sgr_support(), -1)
+            self.assertEqual(stdisplay("\x1b[31m"), "_[31m")
+        with patch.dict(os.environ, {"NO_COLOR": "", "COLORTERM": "24bit"}):
+            self.assertEqual(get_sgr_support(), 2**24)
+            self.assertEqual(stdisplay("\x1b[31m"), "\x1b[31m")
+            self.assertEqual(refresh_sgr_support(), 2**24)
+
+    def test_sgr_none(self) -> None:
+        """
+        Test that an explicit None disables SGR instead of detecting it.
+        """
+        with patch.dict(os.environ, {"NO_COLOR": "", "COLORTERM": "24bit"}):
+            self.assertEqual(stdisplay("\x1b[31m", sgr=None), "_[31m")
+            self.assertEqual(
+                get_sanitizer(sgr=None).sanitize("\x1b[31m"), "_[31m"
+            )
+            self.assertEqual(stdisplay("\x1b[31m", sgr=DETECT_SGR), "\x1b[31m")
+            self.assertEqual(stdisplay("\x1b[31m"), "\x1b[31m")
+
+    def test_sanitizer(self) -> None:
+        """
+        Test that the Sanitizer API is equivalent to stdisplay().
+        """
+        for sgr in (-1, 2**3, 2**24):
+            sanitizer = Sanitizer(sgr=sgr)
+            texts = [text for text, _ in simple_escape_cases]
+            texts.append("\x1b[31mred\x1b[38;5;1m\x1b[38;2;0;0;0m")
+            expected = [stdisplay(text, sgr=sgr) for text in texts]
+            self.assertEqual(list(sanitizer.sanitize_iter(texts)), expected)
+            for text, expected_result in zip(texts, expected):
+                with self.subTest(sgr=sgr, text=text):
+                    self.assertEqual(sanitizer.sanitize(text), expected_result)
+                    self.assertEqual(
+                        sanitizer.sanitize_bytes(text.encode("utf-8")),
+                        expected_result.encode("ascii"),
+                    )
+        sanitizer = Sanitizer(sgr=2**24, exclude_sgr=["0*31"])
+        self.assertEqual(sanitizer.sanitize("\x1b[31m"), "_[31m")
+        self.assertEqual(sanitizer.sanitize_bytes(b"a\xffb\n"), b"a_b\n")
+        self.assertEqual(sanitizer.sanitize_bytes(b"\xe2\x80"), b"_")
+        self.assertIs(get_sanitizer(sgr=256), get_sanitizer(sgr=88))
+        self.assertIsNot(get_sanitizer(sgr=256), get_sanitizer(sgr=2**24))
+
+    def test_engine_differential(self) -> None:
+        """
+        Test that both engines agree on generated SGR-like input.
+        """
+        pieces = [
+            *("\x1b[", "\x1b", "m", "m", ";", ";;", ":", "\n", "\u00e9"),
+            *("0", "00", "1", "2", "3", "4", "5", "7", "8", "9", "255"),
+            *("38;5;", "48;2;", "38:2:", "38:5:", "256", "107", "49"),
+        ]
+        exclude_sgr_list: list[list[str]] = [
+            [],
+            ["0*31"],
+            ["0*1", "0*38:0*5"],
+            ["0*30", "0*38;0*5;0*25[0-4]", r"0*38;0*2;\d+;0*253;\d+"],
+            ["0*[3-4]8;0*(2|5);.*"],
+        ]
+        rand = random.Random(0)
+        for _ in range(1000):
+            text = "".join(rand.choices(pieces, k=rand.randint(1, 12)))
+            exclude_sgr = rand.choice(exclude_sgr_list)
+            for sgr in (-1, 2**3, 2**4, 88, 2**8, 2**24):
+                with self.subTest(text=text, sgr=sgr, exclude=exclude_sgr):
+                    self.assertEqual(
+                        stdisplay(text, sgr=sgr, exclude_sgr=exclude_sgr),
+                        stdisplay(
+                            text,
+                            sgr=sgr,
+                            exclude_sgr=exclude_sgr,
+                            engine="fsm",
+                        ),
+                    )
+
+    def test_engine_long_fields(self) -> None:
+        """
+        Test that both engines agree on fields beyond the digit limit of int().
+        """
+        zeros = "0" * 5000
+        cases = [
+            ("\x1b[" + "9" * 5000 + "m", "_[" + "9" * 5000 + "m"),
+            ("\x1b[" + zeros + "31mX", "\x1b[" + zeros + "31mX"),
+            ("\x1b[" + zeros + "1000m", "_[" + zeros + "1000m"),
+            ("\x1b[38;5;" + zeros + "9m", "\x1b[38;5;" + zeros + "9m"),
+            ("\x1b[38:5:" + zeros + "256m", "_[38:5:" + zeros + "256m"),
+            (
+                "\x1b[48;2;1;" + "2" * 5000 + ";3m",
+                "_[48;2;1;" + "2" * 5000 + ";3m",
+            ),
+        ]
+        for engine in SGR_ENGINES:
+            for text, expected_result in cases:
+                with self.subTest(engine=engine, text=text[:12]):
+                    self.assertEqual(
+                        stdisplay(text, sgr=2**24, engine=engine),
+                        expected_result,
+                    )
+
+    def test_engine_selection(self) -> None:
+        """
+        Test selecting engines at runtime.
+        """
+        self.assertEqual(SGR_ENGINES, ("regex", "fsm"))
+        for engine in SGR_ENGINES:
+            sanitizer = get_sanitizer(sgr=2**24, engine=engine)
+            self.assertEqual(sanitizer.engine, engine)
+            self.assertEqual(
+                sanitizer.sanitize("\x1b[1m\x1b[2J"), "\x1b[1m_[2J"
+            )
+        self.assertIsNot(
+            get_sanitizer(sgr=2**24), get_sanitizer(sgr=2**24, engine="fsm")
+        )
+        with self.assertRaises(ValueError):
+            Sanitizer(sgr=2**24, engine="pcre")
+        self.assertEqual(
+            SgrRecognizer(sgr=2**24).sanitize("\x1b[" + ";0" * 100000 + "x"),
+            "_[" + ";0" * 100000 + "x",
+        )
+
+    def test_is_safe_ascii(self) -> None:
+        """
+        Test detection of text that needs no sanitization.
+        """
+        safe = ["", "a", " \n\t ", "".join(chr(c) for c in range(0x20, 0x7F))]
+        unsafe = ["\x1b", "\x1b[m", "\x7f", "\x00", "\r", "\u00e9", "\udcff"]
+        unsafe.extend(
+            text for text, expected in simple_escape_cases if text != expected
+        )
+        for text in safe:
+            with self.subTest(text=text):
+                self.assertTrue(is_safe_ascii(text))
+                self.assertIs(Sanitizer(sgr=2**24).sanitize(text), text)
+        for text in unsafe:
+            with self.subTest(text=text):
+                self.assertFalse(is_safe_ascii(text))
+        for char in map(chr, range(0x100)):
+            with self.subTest(char=char):
+                self.assertEqual(
+                    is_safe_ascii(char), stdisplay(char, sgr=-1) == char
+                )
+
+
+class TestStreamSanitizer(unittest.TestCase):
+    """
+    Test that sanitizing in chunks is identical to sanitizing at once.
+    """
+
+    texts: list[str] = [
+        *(text for text, _ in simple_escape_cases),
+        "\x1b[31mred\x1b[m plain \x1b[38;5;1m\x1b[38:2:0:0:0m\n",
+        "\x1b[;;;0038;002;000;000;000;;;;;001;;;038;005;0000255;m",
+        "\x1b[31\x1b[31m\x1b\x1b[\x1b[m\x1b]0;t\x07\x1b[2J",
+        "\x1b[38;5;1;\n\x1b[38;5;300m\x1b",
+        "\u00e9\x1b[31m\u00e9\x1b[",
+    ]
+
+    def run_stream(self, stream: StreamSanitizer, chunks: list[str]) -> str:
+        """
+        Feed every chunk and return the complete output.
+        """
+        output = [stream.feed(chunk) for chunk in chunks]
+        output.append(stream.finish())
+        return "".join(output)
+
+    def test_stream_split(self) -> None:
+        """
+        Test every split point of every text, for every SGR level.
+        """
+        for sgr in (-1, 2**3, 2**4, 2**8, 2**24):
+            stream = StreamSanitizer(sgr=sgr)
+            for text in self.texts:
+                expected = stdisplay(text, sgr=sgr)
+                for cut in range(len(text) + 1):
+                    with self.subTest(sgr=sgr, text=text, cut=cut):
+                        self.assertEqual(
+                            self.run_stream(stream, [text[:cut], text[cut:]]),
+                            expected,
+                        )
+                with self.subTest(sgr=sgr, text=text, chunks="chars"):
+                    self.assertEqual(
+                        self.run_stream(stream, list(text)), expected
+                    )
+
+    def test_stream_exclude_sgr(self) -> None:
+        """
+        Test that exclusions are honored across chunks.
+        """
+        stream = StreamSanitizer(sgr=2**24, exclude_sgr=["0*31"])
+        self.assertEqual(
+            self.run_stream(stream, ["\x1b[3", "1m", "\x1b[3", "2m"]),
+            "_[31m\x1b[32m",
+        )
+
+    def test_stream_pending(self) -> None:
+        """
+        Test that only a possible SGR sequence is held back.
+        """
+        stream = StreamSanitizer(sgr=2**24)
+        self.assertEqual(stream.feed("a\x1b"), "a")
+        self.assertEqual(stream.feed("["), "")
+        for _ in range(1000):
+            self.assertEqual(stream.feed(";"), "")
+        self.assertEqual(stream.feed("m"), "\x1b[" + ";" * 1000 + "m")
+        self.assertEqual(stream.feed("\x1b[1"), "")
+        self.assertEqual(stream.feed("x"), "_[1x")
+        self.assertEqual(stream.feed("\x1b"), "")
+        self.assertEqual(stream.finish(), "_")
+        self.assertEqual(stream.finish(), "")
+
+    def test_stdisplay_to(self) -> None:
+        """
+        Test writing in chunks from text, pieces of text and streams.
+        """
+        text = "".join(self.texts)
+        expected = stdisplay(text, sgr=2**24)
+        for chunk_size in (1, 2, 3, 7, 64, 2**16):
+            sources: list[tuple[str, Any]] = [
+                ("str", text),
+                ("pieces", self.texts),
+                ("stream", StringIO(text, newline="\n")),
+            ]
+            for name, untrusted in sources:
+                with self.subTest(chunk_size=chunk_size, source=name):
+                    output = StringIO(newline="\n")
+                    written = stdisplay_to(
+                        output, untrusted, sgr=2**24, chunk_size=chunk_size
+                    )
+                    self.assertEqual(output.getvalue(), expected)
+                    self.assertEqual(written, len(expected))
+        with self.assertRaises(ValueError):
+            stdisplay_to(StringIO(), text, sgr=2**24, chunk_size=0)
@@ -10,6 +10,7 @@ import os
 import subprocess
 from pathlib import Path
 import unittest
+from unittest.mock import patch
 from stdisplay.stdisplay import (
     get_sgr_support,
 )
@@ -40,6 +41,26 @@ class TestSTPrint(stdisplay.tests.TestSTBase):
             self.text_dirty_sanitized, self._test_util(argv=[self.text_dirty])
         )
 
+    def test_stprint_batch(self) -> None:
+        """
+        Test NUL delimited records being printed like arguments.
+        """
+        records = ["a b", "", self.text_dirty, "a\udcffb\n", "last"]
+        for module in ["stprint", "stecho"]:
+            self.module = module
+            with self.subTest(module=module):
+                expected = "".join(
+                    self._test_util(argv=[record]) + "\0" for record in records
+                )
+                with patch.dict(os.environ, {"STDISPLAY_BATCH": "1"}):
+                    self.assertEqual(
+                        expected,
+                        self._test_util(
+                            argv=["ignored"], stdin="\0".join(records)
+                        ),
+                    )
+                    self.assertEqual("", self._test_util(stdin=""))
+
 
 class TestSTPrintShell(unittest.TestCase):
     """
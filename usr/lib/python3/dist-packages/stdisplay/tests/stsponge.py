@@ -6,7 +6,12 @@
 
 # pylint: disable=missing-module-docstring disable=duplicate-code
 
+import os
+import stat
+import unittest
+from io import StringIO
 from pathlib import Path
+from unittest.mock import patch
 import stdisplay.tests
 
 
@@ -86,3 +91,107 @@ class TestSTSponge(stdisplay.tests.TestSTBase):
             self.text_malicious_unicode_sanitized,
             Path(self.tmpfiles["fill"]).read_text(encoding="utf-8"),
         )
+
+    def test_stsponge_replace(self) -> None:
+        """
+        Test soaking into the input file, spilling to disk and replacing
+        files atomically.
+        """
+        path = Path(self.tmpfiles["dirty"])
+        path.chmod(0o640)
+        link = Path(self.tmpdir) / "link"
+        link.symlink_to(path)
+        untrusted_text = path.read_text(encoding="utf-8")
+        for memory in ["0", "4", "", "invalid"]:
+            with self.subTest(memory=memory):
+                path.write_text(untrusted_text, encoding="utf-8")
+                with patch.dict(os.environ, {"STSPONGE_MEMORY": memory}):
+                    self.assertEqual(
+                        "",
+                        self._test_util(
+                            stdin=untrusted_text, argv=[str(link)]
+                        ),
+                    )
+                self.assertTrue(link.is_symlink())
+                self.assertEqual(
+                    self.text_dirty_sanitized,
+                    path.read_text(encoding="utf-8"),
+                )
+                self.assertEqual(stat.S_IMODE(path.stat().st_mode), 0o640)
+                self.assertEqual(
+                    sorted(os.listdir(self.tmpdir)),
+                    sorted(
+                        [*map(os.path.basename, self.tmpfiles_list), "link"]
+                    ),
+                )
+        new_path = Path(self.tmpdir) / "new"
+        self.assertEqual("", self._test_util(stdin="a", argv=[str(new_path)]))
+        self.assertEqual("a", new_path.read_text(encoding="utf-8"))
+        self.assertEqual("", self._test_util(stdin="a\x1b", argv=[os.devnull]))
+
+    def test_stsponge_in_place(self) -> None:
+        """
+        Test writing in place files with hard links and files whose directory
+        can't hold a temporary file.
+        """
+        path = Path(self.tmpfiles["fill"])
+        hard_link = Path(self.tmpdir) / "hard_link"
+        hard_link.hardlink_to(path)
+        inode = path.stat().st_ino
+        self.assertEqual(
+            "", self._test_util(stdin=self.text_dirty, argv=[str(hard_link)])
+        )
+        self.assertEqual(path.stat().st_ino, inode)
+        self.assertEqual(
+            self.text_dirty_sanitized, path.read_text(encoding="utf-8")
+        )
+        hard_link.unlink()
+        with patch("tempfile.mkstemp", side_effect=PermissionError):
+            self.assertEqual(
+                "", self._test_util(stdin="a\x1b", argv=[str(path)])
+            )
+            with self.assertRaises(PermissionError):
+                self._test_util(
+                    stdin="a", argv=[str(Path(self.tmpdir) / "new")]
+                )
+        self.assertEqual(path.stat().st_ino, inode)
+        self.assertEqual("a_", path.read_text(encoding="utf-8"))
+
+    def test_stsponge_error(self) -> None:
+        """
+        Test reporting files that can't be written, still writing the others.
+        """
+        path = Path(self.tmpfiles["fill"])
+        missing = str(Path(self.tmpdir) / "nodir" / "x")
+        with patch("sys.stderr", new_callable=StringIO) as stderr:
+            with self.assertRaises(SystemExit) as context:
+                self._test_util(stdin="z", argv=[missing, str(path)])
+        self.assertEqual(context.exception.code, 1)
+        self.assertEqual(
+            stderr.getvalue(),
+            f"stsponge: {missing}: No such file or directory\n",
+        )
+        self.assertEqual("z", path.read_text(encoding="utf-8"))
+
+    @unittest.skipUnless(os.geteuid() == 0, "changing owners needs root")
+    def test_stsponge_owner(self) -> None:
+        """
+        Test keeping the owner of replaced files, or writing them in place
+        when it can't be kept.
+        """
+        path = Path(self.tmpfiles["fill"])
+        os.chown(path, 12345, 12346)
+        path.chmod(0o2640)
+        self.assertEqual("", self._test_util(stdin="a", argv=[str(path)]))
+        status = path.stat()
+        self.assertEqual((status.st_uid, status.st_gid), (12345, 12346))
+        self.assertEqual(stat.S_IMODE(status.st_mode), 0o2640)
+        self.assertEqual("a", path.read_text(encoding="utf-8"))
+        with patch("os.fchown", side_effect=PermissionError):
+            self.assertEqual("", self._test_util(stdin="b", argv=[str(path)]))
+        self.assertEqual(path.stat().st_ino, status.st_ino)
+        self.assertEqual("b", path.read_text(encoding="utf-8"))
+        self.assertEqual(
+            sorted(os.listdir(self.tmpdir)),
+            sorted(map(os.path.basename, self.tmpfiles_list)),
+        )
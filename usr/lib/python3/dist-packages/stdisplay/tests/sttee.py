@@ -6,7 +6,9 @@
 
 # pylint: disable=missing-module-docstring
 
+import os
 from pathlib import Path
+from unittest.mock import patch
 import stdisplay.tests
 
 
@@ -86,3 +88,18 @@ class TestSTTee(stdisplay.tests.TestSTBase):
             self.text_malicious_unicode_sanitized,
             Path(self.tmpfiles["fill"]).read_text(encoding="utf-8"),
         )
+
+    def test_sttee_append(self) -> None:
+        """
+        Test appending to files.
+        """
+        Path(self.tmpfiles["fill"]).write_text("a\n", encoding="utf-8")
+        with patch.dict(os.environ, {"STTEE_APPEND": "1"}):
+            self.assertEqual(
+                "b_\n",
+                self._test_util(stdin="b\x1b\n", argv=[self.tmpfiles["fill"]]),
+            )
+        self.assertEqual(
+            "a\nb_\n",
+            Path(self.tmpfiles["fill"]).read_text(encoding="utf-8"),
+        )
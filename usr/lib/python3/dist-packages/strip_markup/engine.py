@@ -0,0 +1,65 @@
+#!/usr/bin/python3 -su
+
+## Copyright (C) 2025 - 2025 ENCRYPTED SUPPORT LLC <adrelanos@whonix.org>
+## See the file COPYING for copying conditions.
+
+# pylint: disable=unknown-option-value
+
+"""
+engine.py: HTML parser used by strip_markup_lib.py to strip markup.
+"""
+
+from io import StringIO
+from html.parser import HTMLParser
+
+
+## Inspired by https://stackoverflow.com/a/925630/19474638
+class StripMarkupEngine(HTMLParser):
+    """
+    HTMLParser derivative that strips markup tags from its input. An
+    instance can strip many strings one after the other with strip().
+    """
+
+    text: StringIO
+
+    def __init__(self) -> None:
+        """
+        Init function.
+        """
+
+        super().__init__(convert_charrefs=True)
+
+    def reset(self) -> None:
+        """
+        Resets the parser and forgets the accumulated text.
+        """
+
+        super().reset()
+        self.text = StringIO()
+
+    def handle_data(self, data: str) -> None:
+        """
+        Accumulates text extracted from markup.
+        """
+
+        self.text.write(data)
+
+    def get_data(self) -> str:
+        """
+        Returns accumulated text extracted from markup.
+        """
+
+        return self.text.getvalue()
+
+    def strip(self, untrusted_string: str) -> str:
+        """
+        Strips markup from a string, as a new instance would, then resets
+        the instance. Unterminated markup at the end is dropped, and no
+        text is kept around once stripped.
+        """
+
+        try:
+            self.feed(untrusted_string)
+            return self.get_data()
+        finally:
+            self.reset()
@@ -10,7 +10,8 @@ strip_markup.py: Strips HTML-like markup from a string.
 """
 
 import sys
-from .strip_markup_lib import strip_markup
+from stdisplay.files import iter_records
+from .strip_markup_lib import strip_markup, strip_markup_many
 
 
 def print_usage() -> None:
@@ -19,19 +20,47 @@ def print_usage() -> None:
     """
 
     print(
-        "strip-markup: Usage: strip-markup [--help] [string]\n"
+        "strip-markup: Usage: strip-markup [--help] [--batch] [string]\n"
         + "  If no string is provided as an argument, the string is read from "
-        + "standard input.",
+        + "standard input.\n"
+        + "  --batch, -0: Read NUL-delimited strings from standard input and "
+        + "write them\n"
+        + "  NUL-delimited.",
         file=sys.stderr,
     )
 
 
+def print_records() -> int:
+    """
+    Strips markup from NUL-delimited strings from standard input and prints
+    them NUL-delimited.
+    """
+
+    if sys.stdin is None:
+        return 0
+    encoding = sys.stdin.encoding
+    ## Decoded like standard input is read without --batch, universal
+    ## newlines included.
+    untrusted_strings = (
+        untrusted_record.decode(encoding, errors="ignore")
+        .replace("\r\n", "\n")
+        .replace("\r", "\n")
+        for untrusted_record in iter_records(sys.stdin.buffer)
+    )
+    for stripped_string in strip_markup_many(untrusted_strings):
+        sys.stdout.write(stripped_string + "\0")
+    sys.stdout.flush()
+    return 0
+
+
+# pylint: disable=too-many-branches
 def main() -> int:
     """
     Main function.
     """
 
     untrusted_string: str | None = None
+    batch: bool = False
 
     ## Process arguments
     if len(sys.argv) > 1:
@@ -43,6 +72,9 @@ def main() -> int:
             if arg in ("--help", "-h"):
                 print_usage()
                 return 0
+            elif arg in ("--batch", "-0"):
+                batch = True
+                arg_list.pop(0)
             elif arg == "--":
                 arg_list.pop(0)
                 break
@@ -50,10 +82,14 @@ def main() -> int:
                 break
 
         ## Parse positional arguments
-        if len(arg_list) > 1:
+        if len(arg_list) > (0 if batch else 1):
             print_usage()
             return 1
-        untrusted_string = arg_list[0]
+        if arg_list:
+            untrusted_string = arg_list[0]
+
+    if batch:
+        return print_records()
 
     ## Read untrusted_string from stdin if needed
     if untrusted_string is None:
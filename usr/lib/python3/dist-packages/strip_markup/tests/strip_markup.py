@@ -5,12 +5,63 @@
 
 # pylint: disable=missing-module-docstring,fixme,unknown-option-value
 
+import random
 import unittest
 import sys
 from io import BytesIO, TextIOWrapper
 from typing import Callable
 from unittest import mock
+from stdisplay.tests import get_deferred_imports
+from strip_markup.engine import StripMarkupEngine
 from strip_markup.strip_markup import main as strip_markup_main
+from strip_markup.strip_markup_lib import strip_markup, strip_markup_many
+
+## Pieces of the strings stripped by the differential test.
+MARKUP_PIECES: list[str] = [
+    "a",
+    " ",
+    "\n",
+    "\r\n",
+    "\0",
+    "\u00e9",
+    "<",
+    ">",
+    "&",
+    "/",
+    ";",
+    "b",
+    "amp;",
+    "lt;",
+    "#60;",
+    "#x3c",
+    "script",
+    "!--",
+    "-->",
+]
+
+
+def strip_markup_reference(untrusted_string: str) -> str:
+    """
+    Strips markup with two parses every time, like strip_markup() did before
+    skipping parses that can't change anything.
+    """
+
+    strip_one_string = strip_markup_engine(untrusted_string)
+    if strip_one_string == strip_markup_engine(strip_one_string):
+        return strip_one_string
+    return "".join(
+        "_" if char in ["<", ">", "&"] else char for char in strip_one_string
+    )
+
+
+def strip_markup_engine(untrusted_string: str) -> str:
+    """
+    Strips markup with a single parse.
+    """
+
+    markup_stripper = StripMarkupEngine()
+    markup_stripper.feed(untrusted_string)
+    return markup_stripper.get_data()
 
 
 class TestStripMarkupBase(unittest.TestCase):
@@ -373,9 +424,11 @@ class TestStripMarkup(TestStripMarkupBase):
         """
 
         help_str: str = """\
-strip-markup: Usage: strip-markup [--help] [string]
+strip-markup: Usage: strip-markup [--help] [--batch] [string]
   If no string is provided as an argument, the string is read from standard \
 input.
+  --batch, -0: Read NUL-delimited strings from standard input and write them
+  NUL-delimited.
 """
         self._test_args(
             main_func=strip_markup_main,
@@ -414,3 +467,121 @@ input.
         """
 
         self._test_malicious_markup_strings(strip_markup_main, self.argv0)
+
+    def test_batch(self) -> None:
+        """
+        Ensures NUL-delimited strings are stripped one by one.
+        """
+
+        for batch_arg in ("--batch", "-0"):
+            self._test_stdin(
+                main_func=strip_markup_main,
+                argv0=self.argv0,
+                stdout_string="safe\0bold\0\0a & b\n\0",
+                stderr_string="",
+                args=[batch_arg],
+                stdin_string="safe\0<b>bold</b>\0\0a &amp; b\n",
+            )
+        self._test_args(
+            main_func=strip_markup_main,
+            argv0=self.argv0,
+            stdout_string="",
+            stderr_string="",
+            exit_code=0,
+            args=["--batch"],
+        )
+
+    def test_batch_newlines(self) -> None:
+        """
+        Ensures records are decoded like standard input without --batch,
+        translating CRLF and CR line endings.
+        """
+
+        untrusted_string = "a\r\n<b>b</b>\rc\r\r\nd\n"
+        outputs = []
+        for args in ([], ["--batch"]):
+            stdout_buf = TextIOWrapper(
+                BytesIO(), encoding="utf-8", newline="\n"
+            )
+            stdin_buf = TextIOWrapper(
+                BytesIO(untrusted_string.encode("utf-8")), encoding="utf-8"
+            )
+            with (
+                mock.patch.object(sys, "argv", [self.argv0, *args]),
+                mock.patch.object(sys, "stdin", stdin_buf),
+                mock.patch.object(sys, "stdout", stdout_buf),
+            ):
+                self.assertEqual(strip_markup_main(), 0)
+            stdout_buf.seek(0, 0)
+            outputs.append(stdout_buf.read())
+        self.assertEqual(outputs[0], "a\nb\nc\n\nd\n")
+        self.assertEqual(outputs[1], outputs[0] + "\0")
+
+    def test_fast_path(self) -> None:
+        """
+        Ensures skipping parses never changes the result, and that strings
+        without markup characters are never parsed.
+        """
+
+        rng = random.Random(24)
+        for _ in range(3000):
+            pieces = rng.choices(MARKUP_PIECES, k=rng.randrange(12))
+            untrusted_string = "".join(pieces)
+            with self.subTest(untrusted_string=untrusted_string):
+                self.assertEqual(
+                    strip_markup(untrusted_string),
+                    strip_markup_reference(untrusted_string),
+                )
+        with mock.patch(
+            "strip_markup.engine.StripMarkupEngine", side_effect=AssertionError
+        ):
+            for untrusted_string in ["", "plain > text;\0\u00e9", "a\r\n"]:
+                self.assertEqual(
+                    strip_markup(untrusted_string), untrusted_string
+                )
+
+    def test_reuse(self) -> None:
+        """
+        Ensures a reused engine and strip_markup_many() strip like new
+        engines and strip_markup(), even after unterminated markup.
+        """
+
+        rng = random.Random(25)
+        untrusted_strings = [
+            "".join(rng.choices(MARKUP_PIECES, k=rng.randrange(12)))
+            for _ in range(1000)
+        ]
+        untrusted_strings += ["a <b", "c", "&am", "p; d", "<!-- e", "f"]
+        markup_stripper = StripMarkupEngine()
+        for untrusted_string in untrusted_strings:
+            with self.subTest(untrusted_string=untrusted_string):
+                self.assertEqual(
+                    markup_stripper.strip(untrusted_string),
+                    strip_markup_engine(untrusted_string),
+                )
+        expected = [strip_markup_reference(s) for s in untrusted_strings]
+        self.assertEqual(list(strip_markup_many(untrusted_strings)), expected)
+        self.assertEqual(list(strip_markup_many([])), [])
+        ## Stripping while a batch holds an engine uses another one.
+        batch = strip_markup_many(untrusted_strings)
+        self.assertEqual(next(batch), expected[0])
+        self.assertEqual(
+            [strip_markup(s) for s in untrusted_strings], expected
+        )
+        self.assertEqual(list(batch), expected[1:])
+
+    def test_deferred_imports(self) -> None:
+        """
+        Ensures only stripping markup imports the HTML parser.
+        """
+
+        code: str = (
+            "from strip_markup.strip_markup import main\n"
+            + "sys.argv = ['strip-markup', '--help']\n"
+            + "main()\n"
+        )
+        self.assertEqual(set(), get_deferred_imports(code))
+        plain_code = code.replace("'--help'", "'a > b'")
+        self.assertEqual(set(), get_deferred_imports(plain_code))
+        code = code.replace("'--help'", "'<b>a</b>'")
+        self.assertEqual({"html.parser"}, get_deferred_imports(code))
@@ -14,6 +14,7 @@ from typing import Callable
 from io import BytesIO, FileIO, TextIOWrapper
 from unittest import mock
 from stdisplay.stdisplay import stdisplay
+from stdisplay.tests import get_deferred_imports
 from unicode_show.unicode_show import main as unicode_show_main
 
 
@@ -538,6 +539,21 @@ FILENAME_PLACEHOLDER:1: Hello world![U+0009][U+0020]
             stdin_string=test_string,
         )
 
+    def test_deferred_imports(self) -> None:
+        """
+        Tests that only describing suspicious characters imports unicodedata.
+        """
+
+        code: str = (
+            "from unicode_show.unicode_show import main\n"
+            + "sys.argv = ['unicode-show']\n"
+            + "main()\n"
+        )
+        self.assertEqual(set(), get_deferred_imports(code, "clean\n"))
+        self.assertEqual(
+            {"unicodedata"}, get_deferred_imports(code, "pre\u202apost\n")
+        )
+
     def test_unicode_in_filename(self) -> None:
         """
         Tests if Unicode characters in filenames are properly sanitized.
@@ -17,13 +17,17 @@ Exit codes:
   2 - Error (e.g., file I/O or decoding error)
 """
 
+from __future__ import annotations
+
 import sys
-import unicodedata
 import string
 import os
-from typing import TextIO
 from stdisplay.stdisplay import stdisplay
 
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import TextIO
+
 USE_COLOR: bool = False
 
 RED: str = "\033[91m"
@@ -65,6 +69,10 @@ def describe_char(c: str) -> str:
     and category.
     """
 
+    ## Only needed for suspicious characters, which most input has none of.
+    # pylint: disable=import-outside-toplevel
+    import unicodedata
+
     code: int = ord(c)
     name: str = unicodedata.name(c, "<unnamed>")
     cat: str = unicodedata.category(c)